@@ -3,19 +3,50 @@ Admin API endpoints
 Provides statistics and analytics for admin dashboard
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, select
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.sampling_profiler import ProfilerBusyError, sample_in_thread
 from app.middleware.admin import require_admin
 from app.models.user import User, Subscription
-from app.models.commission import Commission, Referral
+from app.models.commission import CommissionBalance, SubscriptionPlan
+from app.models.payment import DailyStatsRollup
+from app.services.stats_rollup import get_churn_rate, get_monthly_revenue
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
+
+def _scalar(column, *criteria):
+    """스칼라 서브쿼리 (지표 쿼리에 함께 실어 1회 왕복으로 조회)"""
+    return select(column).where(*criteria).scalar_subquery()
+
+
+def _activity_columns() -> List[Any]:
+    """
+    사용자/구독 지표 컬럼 (지표별 스칼라 서브쿼리, 1회 왕복)
+    - 날짜 조건은 WHERE 범위 비교 → last_active_at / created_at 인덱스 범위 스캔
+      (func.date() 나 CASE 조건부 집계는 인덱스를 타지 못해 users 전체 스캔)
+    """
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = now - timedelta(days=7)
+    month_start = today_start.replace(day=1)
+    
+    return [
+        _scalar(func.count(User.id)).label("total"),
+        _scalar(func.count(User.id), User.last_active_at >= today_start).label("active_today"),
+        _scalar(func.count(User.id), User.last_active_at >= week_ago).label("active_this_week"),
+        _scalar(func.count(User.id), User.created_at >= month_start).label("new_this_month"),
+        _scalar(func.count(Subscription.id), Subscription.status == "ACTIVE").label("active_subscriptions"),
+    ]
+
+
 @router.get("/stats/overview")
 async def get_overview_stats(
     db: Session = Depends(get_db),
@@ -25,40 +56,26 @@ async def get_overview_stats(
     Get overall system statistics
     Requires admin privileges
     """
-    # Total users
-    total_users = db.query(func.count(User.id)).scalar()
-    
-    # Active users today
-    today = datetime.utcnow().date()
-    active_today = db.query(func.count(User.id)).filter(
-        func.date(User.last_active_at) == today
-    ).scalar()
-    
-    # Total active subscriptions
-    total_subscriptions = db.query(func.count(Subscription.id)).filter(
-        Subscription.status == "ACTIVE"
-    ).scalar()
-    
-    # Monthly revenue (current month)
-    current_month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    monthly_revenue = db.query(func.sum(Subscription.amount)).filter(
-        and_(
-            Subscription.status == "ACTIVE",
-            Subscription.created_at >= current_month_start
-        )
-    ).scalar() or 0
-    
-    # Pending commissions
-    pending_commissions = db.query(func.sum(Commission.amount)).filter(
-        Commission.status == "PENDING"
-    ).scalar() or 0
+    current_month_start = datetime.utcnow().date().replace(day=1)
+    
+    # 사용자/구독 지표 + 이번 달 매출(일별 집계) + 대기 커미션(잔액 합계)을 1회 조회
+    counts = db.query(
+        *_activity_columns(),
+        _scalar(
+            func.coalesce(func.sum(DailyStatsRollup.revenue - DailyStatsRollup.refunds), 0),
+            DailyStatsRollup.day >= current_month_start
+        ).label("monthly_revenue"),
+        _scalar(
+            func.coalesce(func.sum(CommissionBalance.total_pending), 0)
+        ).label("pending_commissions")
+    ).one()
     
     return {
-        "total_users": total_users or 0,
-        "active_users_today": active_today or 0,
-        "total_subscriptions": total_subscriptions or 0,
-        "monthly_revenue": float(monthly_revenue),
-        "total_commissions_pending": float(pending_commissions)
+        "total_users": counts.total,
+        "active_users_today": counts.active_today,
+        "total_subscriptions": counts.active_subscriptions,
+        "monthly_revenue": float(counts.monthly_revenue),
+        "total_commissions_pending": float(counts.pending_commissions)
     }
 
 @router.get("/stats/subscriptions")
@@ -69,18 +86,17 @@ async def get_subscription_stats(
     """
     Get subscription breakdown by plan
     """
-    # Get total active subscriptions
-    total = db.query(func.count(Subscription.id)).filter(
-        Subscription.status == "ACTIVE"
-    ).scalar() or 1  # Avoid division by zero
-    
-    # Get count by plan
+    # 활성 구독 플랜별 집계 (status, plan_id 인덱스로 1회 조회)
     plan_counts = db.query(
-        Subscription.plan_name,
+        SubscriptionPlan.name,
         func.count(Subscription.id).label('count')
+    ).join(
+        SubscriptionPlan, SubscriptionPlan.id == Subscription.plan_id
     ).filter(
         Subscription.status == "ACTIVE"
-    ).group_by(Subscription.plan_name).all()
+    ).group_by(SubscriptionPlan.name).all()
+    
+    total = sum(count for _, count in plan_counts) or 1  # Avoid division by zero
     
     result = {}
     for plan_name, count in plan_counts:
@@ -104,33 +120,14 @@ async def get_user_stats(
     """
     Get user statistics
     """
-    # Total users
-    total = db.query(func.count(User.id)).scalar() or 0
-    
-    # Active today
-    today = datetime.utcnow().date()
-    active_today = db.query(func.count(User.id)).filter(
-        func.date(User.last_active_at) == today
-    ).scalar() or 0
-    
-    # Active this week
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    active_week = db.query(func.count(User.id)).filter(
-        User.last_active_at >= week_ago
-    ).scalar() or 0
-    
-    # New this month
-    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    new_month = db.query(func.count(User.id)).filter(
-        User.created_at >= month_start
-    ).scalar() or 0
+    counts = db.query(*_activity_columns()).one()
     
     return {
-        "total": total,
-        "active_today": active_today,
-        "active_this_week": active_week,
-        "new_this_month": new_month,
-        "churn_rate": 0.0  # TODO: Calculate actual churn rate
+        "total": counts.total,
+        "active_today": counts.active_today,
+        "active_this_week": counts.active_this_week,
+        "new_this_month": counts.new_this_month,
+        "churn_rate": get_churn_rate(db, counts.active_subscriptions, days=30)
     }
 
 @router.get("/stats/revenue")
@@ -141,28 +138,9 @@ async def get_revenue_stats(
     """
     Get revenue statistics by month
     """
-    # Last 6 months revenue
-    months_data = []
-    for i in range(6):
-        month_start = (datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0) 
-                      - timedelta(days=30 * i))
-        month_end = month_start + timedelta(days=30)
-        
-        revenue = db.query(func.sum(Subscription.amount)).filter(
-            and_(
-                Subscription.status == "ACTIVE",
-                Subscription.created_at >= month_start,
-                Subscription.created_at < month_end
-            )
-        ).scalar() or 0
-        
-        months_data.append({
-            "month": month_start.strftime("%Y-%m"),
-            "revenue": float(revenue)
-        })
-    
+    # Last 6 months revenue (일별 집계 1회 조회)
     return {
-        "monthly_data": list(reversed(months_data))
+        "monthly_data": get_monthly_revenue(db, months=6)
     }
 
 @router.get("/users")
@@ -218,3 +196,31 @@ async def update_user_role(
     db.commit()
     
     return {"message": f"User admin status updated to {is_admin}"}
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_sampling_profile(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    admin: User = Depends(require_admin)
+):
+    """
+    서버 전체 스레드 샘플링 프로파일 (collapsed stack 파일)
+    - seconds 동안 실행 후 응답 (최대 PROFILER_MAX_SECONDS)
+    - flamegraph.pl / speedscope 로 열기
+    """
+    seconds = min(seconds, settings.PROFILER_MAX_SECONDS)
+    try:
+        result = await sample_in_thread(seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    filename = f"profile-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.collapsed"
+    return PlainTextResponse(
+        result["collapsed"],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Threads": str(result["threads"]),
+        }
+    )
@@ -1,6 +1,6 @@
 # central-backend/app/api/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
 import secrets
 import string
@@ -16,6 +16,7 @@ from ..core.security import (
     create_refresh_token,
     get_current_user,
 )
+from ..services.commission_ledger import apply_delta
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Authentication"])
 
@@ -79,6 +80,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             status=ReferralStatus.PENDING,
         )
         db.add(referral)
+        apply_delta(db, referrer.id, total_referrals=1)
         db.commit()
     
     return new_user
@@ -206,8 +208,10 @@ def verify_token(
     """
     from ..models.user import Subscription
     
-    # 구독 정보 조회
-    subscription = db.query(Subscription).filter(
+    # 구독 정보 조회 (플랜 함께 로딩)
+    subscription = db.query(Subscription).options(
+        joinedload(Subscription.plan)
+    ).filter(
         Subscription.user_id == current_user.id
     ).first()
     
@@ -0,0 +1,170 @@
+# central-backend/app/api/bootstrap.py
+"""
+Agent 시작 시 필요한 사용자 상태 일괄 조회
+- /auth/verify, /subscriptions/validate, /settings/trading,
+  /kiwoom/credentials/decrypted, /system/gemini-config 를 한 번에 반환
+- 사용자 + 구독/플랜 + 트레이딩 설정 + 계좌를 즉시 로딩 (쿼리 3회)
+- 응답 버전 해시 = ETag → If-None-Match 일치 시 복호화/직렬화 없이 304
+- 복호화는 credential_vault 캐시 사용
+- Accept-Encoding: gzip 이면 압축 응답
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Optional
+import gzip
+import hashlib
+import json
+
+from ..core.config import settings
+from ..core.database import get_db
+from ..core.security import decode_token, oauth2_scheme
+from ..models.trading_settings import TradingSettings
+from ..models.user import User, Subscription, SubscriptionEventType, SubscriptionStatus
+from ..schemas.trading_settings import TradingSettingsResponse
+from ..services.config_service import config_service
+from ..services.credential_vault import decrypt_credential_cached
+from ..services.stats_rollup import record_subscription_event
+
+router = APIRouter(prefix="/api/v1/agent", tags=["Agent Bootstrap"])
+
+
+def _load_user(token: str, db: Session) -> User:
+    """토큰 검증 + 사용자 상태 즉시 로딩 (get_current_user와 같은 검증)"""
+    payload = decode_token(token)
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+
+    user = db.query(User).options(
+        joinedload(User.subscription).joinedload(Subscription.plan),
+        selectinload(User.trading_settings),
+        selectinload(User.kiwoom_credentials),
+    ).filter(User.id == int(user_id)).first()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+    return user
+
+
+def _subscription_state(db: Session, subscription: Optional[Subscription]) -> dict:
+    """/subscriptions/validate 와 같은 판정 (만료 시 EXPIRED 전환 포함)"""
+    if not subscription or subscription.status != SubscriptionStatus.ACTIVE:
+        return {"valid": False, "reason": "No active subscription found"}
+
+    if subscription.expires_at and subscription.expires_at < datetime.utcnow():
+        subscription.status = SubscriptionStatus.EXPIRED
+        record_subscription_event(db, subscription, SubscriptionEventType.EXPIRED)
+        db.commit()
+        return {"valid": False, "reason": "Subscription expired"}
+
+    plan = subscription.plan
+    return {
+        "valid": True,
+        "plan_name": plan.name if plan else None,
+        "max_conditions": plan.max_conditions if plan else None,
+        "max_stocks": plan.max_stocks if plan else None,
+        "expires_at": subscription.expires_at.isoformat() if subscription.expires_at else None,
+    }
+
+
+def _trading_settings(db: Session, user: User) -> dict:
+    """트레이딩 설정 (없으면 기본값 생성, /settings/trading 과 동일)"""
+    trading_settings = user.trading_settings[0] if user.trading_settings else None
+    if trading_settings is None:
+        trading_settings = TradingSettings(user_id=user.id)
+        db.add(trading_settings)
+        db.commit()
+        db.refresh(trading_settings)
+    return TradingSettingsResponse.model_validate(trading_settings).model_dump(mode="json")
+
+
+def _response(request: Request, body: Optional[bytes], etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+
+    accepts_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    if accepts_gzip and len(body) >= settings.AGENT_COMPRESSION_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=settings.AGENT_COMPRESSION_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/bootstrap")
+def get_agent_bootstrap(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Agent 시작용 통합 조회
+    - 인증 1회, DB 쿼리 3회 (사용자+구독+플랜 / 트레이딩 설정 / 계좌)
+    - version: 응답 내용 해시 (다음 요청의 If-None-Match로 사용)
+    - 계좌 키는 버전 계산에 암호문 그대로 사용 → 변경 없으면 복호화하지 않음
+      (updated_at을 유지하는 키 교체 재암호화도 버전 변경으로 감지)
+    """
+    user = _load_user(token, db)
+    subscription = user.subscription
+
+    state = {
+        "auth": {
+            "user_id": user.id,
+            "email": user.email,
+            "is_admin": user.is_admin,
+            "subscription_active": bool(
+                subscription and subscription.expires_at and subscription.expires_at > datetime.utcnow()
+            ),
+            "expires_at": subscription.expires_at.isoformat() if subscription and subscription.expires_at else None,
+            "plan_type": subscription.plan.name if subscription and subscription.plan else None,
+        },
+        "subscription": _subscription_state(db, subscription),
+        "trading_settings": _trading_settings(db, user),
+        "gemini_config": config_service.gemini_config(),
+    }
+
+    credentials = sorted(
+        (cred for cred in user.kiwoom_credentials if cred.is_active),
+        key=lambda cred: cred.id
+    )
+    fingerprint = json.dumps(
+        [state, [(cred.id, cred.account_id, cred.alias, cred.is_main, cred.app_key, cred.secret_key)
+                 for cred in credentials]],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    version = hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+    etag = f'W/"bootstrap-{version}"'
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return _response(request, None, etag)
+
+    state["kiwoom_credentials"] = []
+    for cred in credentials:
+        decrypted = decrypt_credential_cached(cred)
+        state["kiwoom_credentials"].append({
+            "id": cred.id,
+            "account_id": cred.account_id,
+            "alias": cred.alias,
+            "app_key": decrypted.app_key,
+            "secret_key": decrypted.secret_key,
+            "is_main": cred.is_main,
+            "is_active": cred.is_active,
+        })
+    state["version"] = version
+
+    body = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode()
+    return _response(request, body, etag)
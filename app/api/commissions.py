@@ -1,14 +1,15 @@
 # central-backend/app/api/commissions.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from typing import List
 
 from ..core.database import get_db
 from ..models.user import User
-from ..models.commission import Commission, CommissionStatus, Referral
+from ..models.commission import Commission
 from ..schemas.commission import CommissionResponse, CommissionStatsResponse
 from ..core.security import get_current_user
+from ..services.commission_calculator import payout_approved_commissions
+from ..services.commission_ledger import get_balance
 
 router = APIRouter(prefix="/api/v1/commissions", tags=["Commissions"])
 
@@ -31,35 +32,8 @@ def get_commission_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """커미션 통계 조회"""
-    # 상태별 합계
-    stats = db.query(
-        Commission.status,
-        func.sum(Commission.amount).label("total")
-    ).filter(
-        Commission.user_id == current_user.id
-    ).group_by(Commission.status).all()
-    
-    stats_dict = {stat.status: float(stat.total or 0) for stat in stats}
-    
-    # 추천 통계
-    total_referrals = db.query(Referral).filter(
-        Referral.referrer_id == current_user.id
-    ).count()
-    
-    active_referrals = db.query(Referral).filter(
-        Referral.referrer_id == current_user.id,
-        Referral.status == "ACTIVE"
-    ).count()
-    
-    return {
-        "total_pending": stats_dict.get(CommissionStatus.PENDING, 0),
-        "total_holdback": stats_dict.get(CommissionStatus.HOLDBACK, 0),
-        "total_approved": stats_dict.get(CommissionStatus.APPROVED, 0),
-        "total_paid": stats_dict.get(CommissionStatus.PAID, 0),
-        "total_referrals": total_referrals,
-        "active_referrals": active_referrals,
-    }
+    """커미션 통계 조회 (잔액 원장 단건 조회)"""
+    return get_balance(db, current_user.id)
 
 
 @router.post("/request-payout")
@@ -71,30 +45,19 @@ def request_payout(
     지급 요청
     - APPROVED 상태의 커미션만 지급 가능
     """
-    approved_commissions = db.query(Commission).filter(
-        Commission.user_id == current_user.id,
-        Commission.status == CommissionStatus.APPROVED
-    ).all()
+    # TODO: 실제 지급 처리 (은행 송금 등)
+    # 여기서는 상태만 변경
+    total_amount, count = payout_approved_commissions(db, current_user.id)
     
-    if not approved_commissions:
+    if not count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No approved commissions available for payout"
         )
     
-    total_amount = sum(c.amount for c in approved_commissions)
-    
-    # TODO: 실제 지급 처리 (은행 송금 등)
-    # 여기서는 상태만 변경
-    for commission in approved_commissions:
-        commission.status = CommissionStatus.PAID
-        commission.paid_at = func.now()
-    
-    db.commit()
-    
     return {
         "message": "Payout request processed",
         "total_amount": total_amount,
         "currency": "KRW",
-        "count": len(approved_commissions)
+        "count": count
     }
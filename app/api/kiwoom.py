@@ -18,7 +18,8 @@ from ..schemas.kiwoom import (
     KiwoomCredentialDecrypted
 )
 from ..core.security import get_current_user
-from ..core.crypto import encrypt_credential, decrypt_credential
+from ..core.crypto import cipher, encrypt_credential
+from ..services.credential_vault import credential_cache, decrypt_credential_cached
 
 
 router = APIRouter(prefix="/api/v1/kiwoom", tags=["Kiwoom"])
@@ -65,6 +66,7 @@ def create_kiwoom_credential(
         alias=credential_data.alias,
         app_key=encrypted_app_key,
         secret_key=encrypted_secret_key,
+        key_version=cipher.primary_version,
         is_main=credential_data.is_main
     )
     
@@ -100,6 +102,7 @@ def get_decrypted_credentials(
     복호화된 Kiwoom 인증 정보 조회
     - 로컬 트레이딩 서버에서 사용
     - 활성화된 계좌만 반환
+    - 복호화 결과는 (계좌 ID, updated_at) 기준으로 캐시
     """
     credentials = db.query(KiwoomCredential).filter(
         KiwoomCredential.user_id == current_user.id,
@@ -109,12 +112,13 @@ def get_decrypted_credentials(
     # 복호화
     decrypted_list = []
     for cred in credentials:
+        decrypted = decrypt_credential_cached(cred)
         decrypted_list.append(KiwoomCredentialDecrypted(
             id=cred.id,
             account_id=cred.account_id,
             alias=cred.alias,
-            app_key=decrypt_credential(cred.app_key),
-            secret_key=decrypt_credential(cred.secret_key),
+            app_key=decrypted.app_key,
+            secret_key=decrypted.secret_key,
             is_main=cred.is_main,
             is_active=cred.is_active
         ))
@@ -176,11 +180,17 @@ def update_kiwoom_credential(
     if update_data.alias is not None:
         credential.alias = update_data.alias
     
-    if update_data.app_key is not None:
-        credential.app_key = encrypt_credential(update_data.app_key)
-    
-    if update_data.secret_key is not None:
-        credential.secret_key = encrypt_credential(update_data.secret_key)
+    if update_data.app_key is not None or update_data.secret_key is not None:
+        # 변경하지 않는 키도 현재 키 버전으로 재암호화
+        credential.app_key = (
+            encrypt_credential(update_data.app_key) if update_data.app_key is not None
+            else cipher.rotate(credential.app_key)
+        )
+        credential.secret_key = (
+            encrypt_credential(update_data.secret_key) if update_data.secret_key is not None
+            else cipher.rotate(credential.secret_key)
+        )
+        credential.key_version = cipher.primary_version
     
     if update_data.is_main is not None:
         credential.is_main = update_data.is_main
@@ -190,6 +200,7 @@ def update_kiwoom_credential(
     
     db.commit()
     db.refresh(credential)
+    credential_cache.invalidate(credential.id)
     
     return credential
 
@@ -214,5 +225,6 @@ def delete_kiwoom_credential(
     
     db.delete(credential)
     db.commit()
+    credential_cache.invalidate(credential_id)
     
     return None
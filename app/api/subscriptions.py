@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from typing import List
 
 from ..core.database import get_db
-from ..models.user import User, Subscription, SubscriptionStatus
+from ..models.user import User, Subscription, SubscriptionStatus, SubscriptionEventType
 from ..models.commission import SubscriptionPlan, Referral, ReferralStatus
 from ..schemas.subscription import (
     SubscriptionPlanResponse,
@@ -15,6 +15,8 @@ from ..schemas.subscription import (
 )
 from ..core.security import get_current_user
 from ..services.commission_calculator import trigger_commission_event
+from ..services.commission_ledger import apply_delta
+from ..services.stats_rollup import record_subscription_event
 
 router = APIRouter(prefix="/api/v1/subscriptions", tags=["Subscriptions"])
 
@@ -95,6 +97,7 @@ def subscribe(
     new_subscription.started_at = datetime.utcnow()
     new_subscription.expires_at = datetime.utcnow() + timedelta(days=30)  # 월 구독 가정
     new_subscription.last_payment_at = datetime.utcnow()
+    record_subscription_event(db, new_subscription, SubscriptionEventType.STARTED)
     db.commit()
     
     # 추천 관계 활성화 및 커미션 발생
@@ -106,6 +109,7 @@ def subscribe(
     if referral:
         referral.status = ReferralStatus.ACTIVE
         referral.activated_at = datetime.utcnow()
+        apply_delta(db, referral.referrer_id, active_referrals=1)
         db.commit()
         
         # 커미션 발생 (비동기 처리)
@@ -113,7 +117,8 @@ def subscribe(
             db=db,
             referral_id=referral.id,
             event_type="SIGNUP",
-            subscription_amount=plan.price_monthly
+            subscription_amount=plan.price_monthly,
+            plan_id=plan.id
         )
     
     return new_subscription
@@ -148,6 +153,7 @@ def upgrade_subscription(
     
     # 플랜 변경
     subscription.plan_id = new_plan.id
+    record_subscription_event(db, subscription, SubscriptionEventType.PLAN_CHANGED)
     db.commit()
     db.refresh(subscription)
     
@@ -162,7 +168,8 @@ def upgrade_subscription(
             db=db,
             referral_id=referral.id,
             event_type="UPGRADE",
-            subscription_amount=new_plan.price_monthly
+            subscription_amount=new_plan.price_monthly,
+            plan_id=new_plan.id
         )
     
     return subscription
@@ -184,9 +191,12 @@ def cancel_subscription(
             detail="No subscription found"
         )
     
+    was_active = subscription.status == SubscriptionStatus.ACTIVE
     subscription.status = SubscriptionStatus.CANCELLED
     subscription.cancelled_at = datetime.utcnow()
     subscription.auto_renew = False
+    if was_active:
+        record_subscription_event(db, subscription, SubscriptionEventType.CANCELLED)
     db.commit()
     
     # 추천 관계 만료
@@ -197,6 +207,7 @@ def cancel_subscription(
     
     if referral:
         referral.status = ReferralStatus.EXPIRED
+        apply_delta(db, referral.referrer_id, active_referrals=-1)
         db.commit()
     
     return {"message": "Subscription cancelled successfully"}
@@ -227,6 +238,7 @@ def validate_subscription(
     # 만료 확인
     if subscription.expires_at and subscription.expires_at < datetime.utcnow():
         subscription.status = SubscriptionStatus.EXPIRED
+        record_subscription_event(db, subscription, SubscriptionEventType.EXPIRED)
         db.commit()
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
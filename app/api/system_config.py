@@ -3,17 +3,23 @@
 시스템 설정 API
 - Gemini AI 모델 우선순위 관리
 - Gemini API 키 관리
+- 조회는 메모리 캐시(config_service) + ETag / Cache-Control (304 Not Modified)
+- config_service는 버전 확인/재적재 시 DB를 동기 조회 → 조회 핸들러는 def (스레드풀),
+  저장은 run_in_threadpool (이벤트 루프 차단 방지)
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, List, Dict
 import logging
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_admin_user
-from app.models.system_config import SystemConfig
 from app.models.user import User
+from app.services.config_service import config_service, notify_agents
 
 logger = logging.getLogger(__name__)
 
@@ -52,18 +58,35 @@ class GeminiConfigResponse(BaseModel):
     api_keys: Dict[str, str]  # {model_name: api_key}
 
 
+def _cached_json(request: Request, build: Callable[[], BaseModel]) -> Response:
+    """
+    설정 버전 기반 조건부 응답
+    - If-None-Match가 현재 ETag와 같으면 본문 없이 304
+    - API 키가 포함될 수 있으므로 공유 캐시 금지 (private)
+    """
+    etag = config_service.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.SYSTEM_CONFIG_MAX_AGE_SECONDS}",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(build().model_dump(), headers=headers)
+
+
 # ===== Endpoints =====
 
 @router.get("/gemini-models", response_model=GeminiModelsResponse)
-async def get_gemini_models(db: Session = Depends(get_db)):
+def get_gemini_models(request: Request):
     """
     Gemini AI 모델 우선순위 목록 조회
     - 인증 불필요 (모든 에이전트가 접근 가능)
     """
-    try:
-        config = db.query(SystemConfig).filter(
-            SystemConfig.config_key == "gemini_models"
-        ).first()
+    def build() -> GeminiModelsResponse:
+        config = config_service.entry("gemini_models")
         
         if not config:
             # 기본값 반환
@@ -74,13 +97,16 @@ async def get_gemini_models(db: Session = Depends(get_db)):
                 updated_by=None
             )
         
-        value = config.config_value
+        value = config.value
         return GeminiModelsResponse(
             preferred_models=value.get("preferred_models", ["gemini-3-flash"]),
             fallback_model=value.get("fallback_model", "gemini-2.5-flash"),
             updated_at=config.updated_at.isoformat() if config.updated_at else None,
             updated_by=config.updated_by
         )
+    
+    try:
+        return _cached_json(request, build)
     except Exception as e:
         logger.error(f"Failed to get Gemini models config: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve configuration")
@@ -97,39 +123,28 @@ async def update_gemini_models(
     - 관리자 전용
     """
     try:
-        config = db.query(SystemConfig).filter(
-            SystemConfig.config_key == "gemini_models"
-        ).first()
-        
         config_value = {
             "preferred_models": update.preferred_models,
             "fallback_model": update.fallback_model
         }
         
-        if config:
-            # 기존 설정 업데이트
-            config.config_value = config_value
-            config.updated_by = current_user.email
-        else:
-            # 새 설정 생성
-            config = SystemConfig(
-                config_key="gemini_models",
-                config_value=config_value,
-                description="Gemini AI model priority list",
-                updated_by=current_user.email
-            )
-            db.add(config)
-        
-        db.commit()
-        db.refresh(config)
+        config = await run_in_threadpool(
+            config_service.set,
+            db,
+            "gemini_models",
+            config_value,
+            updated_by=current_user.email,
+            description="Gemini AI model priority list"
+        )
         
         logger.info(f"Gemini models config updated by {current_user.email}: {update.preferred_models}")
+        await notify_agents()
         
         return {
             "message": "Gemini models configuration updated successfully",
             "preferred_models": update.preferred_models,
             "fallback_model": update.fallback_model,
-            "updated_at": config.updated_at.isoformat(),
+            "updated_at": config.updated_at.isoformat() if config.updated_at else None,
             "updated_by": config.updated_by
         }
     except Exception as e:
@@ -141,18 +156,15 @@ async def update_gemini_models(
 # ===== Gemini API Key Management =====
 
 @router.get("/gemini-api-key", response_model=GeminiApiKeyResponse)
-async def get_gemini_api_key(
-    current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+def get_gemini_api_key(
+    current_user: User = Depends(get_admin_user)
 ):
     """
     Gemini API 키 조회 (관리자 전용)
     - 보안을 위해 마스킹된 키 반환
     """
     try:
-        config = db.query(SystemConfig).filter(
-            SystemConfig.config_key == "gemini_api_key"
-        ).first()
+        config = config_service.entry("gemini_api_key")
         
         if not config:
             return GeminiApiKeyResponse(
@@ -162,7 +174,7 @@ async def get_gemini_api_key(
                 updated_by=None
             )
         
-        value = config.config_value
+        value = config.value
         api_key = value.get("api_key", "")
         
         # 마스킹: 앞 10자와 뒤 4자만 표시
@@ -199,31 +211,22 @@ async def update_gemini_api_key(
         # TODO: API 키 유효성 검증 (genai.list_models() 호출)
         is_valid = True  # 임시로 항상 True
         
-        config = db.query(SystemConfig).filter(
-            SystemConfig.config_key == "gemini_api_key"
-        ).first()
-        
         config_value = {
             "api_key": update.api_key,
             "is_valid": is_valid
         }
         
-        if config:
-            config.config_value = config_value
-            config.updated_by = current_user.email
-        else:
-            config = SystemConfig(
-                config_key="gemini_api_key",
-                config_value=config_value,
-                description="Gemini AI API Key",
-                updated_by=current_user.email
-            )
-            db.add(config)
-        
-        db.commit()
-        db.refresh(config)
+        config = await run_in_threadpool(
+            config_service.set,
+            db,
+            "gemini_api_key",
+            config_value,
+            updated_by=current_user.email,
+            description="Gemini AI API Key"
+        )
         
         logger.info(f"Gemini API key updated by {current_user.email}")
+        await notify_agents()
         
         # 마스킹된 키 반환
         masked_key = ""
@@ -237,7 +240,7 @@ async def update_gemini_api_key(
             "message": "Gemini API key updated successfully",
             "api_key": masked_key,
             "is_valid": is_valid,
-            "updated_at": config.updated_at.isoformat(),
+            "updated_at": config.updated_at.isoformat() if config.updated_at else None,
             "updated_by": config.updated_by
         }
     except Exception as e:
@@ -249,47 +252,15 @@ async def update_gemini_api_key(
 # ===== Unified Gemini Config Endpoint for AutoTrader =====
 
 @system_router.get("/gemini-config", response_model=GeminiConfigResponse)
-async def get_gemini_config(db: Session = Depends(get_db)):
+def get_gemini_config(request: Request):
     """
     통합 Gemini 설정 조회 (AutoTrader 클라이언트용)
     - 인증 불필요
     - 모델 우선순위 및 API 키 반환
+    - 변경 시 연결된 Agent에는 config_updated 명령으로 전달됨
     """
     try:
-        # 모델 우선순위 가져오기
-        models_config = db.query(SystemConfig).filter(
-            SystemConfig.config_key == "gemini_models"
-        ).first()
-        
-        # API 키 가져오기
-        api_key_config = db.query(SystemConfig).filter(
-            SystemConfig.config_key == "gemini_api_key"
-        ).first()
-        
-        # 기본값
-        model_priority = ["gemini-2.5-flash", "gemini-1.5-flash"]
-        api_keys = {}
-        
-        if models_config:
-            value = models_config.config_value
-            preferred = value.get("preferred_models", [])
-            fallback = value.get("fallback_model", "gemini-2.5-flash")
-            model_priority = preferred if preferred else [fallback]
-        
-        if api_key_config:
-            value = api_key_config.config_value
-            api_key = value.get("api_key", "")
-            if api_key:
-                # 모든 모델에 동일한 API 키 사용
-                for model in model_priority:
-                    api_keys[model] = api_key
-        
-        logger.info(f"Gemini config requested: {len(api_keys)} API keys for {len(model_priority)} models")
-        
-        return GeminiConfigResponse(
-            model_priority=model_priority,
-            api_keys=api_keys
-        )
+        return _cached_json(request, lambda: GeminiConfigResponse(**config_service.gemini_config()))
     except Exception as e:
         logger.error(f"Failed to get unified Gemini config: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve Gemini configuration")
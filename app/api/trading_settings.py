@@ -3,7 +3,7 @@
 트레이딩 설정 API 엔드포인트
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import Optional
 
 from ..core.database import get_db
@@ -23,7 +23,9 @@ router = APIRouter(prefix="/api/v1/settings", tags=["trading-settings"])
 
 def get_user_plan_type(user_id: int, db: Session) -> str:
     """사용자 플랜 타입 조회"""
-    subscription = db.query(Subscription).filter(
+    subscription = db.query(Subscription).options(
+        joinedload(Subscription.plan)
+    ).filter(
         Subscription.user_id == user_id
     ).first()
     
@@ -22,7 +22,12 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
     # 암호화 키 (브로커 인증 정보 암호화용)
-    MASTER_ENCRYPTION_KEY: str
+    MASTER_ENCRYPTION_KEY: str  # 키 버전 1
+    MASTER_ENCRYPTION_KEYS: Optional[str] = None  # 교체용 추가 키 "2:<key>,3:<key>" (가장 높은 버전으로 암호화)
+    CREDENTIAL_CACHE_TTL_SECONDS: int = 300  # 복호화된 인증 정보 캐시
+    CREDENTIAL_CACHE_MAX_SIZE: int = 10000
+    CREDENTIAL_ROTATION_BATCH_SIZE: int = 500
+    CREDENTIAL_ROTATION_INTERVAL_MINUTES: int = 60
     
     # CORS
     CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173", "http://localhost:8082"]
@@ -31,12 +36,88 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     
+    # 모니터링
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None  # 설정 시 /metrics 에 Authorization: Bearer <token> 필요
+    METRICS_WORKER_PORT: Optional[int] = 9101  # 백그라운드 워커의 /metrics 포트 (None이면 노출 안 함)
+    HEALTH_DB_CHECK_CACHE_SECONDS: float = 5.0  # /health DB 확인 결과 재사용 시간
+    SQL_PROFILING_ENABLED: bool = False  # 요청별 쿼리 수/DB 시간 집계 (스테이징용)
+    SQL_SLOW_QUERY_MS: float = 200.0  # 초과 시 문장 + 파라미터 형태 경고 로그
+    SQL_QUERY_COUNT_WARN: int = 20  # 요청당 쿼리 수 경고 임계값 (N+1 후보)
+    SQL_PROFILING_DEBUG_HEADER: bool = False  # 응답에 X-DB-Query-Count / X-DB-Query-Time-Ms
+    PROFILER_MAX_SECONDS: int = 60  # 관리자 샘플링 프로파일 최대 시간
+    
     # 커미션 설정
     COMMISSION_HOLDBACK_DAYS: int = 30
+    COMMISSION_TRANSITION_CHUNK_SIZE: int = 1000  # 상태 전이 UPDATE 청크 크기
+    COMMISSION_TRANSITION_INTERVAL_MINUTES: int = 60
+    COMMISSION_RATE_CACHE_TTL_SECONDS: int = 300  # 커미션 비율 캐시 재적재 주기 (직접 DB 수정 대비)
+    
+    # 예약 작업 실행 위치
+    RUN_SCHEDULERS_IN_API: bool = True  # False: API 워커는 요청만 처리 (예약 작업은 python -m app.worker)
+    SCHEDULER_LEASE_SECONDS: int = 60  # 리더 임대 만료 시간 (리더 장애 시 이 시간 안에 다른 인스턴스가 인계)
+    JOB_LOCK_TTL_SECONDS: int = 120  # 작업 잠금 임대 (PostgreSQL 외 DB - advisory lock 대체)
+    JOB_PROGRESS_INTERVAL_SECONDS: float = 5.0  # 작업 진행 상황 DB 반영 주기
+    COLLECTION_RETRY_DELAY_MINUTES: int = 15  # 부분 실패 후 실패 종목 자동 재수집까지 대기
+    COLLECTION_RETRY_MAX_ATTEMPTS: int = 2  # 자동 재수집 최대 차수 (재수집의 재수집 포함)
+    
+    # 관리자 통계 집계
+    STATS_ROLLUP_REBUILD_DAYS: int = 2  # 스케줄러가 팩트 테이블에서 다시 계산할 최근 일수
+    STATS_ROLLUP_INTERVAL_MINUTES: int = 60
+    
+    # 시스템 설정 캐시
+    SYSTEM_CONFIG_CHECK_SECONDS: int = 10  # 다른 워커 변경 확인 주기 (버전만 조회)
+    SYSTEM_CONFIG_MAX_AGE_SECONDS: int = 60  # 클라이언트 Cache-Control max-age
+    
+    # Agent WebSocket
+    AGENT_BROADCAST_CONCURRENCY: int = 100  # 브로드캐스트 동시 전송 수
+    AGENT_SEND_TIMEOUT_SECONDS: float = 5.0
+    AGENT_COMPRESSION_MIN_BYTES: int = 1024  # msgpack+deflate 압축 임계값
+    AGENT_COMPRESSION_LEVEL: int = 6
+    AGENT_MAX_FRAME_BYTES: int = 1024 * 1024  # 압축 해제 후 수신 프레임 최대 크기 (압축 폭탄 방지)
+    AGENT_AUTH_REQUIRED: bool = True  # False: 개발용 (x-user-id만으로 연결 허용)
+    AGENT_AUTH_CACHE_TTL_SECONDS: int = 300  # 검증된 키 캐시
+    AGENT_AUTH_NEGATIVE_TTL_SECONDS: int = 30  # 잘못된 키 캐시
+    AGENT_AUTH_CACHE_MAX_SIZE: int = 50000
+    AGENT_AUTH_MAX_CONCURRENT_VERIFY: int = 10  # 동시 DB 검증 수 (DB 풀 보호)
+    AGENT_ADMISSION_RATE: float = 500.0  # 초당 연결 허용 수 (재연결 폭주 완화)
+    AGENT_ADMISSION_BURST: int = 1000
+    AGENT_ADMISSION_TIMEOUT_SECONDS: float = 10.0  # 대기 초과 시 1013 (Try Again Later)
+    
+    # 토스페이먼츠
+    TOSS_API_URL: str = "https://api.tosspayments.com/v1"  # 로컬 테스트: fake_toss_server.py 주소
+    TOSS_SECRET_KEY: Optional[str] = None  # 필수 (미설정 시 토스 API 호출 실패, 로컬 테스트는 토스 문서의 test_sk_ 키)
+    TOSS_HTTP_MAX_CONNECTIONS: int = 50
+    TOSS_HTTP_MAX_KEEPALIVE: int = 20
+    TOSS_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    TOSS_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    TOSS_HTTP_READ_TIMEOUT_SECONDS: float = 30.0
+    TOSS_HTTP_MAX_RETRIES: int = 2  # 미전송 오류는 항상, 그 외는 Idempotency-Key 있는 요청만 재시도
+    TOSS_HTTP_RETRY_BACKOFF_SECONDS: float = 0.5
+    TOSS_HTTP_SLOW_CALL_SECONDS: float = 3.0  # 초과 시 경고 로그
+    TOSS_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 시 차단
+    TOSS_CIRCUIT_RESET_SECONDS: float = 30.0
+    
+    # 자동 결제 (구독 갱신)
+    RENEWAL_LOOKAHEAD_DAYS: int = 3  # 만료 N일 전부터 갱신 결제
+    RENEWAL_CONCURRENCY: int = 20  # 동시 결제 요청 수
+    RENEWAL_COMMIT_BATCH_SIZE: int = 100  # 갱신 결과 커밋 단위
+    RENEWAL_CLAIM_BATCH_SIZE: int = 200  # 한 번에 점유하는 작업 수
+    RENEWAL_MAX_ATTEMPTS: int = 5  # 초과 시 DEAD
+    RENEWAL_RETRY_BASE_MINUTES: int = 30  # 재시도 간격: 30분, 1시간, 2시간, ...
+    RENEWAL_RETRY_MAX_MINUTES: int = 1440
+    RENEWAL_STALE_MINUTES: int = 15  # RUNNING 상태가 이보다 오래되면 복구
+    RENEWAL_DRAIN_INTERVAL_MINUTES: int = 5  # 재시도 작업 처리 주기
     
     # 결제 웹훅 (추후 설정)
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
-    TOSS_WEBHOOK_SECRET: Optional[str] = None
+    TOSS_WEBHOOK_SECRET: Optional[str] = None  # 미설정 시 웹훅 거부
+    TOSS_WEBHOOK_ALLOW_UNSIGNED: bool = False  # True면 시크릿 미설정 시 서명 검증 생략 (개발용)
+    WEBHOOK_BATCH_SIZE: int = 100  # 수신함 배치 처리 크기
+    WEBHOOK_MAX_ATTEMPTS: int = 5  # 초과 시 FAILED
+    WEBHOOK_RETRY_BASE_SECONDS: int = 30  # 재시도 간격: 30초, 1분, 2분, ...
+    WEBHOOK_RETRY_MAX_SECONDS: int = 3600
+    WEBHOOK_CONSUMER_INTERVAL_SECONDS: int = 10
     
     class Config:
         env_file = ".env"  # 현재 디렉토리의 .env 파일 사용
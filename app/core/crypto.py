@@ -2,37 +2,76 @@
 """
 암호화/복호화 유틸리티
 - Fernet 대칭 암호화 사용
-- MASTER_ENCRYPTION_KEY 기반
+- 버전별 키 (MultiFernet)
+  - 버전 1 = MASTER_ENCRYPTION_KEY
+  - MASTER_ENCRYPTION_KEYS="2:<key>,3:<key>" 로 새 키 추가
+  - 가장 높은 버전으로 암호화, 복호화는 모든 키 시도
+- 이전 키로 암호화된 값은 rotate()로 재암호화 (credential_vault 재암호화 작업)
 """
-from cryptography.fernet import Fernet
+from typing import Dict, Optional
+
+from cryptography.fernet import Fernet, MultiFernet
 from .config import settings
 
 
+def _parse_keys(primary_key: str, extra_keys: Optional[str]) -> Dict[int, str]:
+    """설정값 → {버전: 키}"""
+    keys = {1: primary_key}
+    for item in (extra_keys or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        version, sep, key = item.partition(":")
+        if not sep or not version.strip().isdigit():
+            raise ValueError("MASTER_ENCRYPTION_KEYS must look like '2:<fernet key>,3:<fernet key>'")
+        keys[int(version)] = key.strip()
+    return keys
+
+
+class CredentialCipher:
+    """버전별 키를 가진 Fernet 암호화기"""
+
+    def __init__(self, keys: Dict[int, str]):
+        self.versions = sorted(keys, reverse=True)
+        self.primary_version = self.versions[0]
+        self._fernet = MultiFernet([Fernet(keys[version].encode()) for version in self.versions])
+
+    def encrypt(self, data: str) -> str:
+        return self._fernet.encrypt(data.encode()).decode()
+
+    def decrypt(self, encrypted: str) -> str:
+        return self._fernet.decrypt(encrypted.encode()).decode()
+
+    def rotate(self, encrypted: str) -> str:
+        """현재 키로 재암호화 (평문 불변)"""
+        return self._fernet.rotate(encrypted.encode()).decode()
+
+
 # Fernet 암호화 인스턴스
-cipher = Fernet(settings.MASTER_ENCRYPTION_KEY.encode())
+cipher = CredentialCipher(_parse_keys(settings.MASTER_ENCRYPTION_KEY, settings.MASTER_ENCRYPTION_KEYS))
 
 
 def encrypt_credential(data: str) -> str:
     """
     인증 정보 암호화
-    
+
     Args:
         data: 평문 데이터
-    
+
     Returns:
-        암호화된 문자열
+        암호화된 문자열 (현재 키 버전: cipher.primary_version)
     """
-    return cipher.encrypt(data.encode()).decode()
+    return cipher.encrypt(data)
 
 
 def decrypt_credential(encrypted: str) -> str:
     """
     인증 정보 복호화
-    
+
     Args:
         encrypted: 암호화된 데이터
-    
+
     Returns:
         복호화된 평문
     """
-    return cipher.decrypt(encrypted.encode()).decode()
+    return cipher.decrypt(encrypted)
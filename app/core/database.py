@@ -1,9 +1,10 @@
 # central-backend/app/models/database.py
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from typing import Generator, List, Optional, Union
+import time
 
 from ..core.config import settings
 
@@ -32,8 +33,38 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+def insert_ignore(db: Session, model, rows: Union[dict, List[dict]], index_elements: List[str]) -> Optional[int]:
+    """
+    INSERT ... ON CONFLICT DO NOTHING (PostgreSQL / SQLite)
+    
+    Returns:
+        삽입된 행 수 (지원하지 않는 DB면 None → 호출자가 조회 후 삽입)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    
+    result = db.execute(insert(model).values(rows).on_conflict_do_nothing(index_elements=index_elements))
+    return result.rowcount
+
+def ping_database() -> float:
+    """
+    DB 연결 확인 (SELECT 1)
+    
+    Returns:
+        왕복 시간(초) - 실패 시 예외
+    """
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return time.perf_counter() - started
+
 def init_db():
     """모든 테이블 생성"""
     # 모든 모델 import (테이블 생성을 위해)
-    from ..models import user, commission, kiwoom, trading_settings, support
+    from ..models import user, commission, kiwoom, trading_settings, support, agent, payment, scheduler
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,274 @@
+# central-backend/app/core/http_client.py
+"""
+토스페이먼츠 API 공용 HTTP 클라이언트
+- 이벤트 루프당 하나의 httpx.AsyncClient (API 서버 루프는 startup/shutdown에서 관리)
+- 스케줄러처럼 asyncio.run으로 도는 작업은 session()으로 실행 동안만 클라이언트 유지
+- 커넥션 풀 / keep-alive / 타임아웃 설정, h2 설치 시 HTTP/2
+- 재시도 (요청 미전송 오류는 항상, 그 외는 멱등 요청만) + 서킷 브레이커
+- 호출별 지연 시간 기록
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+import asyncio
+import logging
+import random
+import threading
+import time
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 요청이 서버에 도달하지 않은 오류 → 멱등성과 무관하게 재시도 가능
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """서킷 브레이커가 열려 요청을 보내지 않음"""
+
+
+class TossNotConfiguredError(CircuitOpenError):
+    """TOSS_SECRET_KEY 미설정 - 요청을 보내지 않음 (테스트 키로 실결제를 대신하지 않도록)"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 시 일정 시간 요청 차단
+    - closed: 정상
+    - open: reset_seconds 동안 즉시 실패
+    - half-open: 시험 요청 1건 허용, 성공 시 closed
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.error(f"🔌 Toss API circuit opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+
+class LatencyRecorder:
+    """작업별 호출 지연 시간 (최근 N건으로 백분위 계산)"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, error: bool = False):
+        with self._lock:
+            self._samples.setdefault(operation, deque(maxlen=self.window)).append(seconds)
+            self._counts[operation] = self._counts.get(operation, 0) + 1
+            if error:
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            result = {}
+            for operation, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[operation] = {
+                    "count": self._counts.get(operation, 0),
+                    "errors": self._errors.get(operation, 0),
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                    "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                }
+            return result
+
+
+class TossApiClient:
+    """토스 API 호출 (재시도/서킷 브레이커/지연 기록 포함)"""
+
+    def __init__(self):
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+        self.breaker = CircuitBreaker(
+            settings.TOSS_CIRCUIT_FAILURE_THRESHOLD,
+            settings.TOSS_CIRCUIT_RESET_SECONDS,
+        )
+        self.latency = LatencyRecorder()
+
+    def _build(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=settings.TOSS_API_URL,
+            http2=HTTP2_AVAILABLE,
+            auth=(settings.TOSS_SECRET_KEY or "", ""),  # 미설정 시 _send에서 요청 전에 실패
+            timeout=httpx.Timeout(
+                settings.TOSS_HTTP_READ_TIMEOUT_SECONDS,
+                connect=settings.TOSS_HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.TOSS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.TOSS_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.TOSS_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프의 클라이언트 (없으면 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._build()
+                self._clients[loop] = client
+            return client
+
+    async def start(self):
+        """현재 루프용 클라이언트 생성 (API 서버 startup)"""
+        if not settings.TOSS_SECRET_KEY:
+            logger.error("❌ TOSS_SECRET_KEY is not set - all Toss API calls will fail")
+        self._client()
+        logger.info(f"✅ Toss API client ready ({settings.TOSS_API_URL}, http2={HTTP2_AVAILABLE})")
+
+    async def aclose(self):
+        """현재 루프의 클라이언트 종료 (API 서버 shutdown)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        작업 실행 동안 클라이언트 유지
+        - 이미 루프에 클라이언트가 있으면 그대로 사용 (API 서버)
+        - 없으면 생성 후 종료 시 닫음 (asyncio.run 기반 스케줄러 작업)
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owned = loop not in self._clients
+        self._client()
+        try:
+            yield self
+        finally:
+            if owned:
+                await self.aclose()
+
+    async def post(
+        self,
+        path: str,
+        json: dict,
+        operation: str,
+        idempotency_key: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        POST 요청
+
+        Args:
+            path: TOSS_API_URL 기준 경로 (예: /payments/confirm)
+            operation: 지연 시간 기록용 이름
+            idempotency_key: 지정 시 Idempotency-Key 헤더 전송 + 응답 미수신 오류도 재시도
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있음
+            httpx.HTTPError: 재시도 후에도 전송 실패
+        """
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        return await self._send("POST", path, operation, idempotent=idempotency_key is not None, json=json, headers=headers)
+
+    async def get(self, path: str, operation: str) -> httpx.Response:
+        """
+        GET 요청 (조회 - 항상 멱등이므로 응답 미수신 오류 / 5xx도 재시도)
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있음
+            httpx.HTTPError: 재시도 후에도 전송 실패
+        """
+        return await self._send("GET", path, operation, idempotent=True)
+
+    async def _send(self, method: str, path: str, operation: str, idempotent: bool, **kwargs) -> httpx.Response:
+        if not settings.TOSS_SECRET_KEY:
+            raise TossNotConfiguredError(f"TOSS_SECRET_KEY is not set ({operation})")
+        max_retries = settings.TOSS_HTTP_MAX_RETRIES
+
+        for attempt in range(max_retries + 1):
+            if not self.breaker.allow():
+                self.latency.record(operation, 0.0, error=True)
+                raise CircuitOpenError(f"Toss API circuit open ({operation})")
+
+            started = time.perf_counter()
+            try:
+                response = await self._client().request(method, path, **kwargs)
+            except httpx.HTTPError as e:
+                elapsed = time.perf_counter() - started
+                self.latency.record(operation, elapsed, error=True)
+                self.breaker.record_failure()
+
+                retryable = isinstance(e, _NOT_SENT_ERRORS) or (
+                    idempotent and isinstance(e, httpx.TransportError)
+                )
+                if not retryable or attempt == max_retries:
+                    raise
+                logger.warning(f"Toss {operation} failed ({type(e).__name__}), retrying ({attempt + 1}/{max_retries})")
+            else:
+                elapsed = time.perf_counter() - started
+                server_error = response.status_code >= 500
+                self.latency.record(operation, elapsed, error=server_error)
+                if server_error:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+                if elapsed > settings.TOSS_HTTP_SLOW_CALL_SECONDS:
+                    logger.warning(f"🐢 Slow Toss {operation}: {elapsed * 1000:.0f}ms (status {response.status_code})")
+
+                retryable = idempotent and response.status_code in _RETRYABLE_STATUS
+                if not retryable or attempt == max_retries:
+                    return response
+                logger.warning(f"Toss {operation} returned {response.status_code}, retrying ({attempt + 1}/{max_retries})")
+
+            # 지수 백오프 + 지터
+            await asyncio.sleep(settings.TOSS_HTTP_RETRY_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+toss_client = TossApiClient()
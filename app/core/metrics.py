@@ -0,0 +1,378 @@
+# central-backend/app/core/metrics.py
+"""
+Prometheus 호환 메트릭
+- 외부 의존성 없는 최소 구현 (Counter / Gauge / Histogram, text format 0.0.4)
+- 프로세스(워커)별 값 → 모든 시계열에 worker 라벨을 붙여 구분
+- HTTP: ASGI 미들웨어가 라우트 템플릿 기준으로 요청 수 / 지연 히스토그램 / 처리 중 요청 수 기록
+- DB 커넥션 풀, Agent 연결 수, 토스 API 상태는 스크레이프 시점에 계산 (callback gauge)
+- 데이터 수집 작업은 collection_* 카운터로 기록
+- 커미션 상태 전이는 commission_transition* 카운터로 기록
+- API 서버는 /metrics 라우트, 백그라운드 워커(app.worker)는 start_metrics_server 로 별도 포트 노출
+  (RUN_SCHEDULERS_IN_API=False 이면 collection_* / commission_transition* 는 워커 포트에서만 보임)
+"""
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from app.services.agent_bus import WORKER_ID
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = [("worker", WORKER_ID)] + list(zip(names, values))
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """
+    현재 값
+    - set/inc/dec 직접 갱신 또는
+    - callback: 스크레이프 시 [(라벨 값 튜플, 값)] 반환
+    """
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                items = list(self._callback())
+            except Exception:
+                items = []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (histogram_quantile로 p50/p99 계산)"""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+        lines = self.header()
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+# ---- HTTP ----
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed"
+))
+
+
+class MetricsMiddleware:
+    """
+    요청별 메트릭 기록 (순수 ASGI 미들웨어 - 스트리밍 응답도 그대로 통과)
+    - route 라벨은 경로 템플릿 (/api/v1/kiwoom/credentials/{credential_id}) → 시계열 수 제한
+    - 매칭되지 않은 경로는 "unmatched"
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+
+            http_requests_total.inc(method=method, route=route_path, status=str(status_holder["status"]))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route_path)
+
+
+# ---- 데이터 수집 작업 ----
+
+collection_runs_total = registry.register(Counter(
+    "collection_runs_total", "Data collection job runs by final status", ("job", "status")
+))
+collection_items_total = registry.register(Counter(
+    "collection_items_total", "Items processed by data collection jobs", ("job", "result")
+))
+collection_duration_seconds = registry.register(Histogram(
+    "collection_duration_seconds", "Data collection job duration", ("job",),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+))
+
+
+def record_collection(job: str, status: str, succeeded: int, failed: int, duration: float):
+    """데이터 수집 작업 1회 결과 기록"""
+    collection_runs_total.inc(job=job, status=status)
+    collection_items_total.inc(succeeded, job=job, result="success")
+    collection_items_total.inc(failed, job=job, result="failed")
+    collection_duration_seconds.observe(duration, job=job)
+
+
+# ---- 커미션 상태 전이 ----
+
+commission_transition_runs_total = registry.register(Counter(
+    "commission_transition_runs_total", "Commission state transition runs by result", ("status",)
+))
+commission_transitions_total = registry.register(Counter(
+    "commission_transitions_total", "Commissions moved between states", ("from_status", "to_status")
+))
+
+
+def record_commission_transitions(holdback: int, approved: int):
+    """커미션 상태 전이 1회 결과 기록 (전이 0건인 실행도 runs로 집계)"""
+    commission_transition_runs_total.inc(status="success")
+    commission_transitions_total.inc(holdback, from_status="PENDING", to_status="HOLDBACK")
+    commission_transitions_total.inc(approved, from_status="HOLDBACK", to_status="APPROVED")
+
+
+# ---- 스크레이프 시점 계산 (DB 풀 / Agent / 토스 API) ----
+
+def _db_pool_values():
+    from app.core.database import engine
+
+    pool = engine.pool
+    for state, getter in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow"), ("checked_in", "checkedin")):
+        method = getattr(pool, getter, None)
+        if method is not None:
+            yield (state,), method()
+
+
+def _agent_connection_values():
+    from app.routers.agent_ws import connected_agents
+
+    yield (), len(connected_agents)
+
+
+def _toss_call_values():
+    from app.core.http_client import toss_client
+
+    for operation, stats in toss_client.latency.snapshot().items():
+        yield (operation, "total"), stats["count"]
+        yield (operation, "error"), stats["errors"]
+
+
+def _toss_latency_values():
+    from app.core.http_client import toss_client
+
+    for operation, stats in toss_client.latency.snapshot().items():
+        for quantile, field in (("0.5", "p50_ms"), ("0.99", "p99_ms")):
+            yield (operation, quantile), stats[field] / 1000
+
+
+def _toss_circuit_values():
+    from app.core.http_client import toss_client
+
+    yield (), {"closed": 0, "half-open": 1, "open": 2}[toss_client.breaker.state]
+
+
+registry.register(Gauge(
+    "db_pool_connections", "SQLAlchemy connection pool state", ("state",), callback=_db_pool_values
+))
+registry.register(Gauge(
+    "agent_connections", "Agent WebSocket connections on this worker", callback=_agent_connection_values
+))
+registry.register(Gauge(
+    "toss_api_calls", "Toss API calls since start by operation (total / error)", ("operation", "result"),
+    callback=_toss_call_values
+))
+registry.register(Gauge(
+    "toss_api_latency_seconds", "Toss API latency over the recent window", ("operation", "quantile"),
+    callback=_toss_latency_values
+))
+registry.register(Gauge(
+    "toss_api_circuit_state", "Toss API circuit breaker (0 closed, 1 half-open, 2 open)",
+    callback=_toss_circuit_values
+))
+
+
+# ---- 워커 프로세스용 HTTP 엔드포인트 ----
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    token: Optional[str] = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        if self.token and self.headers.get("authorization") != f"Bearer {self.token}":
+            self.send_error(401)
+            return
+
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(host: str, port: int, token: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    GET /metrics 만 제공하는 HTTP 서버를 데몬 스레드로 시작 (API 서버가 없는 워커 프로세스용)
+    - token 지정 시 Authorization: Bearer <token> 필요 (API의 METRICS_TOKEN 과 동일)
+    - 종료: server.shutdown()
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"token": token})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
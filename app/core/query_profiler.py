@@ -0,0 +1,123 @@
+# central-backend/app/core/query_profiler.py
+"""
+SQL 쿼리 프로파일러
+- SQLAlchemy 엔진 이벤트로 요청별 쿼리 수 / DB 시간 집계 (contextvars)
+  - 동기 엔드포인트/의존성은 스레드풀에서 실행되지만 컨텍스트가 복사되므로 같은 집계 객체에 누적
+- SQL_SLOW_QUERY_MS 초과 쿼리는 문장 + 파라미터 형태(값 제외)로 경고 로그
+- 요청당 쿼리 수가 SQL_QUERY_COUNT_WARN 이상이면 경고 (N+1 후보)
+- SQL_PROFILING_DEBUG_HEADER: 응답에 X-DB-Query-Count / X-DB-Query-Time-Ms 헤더
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+import logging
+import time
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import Histogram, registry
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_LOG_LIMIT = 500
+
+
+@dataclass
+class RequestQueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slow_count: int = 0
+    statements: dict = field(default_factory=dict)  # 문장별 실행 횟수 (N+1 탐지)
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+))
+db_time_per_request_seconds = registry.register(Histogram(
+    "db_time_per_request_seconds", "Total SQL time per HTTP request", ("route",)
+))
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """바인딩 값 대신 타입만 표시 (로그에 개인정보/비밀값이 남지 않도록)"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    elapsed = time.perf_counter() - started
+
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        if stats is not None:
+            stats.slow_count += 1
+        logger.warning(
+            f"🐢 Slow query {elapsed * 1000:.1f}ms: {' '.join(statement.split())[:_STATEMENT_LOG_LIMIT]} "
+            f"params={parameter_shape(parameters)}{' (executemany)' if executemany else ''}"
+        )
+
+
+def install(engine):
+    """엔진에 이벤트 훅 등록 (SQL_PROFILING_ENABLED일 때 main에서 호출)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    logger.info(f"SQL profiling enabled (slow query threshold {settings.SQL_SLOW_QUERY_MS}ms)")
+
+
+class QueryProfilerMiddleware:
+    """요청별 쿼리 집계 (순수 ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.SQL_PROFILING_DEBUG_HEADER:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-query-time-ms", f"{stats.total_seconds * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+
+            db_queries_per_request.observe(stats.count, route=route)
+            db_time_per_request_seconds.observe(stats.total_seconds, route=route)
+
+            if stats.count >= settings.SQL_QUERY_COUNT_WARN:
+                statement, repeated = max(stats.statements.items(), key=lambda item: item[1], default=("", 0))
+                logger.warning(
+                    f"🔁 {scope.get('method')} {route}: {stats.count} queries "
+                    f"({stats.total_seconds * 1000:.1f}ms), most repeated x{repeated}: "
+                    f"{' '.join(statement.split())[:_STATEMENT_LOG_LIMIT]}"
+                )
@@ -0,0 +1,112 @@
+# central-backend/app/core/sampling_profiler.py
+"""
+샘플링 프로파일러 (관리자 진단용)
+- 요청 시에만 샘플링 스레드 실행 → 평상시 오버헤드 없음
+- 일정 간격으로 모든 스레드(API 스레드풀, APScheduler, 이벤트 루프 포함)의 스택 수집
+- 결과: collapsed stack 형식 ("스레드;함수;함수 횟수") → flamegraph.pl / speedscope 에서 바로 열림
+- 동시에 하나의 프로파일만 실행
+- API에서는 sample_in_thread: 전용 스레드에서 실행 (최대 PROFILER_MAX_SECONDS 동안 공용 스레드풀을 점유하지 않음)
+"""
+from collections import Counter
+from typing import Dict, List
+import asyncio
+import sys
+import threading
+import time
+
+
+class ProfilerBusyError(RuntimeError):
+    """이미 다른 프로파일이 실행 중"""
+
+
+_running = threading.Lock()
+
+
+def _short_path(filename: str) -> str:
+    """site-packages / 표준 라이브러리 / 프로젝트 경로 앞부분 제거"""
+    index = filename.rfind("site-packages/")
+    if index >= 0:
+        return filename[index + len("site-packages/"):]
+    index = filename.rfind("/lib/python")
+    if index >= 0:
+        return filename[filename.index("/", index + len("/lib/python")) + 1:]
+    index = filename.rfind("/app/")
+    if index >= 0:
+        return filename[index + 1:]
+    return filename
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> List[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def sample(duration_seconds: float, interval_seconds: float = 0.01) -> Dict[str, object]:
+    """
+    duration 동안 interval마다 전체 스레드 스택 샘플링 (호출 스레드에서 실행)
+
+    Returns:
+        {"samples": 샘플링 횟수, "threads": 관찰된 스레드 수, "collapsed": collapsed stack 텍스트}
+
+    Raises:
+        ProfilerBusyError: 다른 프로파일 실행 중
+    """
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusyError("Another profile is already running")
+
+    try:
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        seen_threads = set()
+        samples = 0
+        deadline = time.monotonic() + duration_seconds
+
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                thread_name = names.get(ident, f"thread-{ident}").replace(";", "_").replace(" ", "_")
+                seen_threads.add(ident)
+                stacks[";".join([thread_name] + _collapse(frame))] += 1
+            samples += 1
+            time.sleep(interval_seconds)
+
+        collapsed = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        return {"samples": samples, "threads": len(seen_threads), "collapsed": collapsed + "\n"}
+    finally:
+        _running.release()
+
+
+async def sample_in_thread(duration_seconds: float, interval_seconds: float = 0.01) -> Dict[str, object]:
+    """sample()을 전용 스레드에서 실행하고 완료를 대기 (이벤트 루프 / 스레드풀 비차단)"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result=None, error=None):
+        if future.done():  # 요청 취소
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        try:
+            result = sample(duration_seconds, interval_seconds)
+        except Exception as e:
+            loop.call_soon_threadsafe(resolve, None, e)
+        else:
+            loop.call_soon_threadsafe(resolve, result)
+
+    threading.Thread(target=run, name="sampling-profiler", daemon=True).start()
+    return await future
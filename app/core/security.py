@@ -64,11 +64,14 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    """현재 인증된 사용자 가져오기"""
+    """
+    현재 인증된 사용자 가져오기
+    - 동기 의존성으로 두어 스레드풀에서 실행 (DB 풀 대기 중에도 이벤트 루프 차단 없음)
+    """
     payload = decode_token(token)
     
     user_id: str = payload.get("sub")
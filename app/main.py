@@ -5,12 +5,18 @@
 - 구독 관리
 - 커미션 관리
 """
-from fastapi import FastAPI
+from datetime import datetime
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import logging
+import time
 
 from .core.config import settings
-from .core.database import init_db
+from .core.database import engine, init_db, ping_database
+from .core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
 from .api import auth_router, subscriptions_router, commissions_router, users_router, kiwoom_router, trading_settings_router
 from .api.support import router as support_router
 from .api.admin import router as admin_router
@@ -42,6 +48,16 @@ app.add_middleware(
     max_age=3600,
 )
 
+# SQL 프로파일링 (요청별 쿼리 수 / 느린 쿼리 로그)
+if settings.SQL_PROFILING_ENABLED:
+    from .core import query_profiler
+    query_profiler.install(engine)
+    app.add_middleware(query_profiler.QueryProfilerMiddleware)
+
+# 요청 메트릭 (라우트별 요청 수 / 지연 히스토그램)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(auth_router)
 app.include_router(subscriptions_router)
@@ -57,10 +73,13 @@ app.include_router(support_router)
 # [NEW] Agent 관련 라우터
 from .routers.agent_ws import router as agent_ws_router
 from .routers.agent_control import router as agent_control_router
-from .api.system_config import system_router
+from .api.system_config import router as config_router, system_router
+from .api.bootstrap import router as bootstrap_router
 app.include_router(agent_ws_router)
 app.include_router(agent_control_router)
+app.include_router(config_router)
 app.include_router(system_router)
+app.include_router(bootstrap_router)
 
 # [NEW] Financial Data 라우터 (백테스팅 DB 수집)
 from .routers.financial_data import router as financial_data_router
@@ -76,14 +95,29 @@ async def startup_event():
     init_db()
     logger.info("✅ Database initialized")
     
-    # 스케줄러 시작 (자동결제)
+    # 워커 간 Agent 메시지 버스 시작 (브로드캐스트 전파)
+    from .services.agent_bus import agent_bus
+    agent_bus.start(asyncio.get_running_loop())
+    
+    # 토스 API 공용 클라이언트 (커넥션 재사용)
+    from .core.http_client import toss_client
+    await toss_client.start()
+    
+    # 스케줄러 시작 (자동결제 등 - RUN_SCHEDULERS_IN_API=False면 프로세스별 작업만)
     from .scheduler import start_scheduler
-    start_scheduler()
+    start_scheduler(run_background_jobs=settings.RUN_SCHEDULERS_IN_API)
     
-    # 데이터 수집 스케줄러 시작
-    from .services.data_scheduler import start_data_scheduler
-    start_data_scheduler()
-    logger.info("✅ Data collection scheduler started")
+    if settings.RUN_SCHEDULERS_IN_API:
+        # 예약 작업은 리더 임대를 가진 워커 하나에서만 실행
+        from .services.leader_lease import scheduler_lease
+        scheduler_lease.start()
+        
+        # 데이터 수집 스케줄러 시작
+        from .services.data_scheduler import start_data_scheduler
+        start_data_scheduler()
+        logger.info("✅ Data collection scheduler started")
+    else:
+        logger.info("Background jobs disabled in API (RUN_SCHEDULERS_IN_API=False) - run `python -m app.worker`")
     
     logger.info(f"✅ Server ready on http://{settings.HOST}:{settings.PORT}")
 
@@ -93,10 +127,23 @@ async def shutdown_event():
     """서버 종료 시 실행"""
     logger.info("🛑 Server shutting down...")
     
-    # 데이터 수집 스케줄러 중지
-    from .services.data_scheduler import stop_data_scheduler
-    stop_data_scheduler()
-    logger.info("✅ Data collection scheduler stopped")
+    from .services.agent_bus import agent_bus
+    agent_bus.stop()
+    
+    from .core.http_client import toss_client
+    await toss_client.aclose()
+    
+    from .scheduler import stop_scheduler
+    stop_scheduler()
+    
+    if settings.RUN_SCHEDULERS_IN_API:
+        # 데이터 수집 스케줄러 중지
+        from .services.data_scheduler import stop_data_scheduler
+        stop_data_scheduler()
+        logger.info("✅ Data collection scheduler stopped")
+        
+        from .services.leader_lease import scheduler_lease
+        scheduler_lease.stop()
 
 
 @app.get("/")
@@ -109,14 +156,44 @@ async def root():
     }
 
 
+# DB 확인 결과 캐시 (헬스 체크 폭주 시 DB 부하 방지)
+_db_health = {"checked_at": 0.0, "ok": False, "latency_ms": None, "error": None}
+_db_health_lock = asyncio.Lock()
+
+
+async def _check_database() -> dict:
+    async with _db_health_lock:
+        if time.monotonic() - _db_health["checked_at"] >= settings.HEALTH_DB_CHECK_CACHE_SECONDS:
+            try:
+                latency = await asyncio.wait_for(run_in_threadpool(ping_database), timeout=5)
+                _db_health.update(ok=True, latency_ms=round(latency * 1000, 1), error=None)
+            except Exception as e:
+                _db_health.update(ok=False, latency_ms=None, error=type(e).__name__)
+                logger.error(f"Health check DB ping failed: {e}")
+            _db_health["checked_at"] = time.monotonic()
+        return dict(_db_health)
+
+
 @app.get("/health")
 async def health_check():
-    """상세 헬스 체크"""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "timestamp": "2025-12-13T21:30:00Z"
+    """상세 헬스 체크 (DB 확인 결과는 HEALTH_DB_CHECK_CACHE_SECONDS 동안 재사용)"""
+    db = await _check_database()
+    body = {
+        "status": "healthy" if db["ok"] else "unhealthy",
+        "database": "connected" if db["ok"] else "unavailable",
+        "database_latency_ms": db["latency_ms"],
+        "timestamp": datetime.utcnow().isoformat() + "Z"
     }
+    return JSONResponse(body, status_code=200 if db["ok"] else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus 메트릭 (text format)"""
+    if settings.METRICS_TOKEN:
+        if request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+            return Response(status_code=401)
+    return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
 
 
 if __name__ == "__main__":
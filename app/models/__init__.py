@@ -1,10 +1,13 @@
 # central-backend/app/models/__init__.py
 from app.core.database import Base, engine, SessionLocal, get_db, init_db
-from .user import User, Subscription
-from .commission import Referral, Commission, SubscriptionPlan, CommissionRate
+from .user import User, Subscription, SubscriptionEvent
+from .commission import Referral, Commission, SubscriptionPlan, CommissionRate, CommissionBalance
 from .support import SupportInquiry
-from .financial_data import StockInfo, DailyPrice, FinancialStatement, Disclosure, DataCollectionLog
+from .financial_data import StockInfo, DailyPrice, FinancialStatement, Disclosure, DataCollectionLog, MarketHoliday, PriceCoverage
 from .system_config import SystemConfig
+from .agent import AgentBroadcast, AgentApiKey
+from .payment import RenewalJob, WebhookEvent, PaymentRecord, DailyStatsRollup
+from .scheduler import SchedulerLease, JobRun, JobRunFailure
 
 __all__ = [
     "Base",
@@ -14,15 +17,28 @@ __all__ = [
     "init_db",
     "User",
     "Subscription",
+    "SubscriptionEvent",
     "Referral",
     "Commission",
     "SubscriptionPlan",
     "CommissionRate",
+    "CommissionBalance",
     "SupportInquiry",
     "StockInfo",
     "DailyPrice",
     "FinancialStatement",
     "Disclosure",
     "DataCollectionLog",
+    "MarketHoliday",
+    "PriceCoverage",
     "SystemConfig",
+    "AgentBroadcast",
+    "AgentApiKey",
+    "RenewalJob",
+    "WebhookEvent",
+    "PaymentRecord",
+    "DailyStatsRollup",
+    "SchedulerLease",
+    "JobRun",
+    "JobRunFailure",
 ]
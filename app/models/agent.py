@@ -0,0 +1,55 @@
+# central-backend/app/models/agent.py
+"""
+로컬 Agent 관련 모델
+- 관리자 브로드캐스트 이력 및 전달 통계
+- Agent 인증용 API 키
+"""
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class AgentBroadcast(Base):
+    """Agent 브로드캐스트 명령 (워커 간 공유)"""
+    __tablename__ = "agent_broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 명령
+    command = Column(String, nullable=False, comment="Agent 명령 (예: config_refresh)")
+    data = Column(JSON, nullable=True, comment="명령 데이터")
+
+    # 대상 (null = 연결된 전체 Agent)
+    target_user_ids = Column(JSON, nullable=True, comment="대상 사용자 ID 목록 (null = 전체)")
+
+    # 전달 통계 (모든 워커가 누적)
+    delivered_count = Column(Integer, default=0, nullable=False, comment="전달 성공 수")
+    failed_count = Column(Integer, default=0, nullable=False, comment="전달 실패 수")
+
+    created_by = Column(String, nullable=True, comment="요청한 관리자 이메일")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AgentApiKey(Base):
+    """Agent API 키 (해시만 저장, 평문은 발급 시 1회만 노출)"""
+    __tablename__ = "agent_api_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    name = Column(String, nullable=True, comment="키 별칭 (예: 집 PC)")
+    key_prefix = Column(String(12), nullable=False, comment="식별용 앞자리 (표시용)")
+    key_hash = Column(String(64), unique=True, nullable=False, index=True, comment="HMAC-SHA256 해시")
+
+    # 상태
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=True, comment="마지막 검증 시각 (캐시 미스 시 기록, 주기적으로 일괄 반영)")
+    revoked_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    user = relationship("User")
@@ -1,5 +1,5 @@
 # central-backend/app/models/commission.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 import enum
@@ -105,6 +105,9 @@ class SubscriptionPlan(Base):
 class CommissionRate(Base):
     """커미션 비율 설정 (DB에서 이벤트별로 관리)"""
     __tablename__ = "commission_rates"
+    __table_args__ = (
+        Index("idx_commission_rates_lookup", "event_type", "plan_id", "is_active", "valid_from"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -132,3 +135,22 @@ class CommissionRate(Base):
     # Relationships
     plan = relationship("SubscriptionPlan", back_populates="commission_rates")
     commissions = relationship("Commission", back_populates="commission_rate")
+
+
+class CommissionBalance(Base):
+    """추천인별 커미션 잔액 (커미션/추천 변경 시 같은 트랜잭션에서 증분 갱신)"""
+    __tablename__ = "commission_balances"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, comment="추천인 ID")
+    
+    # 상태별 합계
+    total_pending = Column(Float, default=0, nullable=False)
+    total_holdback = Column(Float, default=0, nullable=False)
+    total_approved = Column(Float, default=0, nullable=False)
+    total_paid = Column(Float, default=0, nullable=False)
+    
+    # 추천 통계
+    total_referrals = Column(Integer, default=0, nullable=False)
+    active_referrals = Column(Integer, default=0, nullable=False)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
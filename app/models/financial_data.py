@@ -5,8 +5,10 @@
 - 재무제표 데이터
 - 종목 기본 정보
 - 공시 정보
+- 휴장일 (거래일 달력)
+- 종목별 일봉 보유 현황 (수집 범위 / 누락 거래일)
 """
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Time, Boolean, Text, Index, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Time, Boolean, Text, JSON, Index, UniqueConstraint, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -190,8 +192,9 @@ class DataCollectionLog(Base):
     success_count = Column(Integer, default=0, comment="성공 건수")
     failed_count = Column(Integer, default=0, comment="실패 건수")
     
-    # 에러 정보
-    error_message = Column(String(500), nullable=True, comment="에러 메시지")
+    # 에러 정보 (종목별 상세는 job_run_failures)
+    error_message = Column(String(500), nullable=True, comment="에러 메시지 (요약)")
+    job_run_id = Column(Integer, nullable=True, index=True, comment="작업 실행 기록 ID (job_runs)")
     
     # 수집 기간
     start_date = Column(Date, nullable=True, comment="수집 시작일")
@@ -202,3 +205,36 @@ class DataCollectionLog(Base):
     completed_at = Column(DateTime, nullable=True, comment="수집 완료 시각")
     
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MarketHoliday(Base):
+    """휴장일 (주말 외 - 공휴일, 임시 휴장, 연말 휴장 등)"""
+    __tablename__ = "market_holidays"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    market = Column(String(20), nullable=False, default="KRX", comment="시장 (KRX)")
+    date = Column(Date, nullable=False, comment="휴장일")
+    name = Column(String(100), nullable=True, comment="사유 (설날, 선거일 등)")
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('market', 'date', name='uq_market_holidays_market_date'),
+    )
+
+
+class PriceCoverage(Base):
+    """
+    종목별 일봉 보유 현황 (daily_prices 요약, 일봉 저장/삭제 시 갱신)
+    - gap_dates: first_date ~ last_date 사이 거래일 중 일봉이 없는 날 (거래정지 등)
+    """
+    __tablename__ = "price_coverage"
+    
+    code = Column(String(6), ForeignKey('stock_info.code'), primary_key=True, comment="종목코드")
+    first_date = Column(Date, nullable=False, comment="첫 저장 거래일")
+    last_date = Column(Date, nullable=False, index=True, comment="마지막 저장 거래일")
+    row_count = Column(Integer, nullable=False, default=0, comment="저장된 일봉 수")
+    gap_count = Column(Integer, nullable=False, default=0, index=True, comment="누락 거래일 수")
+    gap_dates = Column(JSON, nullable=False, default=list, comment="누락 거래일 목록 (YYYY-MM-DD, 오름차순)")
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
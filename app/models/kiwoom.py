@@ -25,6 +25,7 @@ class KiwoomCredential(Base):
     # 암호화된 인증 정보
     app_key = Column(String, nullable=False, comment="암호화된 App Key")
     secret_key = Column(String, nullable=False, comment="암호화된 Secret Key")
+    key_version = Column(Integer, nullable=True, index=True, comment="암호화 키 버전 (null = 버전 1)")
     
     # 상태
     is_main = Column(Boolean, default=False, comment="메인 계좌 여부")
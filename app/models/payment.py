@@ -0,0 +1,133 @@
+# central-backend/app/models/payment.py
+"""
+결제 처리 관련 모델
+- 자동 결제(구독 갱신) 작업 큐
+- 결제 웹훅 수신함
+- 결제 내역(매출 팩트) 및 일별 통계 집계
+"""
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Text, Enum as SQLEnum, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+
+from app.core.database import Base
+
+
+class RenewalJobStatus(str, enum.Enum):
+    """갱신 작업 상태"""
+    PENDING = "PENDING"         # 대기 (next_run_at 이후 실행)
+    RUNNING = "RUNNING"         # 실행 중 (locked_by 워커가 점유)
+    SUCCEEDED = "SUCCEEDED"     # 결제 및 구독 연장 완료
+    SKIPPED = "SKIPPED"         # 실행 전 구독 상태 변경 (취소/이미 갱신됨)
+    DEAD = "DEAD"               # 최대 재시도 초과 (수동 확인 필요)
+
+
+class RenewalJob(Base):
+    """구독 갱신 결제 작업 (구독 × 결제 주기당 1건)"""
+    __tablename__ = "renewal_jobs"
+    __table_args__ = (
+        UniqueConstraint("subscription_id", "cycle", name="uq_renewal_jobs_subscription_cycle"),
+        Index("idx_renewal_jobs_claim", "status", "next_run_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    subscription_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=False, index=True)
+    cycle = Column(String(16), nullable=False, comment="결제 주기 식별자 (갱신 전 만료일 YYYYMMDD)")
+    
+    # 상태
+    status = Column(SQLEnum(RenewalJobStatus), default=RenewalJobStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False, comment="실패한 시도 수")
+    declines = Column(Integer, default=0, nullable=False, comment="카드사/토스가 거절한 시도 수 (주문 ID 접미사)")
+    next_run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    # 결제 요청 식별자 (마지막 시도 기준)
+    order_id = Column(String, nullable=True)
+    idempotency_key = Column(String, nullable=True)
+    
+    # 점유 정보 (RUNNING 상태에서만 의미)
+    locked_by = Column(String, nullable=True, comment="점유한 워커 ID")
+    locked_at = Column(DateTime, nullable=True)
+    
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    subscription = relationship("Subscription")
+
+
+class WebhookEventStatus(str, enum.Enum):
+    """웹훅 이벤트 처리 상태"""
+    PENDING = "PENDING"         # 수신됨 (처리 대기)
+    PROCESSED = "PROCESSED"     # 처리 완료
+    IGNORED = "IGNORED"         # 처리 대상 아님 (알 수 없는 이벤트/주문)
+    FAILED = "FAILED"           # 최대 재시도 초과
+
+
+class WebhookEvent(Base):
+    """결제 웹훅 수신함 (원본 저장 후 비동기 처리)"""
+    __tablename__ = "webhook_events"
+    __table_args__ = (
+        Index("idx_webhook_events_pending", "status", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String(20), nullable=False, default="toss")
+    event_id = Column(String(128), unique=True, nullable=False, comment="전송 ID (없으면 본문 해시) - 중복 수신 제거")
+    event_type = Column(String, nullable=True)
+    
+    # 원본 (서명 검증한 본문 그대로)
+    payload = Column(Text, nullable=False)
+    
+    # 처리 상태
+    status = Column(SQLEnum(WebhookEventStatus), default=WebhookEventStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True, comment="재시도 가능 시각 (실패 후 백오프)")
+    last_error = Column(Text, nullable=True)
+    
+    # 타임스탬프
+    received_at = Column(DateTime, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+
+class PaymentRecord(Base):
+    """결제 내역 (매출 팩트 테이블, 주문당 1건)"""
+    __tablename__ = "payment_records"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(String, unique=True, nullable=False, comment="토스 주문 ID")
+    payment_key = Column(String, nullable=True)
+    
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    subscription_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=True, index=True)
+    plan_id = Column(Integer, ForeignKey("subscription_plans.id"), nullable=True)
+    
+    kind = Column(String(20), nullable=False, comment="CHECKOUT(결제창), RENEWAL(자동결제)")
+    amount = Column(Float, nullable=False)
+    currency = Column(String, default="KRW")
+    status = Column(String(20), default="DONE", nullable=False, comment="DONE, CANCELED")
+    
+    # 타임스탬프
+    paid_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    canceled_at = Column(DateTime, nullable=True)
+
+
+class DailyStatsRollup(Base):
+    """일별 × 플랜별 통계 집계 (이벤트 시 증분 반영, 스케줄러가 주기적으로 재계산)"""
+    __tablename__ = "daily_stats_rollups"
+    
+    day = Column(Date, primary_key=True)
+    plan_id = Column(Integer, primary_key=True, comment="플랜 ID (0 = 알 수 없음)")
+    
+    # 매출
+    revenue = Column(Float, default=0, nullable=False, comment="결제 금액 합계")
+    refunds = Column(Float, default=0, nullable=False, comment="취소(환불) 금액 합계")
+    payment_count = Column(Integer, default=0, nullable=False)
+    
+    # 구독 흐름
+    new_subscriptions = Column(Integer, default=0, nullable=False)
+    cancelled_subscriptions = Column(Integer, default=0, nullable=False)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,86 @@
+# central-backend/app/models/scheduler.py
+"""
+스케줄러 조정 모델
+- 리더 임대: 여러 인스턴스(API 워커 / 수집 워커) 중 하나만 예약 작업 실행
+- 작업 실행 기록: 수집 작업 1회 실행 = 1행 (상태 / 진행 상황 조회)
+- 작업 실패 항목: 실행 중 실패한 종목별 오류 (부분 실패 원인 / 재수집 대상)
+"""
+from sqlalchemy import Column, Integer, Float, String, DateTime, JSON, Text, ForeignKey, Enum as SQLEnum, Index
+from datetime import datetime
+import enum
+
+from app.core.database import Base
+
+
+class SchedulerLease(Base):
+    """리더 임대 (이름당 1행, 만료 전까지 holder만 갱신 가능)"""
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(64), primary_key=True, comment="임대 이름 (예: schedulers)")
+    holder = Column(String(128), nullable=False, comment="보유 인스턴스 (호스트:PID)")
+    acquired_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="현재 holder가 획득한 시각")
+    renewed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, comment="이 시각 이후 다른 인스턴스가 인계 가능")
+
+    def __repr__(self):
+        return f"<SchedulerLease(name={self.name}, holder={self.holder}, expires_at={self.expires_at})>"
+
+
+class JobRunStatus(str, enum.Enum):
+    """작업 실행 상태"""
+    RUNNING = "RUNNING"         # 실행 중 (잠금 보유)
+    SUCCEEDED = "SUCCEEDED"     # 전체 성공
+    PARTIAL = "PARTIAL"         # 일부 실패
+    FAILED = "FAILED"           # 전체 실패 / 예외 / 워커 중단
+
+
+class JobRun(Base):
+    """작업 실행 기록 (같은 작업은 잠금으로 동시에 1건만 RUNNING)"""
+    __tablename__ = "job_runs"
+    __table_args__ = (
+        Index("idx_job_runs_job_status", "job_name", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(64), nullable=False, comment="작업 이름 (daily_prices / financial_statements)")
+    status = Column(SQLEnum(JobRunStatus), default=JobRunStatus.RUNNING, nullable=False)
+    trigger = Column(String(20), nullable=False, default="scheduled", comment="scheduled / manual / retry")
+    holder = Column(String(128), nullable=True, comment="실행 인스턴스 (호스트:PID)")
+    params = Column(JSON, nullable=True, comment="실행 파라미터 (수집 기간 등)")
+    retry_of_run_id = Column(Integer, nullable=True, index=True, comment="실패 종목 재수집 대상 실행 ID")
+    retry_attempt = Column(Integer, default=0, nullable=False, comment="재수집 차수 (원 실행 0)")
+
+    # 진행 상황 (JOB_PROGRESS_INTERVAL_SECONDS 간격으로 갱신)
+    total_items = Column(Integer, nullable=True, comment="처리 대상 수 (종목)")
+    processed_items = Column(Integer, default=0, nullable=False)
+    failed_items = Column(Integer, default=0, nullable=False, comment="실패가 있는 종목 수 (job_run_failures)")
+    current_item = Column(String(64), nullable=True, comment="마지막으로 처리한 종목")
+    success_count = Column(Integer, default=0, nullable=False, comment="저장 성공 건수")
+    failed_count = Column(Integer, default=0, nullable=False, comment="실패 건수")
+    items_per_second = Column(Float, nullable=True, comment="처리 속도 (종목/초, 시작 이후 평균)")
+    eta_seconds = Column(Integer, nullable=True, comment="예상 남은 시간")
+    message = Column(Text, nullable=True, comment="결과 요약 / 오류")
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=True, comment="마지막 진행 상황 기록 시각")
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<JobRun(id={self.id}, job={self.job_name}, status={self.status})>"
+
+
+class JobRunFailure(Base):
+    """작업 실행 중 실패한 항목 (종목당 1행)"""
+    __tablename__ = "job_run_failures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("job_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    item = Column(String(64), nullable=False, comment="실패 항목 (종목코드)")
+    error_class = Column(String(100), nullable=True, comment="예외 클래스명")
+    error_message = Column(Text, nullable=True)
+    failed_count = Column(Integer, default=1, nullable=False, comment="이 항목에서 실패한 건수 (행)")
+    params = Column(JSON, nullable=True, comment="재수집 파라미터 (수집 기간 / 연도·분기)")
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<JobRunFailure(run_id={self.run_id}, item={self.item}, error={self.error_class})>"
@@ -4,11 +4,17 @@
 - Gemini AI 모델 우선순위
 - Gemini API 키
 - 기타 시스템 전역 설정
+- 저장할 때마다 전역 버전 증가 (config_service.set / 관리 스크립트 등 모든 ORM 저장 경로)
 """
-from sqlalchemy import Column, Integer, String, JSON, DateTime
+import zlib
+
+from sqlalchemy import Column, Integer, String, JSON, DateTime, event, select, text
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# 버전 계산 직렬화용 advisory lock 키 (PostgreSQL)
+_VERSION_LOCK_KEY = zlib.crc32(b"system_configs.version")
+
 
 class SystemConfig(Base):
     """시스템 설정 테이블"""
@@ -19,8 +25,20 @@ class SystemConfig(Base):
     config_value = Column(JSON, nullable=False)
     description = Column(String, nullable=True)
     updated_by = Column(String, nullable=True)  # 업데이트한 관리자 이메일
+    version = Column(Integer, nullable=False, default=0, index=True)  # 저장 시 전역 max + 1 (캐시/ETag, _bump_version)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     def __repr__(self):
         return f"<SystemConfig(key={self.config_key})>"
+
+
+@event.listens_for(SystemConfig, "before_insert")
+@event.listens_for(SystemConfig, "before_update")
+def _bump_version(mapper, connection, target):
+    """저장 직전 version = 전역 max + 1 (같은 flush의 행은 같은 버전)"""
+    if connection.dialect.name == "postgresql":
+        # 동시 저장이 같은 max + 1을 계산하지 않도록 커밋까지 직렬화
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _VERSION_LOCK_KEY})
+    current = connection.execute(select(func.coalesce(func.max(SystemConfig.version), 0))).scalar()
+    target.version = current + 1
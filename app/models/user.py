@@ -1,5 +1,5 @@
 # central-backend/app/models/user.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -24,7 +24,7 @@ class User(Base):
     referred_by_id = Column(Integer, ForeignKey("users.id"), nullable=True, comment="나를 추천한 사용자 ID")
     
     # 타임스탬프
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login_at = Column(DateTime, nullable=True)
     last_active_at = Column(DateTime, nullable=True, index=True, comment="Last activity timestamp")
@@ -47,6 +47,9 @@ class SubscriptionStatus(str, enum.Enum):
 class Subscription(Base):
     """사용자 구독 정보"""
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        Index("idx_subscriptions_status_plan", "status", "plan_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
@@ -79,3 +82,27 @@ class Subscription(Base):
     # Relationships
     user = relationship("User", back_populates="subscription")
     plan = relationship("SubscriptionPlan", back_populates="subscriptions")
+
+
+class SubscriptionEventType(str, enum.Enum):
+    """구독 이력 이벤트"""
+    STARTED = "STARTED"             # 구독 시작 (신규/재구독)
+    PLAN_CHANGED = "PLAN_CHANGED"   # 플랜 변경
+    CANCELLED = "CANCELLED"         # 사용자 취소 / 결제 취소(환불)
+    EXPIRED = "EXPIRED"             # 갱신 실패 등으로 만료
+
+
+class SubscriptionEvent(Base):
+    """구독 이력 (통계 집계 / 이탈률 계산용, 추가만 함)"""
+    __tablename__ = "subscription_events"
+    __table_args__ = (
+        Index("idx_subscription_events_type_time", "event_type", "occurred_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    subscription_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    plan_id = Column(Integer, ForeignKey("subscription_plans.id"), nullable=True, comment="이벤트 시점 플랜")
+    
+    event_type = Column(SQLEnum(SubscriptionEventType), nullable=False)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False)
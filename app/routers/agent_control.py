@@ -5,12 +5,34 @@ Agent 제어 API
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List, Optional
+
 from app.routers.agent_ws import send_command_to_agent, is_agent_connected
+from app.core.database import get_db
 from app.core.security import get_current_user
+from app.middleware.admin import require_admin
+from app.models.agent import AgentBroadcast, AgentApiKey
+from app.models.user import User
+from app.services.agent_auth import create_api_key, revoke_api_key
+from app.services.agent_broadcast import create_broadcast, dispatch_broadcast
 
 router = APIRouter(prefix="/api/agent", tags=["Agent Control"])
 
 
+class BroadcastRequest(BaseModel):
+    command: str
+    data: Optional[dict] = None
+    user_ids: Optional[List[int]] = None  # 특정 사용자만 (null = 전체)
+    plan_ids: Optional[List[int]] = None  # 특정 플랜 활성 구독자만
+
+
+class ApiKeyCreateRequest(BaseModel):
+    name: Optional[str] = None
+
+
 @router.post("/start")
 async def start_agent_workers(current_user = Depends(get_current_user)):
     """로컬 Agent에 워커 시작 명령"""
@@ -65,3 +87,126 @@ async def get_agent_status(current_user = Depends(get_current_user)):
         "user_id": user_id,
         "message": "Agent connected" if is_connected else "Agent not connected"
     }
+
+
+@router.post("/broadcast")
+async def broadcast_command(
+    request: BroadcastRequest,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    연결된 Agent 전체(또는 필터된 대상)에 명령 브로드캐스트
+    - 관리자 전용
+    - 모든 워커로 전파되며, 전체 집계는 GET /broadcast/{id}로 확인
+    """
+    broadcast = await run_in_threadpool(
+        create_broadcast,
+        db,
+        command=request.command,
+        data=request.data,
+        user_ids=request.user_ids,
+        plan_ids=request.plan_ids,
+        created_by=admin.email,
+    )
+    # 전달 결과 커밋 후에는 속성이 만료되므로 응답 값을 미리 읽어 둠 (루프에서 지연 로딩 방지)
+    result = {
+        "broadcast_id": broadcast.id,
+        "command": broadcast.command,
+        "target_count": len(broadcast.target_user_ids) if broadcast.target_user_ids is not None else None,
+    }
+    
+    delivered, failed = await dispatch_broadcast(db, broadcast)
+    
+    return {**result, "delivered": delivered, "failed": failed}
+
+
+@router.get("/broadcast/{broadcast_id}")
+async def get_broadcast_status(
+    broadcast_id: int,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """브로드캐스트 전달 현황 (전체 워커 합산)"""
+    broadcast = db.query(AgentBroadcast).filter(AgentBroadcast.id == broadcast_id).first()
+    
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    
+    return {
+        "broadcast_id": broadcast.id,
+        "command": broadcast.command,
+        "target_count": len(broadcast.target_user_ids) if broadcast.target_user_ids is not None else None,
+        "delivered": broadcast.delivered_count,
+        "failed": broadcast.failed_count,
+        "created_by": broadcast.created_by,
+        "created_at": broadcast.created_at.isoformat() if broadcast.created_at else None,
+    }
+
+
+# ============================================
+# Agent API 키 관리
+# ============================================
+
+@router.post("/keys", status_code=201)
+async def create_agent_api_key(
+    request: ApiKeyCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Agent API 키 발급
+    - 평문 키는 이 응답에서만 제공 (서버에는 해시만 저장)
+    """
+    api_key, plaintext = create_api_key(db, current_user.id, request.name)
+    
+    return {
+        "id": api_key.id,
+        "name": api_key.name,
+        "api_key": plaintext,
+        "key_prefix": api_key.key_prefix,
+        "created_at": api_key.created_at.isoformat() if api_key.created_at else None,
+    }
+
+
+@router.get("/keys")
+async def list_agent_api_keys(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """내 Agent API 키 목록 (평문 미포함)"""
+    keys = db.query(AgentApiKey).filter(
+        AgentApiKey.user_id == current_user.id
+    ).order_by(AgentApiKey.created_at.desc()).all()
+    
+    return [
+        {
+            "id": key.id,
+            "name": key.name,
+            "key_prefix": key.key_prefix,
+            "is_active": key.is_active,
+            "created_at": key.created_at.isoformat() if key.created_at else None,
+            "last_used_at": key.last_used_at.isoformat() if key.last_used_at else None,
+            "revoked_at": key.revoked_at.isoformat() if key.revoked_at else None,
+        }
+        for key in keys
+    ]
+
+
+@router.delete("/keys/{key_id}", status_code=204)
+async def revoke_agent_api_key(
+    key_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Agent API 키 폐기"""
+    api_key = db.query(AgentApiKey).filter(
+        AgentApiKey.id == key_id,
+        AgentApiKey.user_id == current_user.id
+    ).first()
+    
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+    
+    revoke_api_key(db, api_key)
+    return None
@@ -2,51 +2,106 @@
 Agent WebSocket 엔드포인트
 
 로컬 Agent와의 WebSocket 연결을 관리합니다.
+- 프레임 형식은 연결 시 Sec-WebSocket-Protocol로 협상 (기본 JSON)
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Header
-from typing import Dict, Optional
-import json
+from typing import Dict, Iterable, Optional, Tuple, Union
+import asyncio
 import logging
 
+from app.core.config import settings
+from app.services.agent_auth import admission_limiter, verify_api_key
+from app.services.agent_protocol import JSON_CODEC, negotiate_codec
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# 연결된 Agent들 관리 {user_id: websocket}
-connected_agents: Dict[str, WebSocket] = {}
+
+class AgentConnection:
+    """연결된 Agent (WebSocket + 협상된 코덱)"""
+    
+    def __init__(self, websocket: WebSocket, codec=JSON_CODEC):
+        self.websocket = websocket
+        self.codec = codec
+    
+    def encode(self, message: dict) -> Union[str, bytes]:
+        return self.codec.encode(message)
+    
+    async def send_frame(self, frame: Union[str, bytes]):
+        """이미 직렬화된 프레임 전송"""
+        if self.codec.binary:
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+    
+    async def send(self, message: dict):
+        await self.send_frame(self.encode(message))
+    
+    async def receive(self) -> dict:
+        """텍스트/바이너리 프레임 수신 후 디코딩"""
+        frame = await self.websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(frame.get("code", 1000))
+        
+        payload = frame.get("bytes")
+        if payload is None:
+            payload = frame.get("text")
+        return self.codec.decode(payload)
+
+
+# 연결된 Agent들 관리 {user_id: AgentConnection}
+connected_agents: Dict[str, AgentConnection] = {}
 
 
 @router.websocket("/ws/agent")
 async def agent_websocket(websocket: WebSocket):
     """로컬 Agent WebSocket 연결"""
-    await websocket.accept()
+    # 프레임 형식 협상 (제시하지 않으면 JSON)
+    codec = negotiate_codec(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=codec.name if codec else None)
+    connection = AgentConnection(websocket, codec or JSON_CODEC)
     
     user_id = None
     
     try:
+        # 재연결 폭주 완화 (초당 허용 수 제한)
+        if not await admission_limiter.acquire(settings.AGENT_ADMISSION_TIMEOUT_SECONDS):
+            await websocket.close(code=1013, reason="Try again later")
+            return
+        
         # 인증 확인
         headers = websocket.headers
         auth_header = headers.get("authorization", "")
         api_key = auth_header.replace("Bearer ", "") if auth_header.startswith("Bearer ") else ""
         user_id = headers.get("x-user-id", "")
         
-        if not api_key or not user_id:
+        if settings.AGENT_AUTH_REQUIRED:
+            # API 키로 사용자 식별 (x-user-id는 선택, 제공 시 일치해야 함)
+            key_user_id = await verify_api_key(api_key)
+            if key_user_id is None:
+                await websocket.close(code=4001, reason="Unauthorized: Invalid API key")
+                return
+            
+            if user_id and user_id != "unbound" and user_id != str(key_user_id):
+                await websocket.close(code=4003, reason="Forbidden: API key does not match user")
+                return
+            
+            user_id = str(key_user_id)
+        elif not api_key or not user_id:
+            # 개발 모드: 자격 증명 존재 여부만 확인
             await websocket.close(code=4001, reason="Unauthorized: Missing credentials")
             return
         
-        # TODO: API 키 검증 (DB에서 확인)
-        # For now, accept any connection for development
-        
         # Agent 등록
-        connected_agents[user_id] = websocket
-        logger.info(f"✅ Agent connected: user_id={user_id}")
+        connected_agents[user_id] = connection
+        logger.info(f"✅ Agent connected: user_id={user_id}, protocol={connection.codec.name}")
         
         # 연결 유지 및 메시지 수신
         while True:
             # Agent로부터 메시지 수신 (상태 업데이트 등)
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            message = await connection.receive()
             
             logger.info(f"📨 Received from agent {user_id}: {message}")
             
@@ -58,23 +113,23 @@ async def agent_websocket(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error for user {user_id}: {e}")
     finally:
-        # Agent 연결 해제
-        if user_id and user_id in connected_agents:
+        # Agent 연결 해제 (재연결로 교체된 경우 새 연결은 유지)
+        if user_id and connected_agents.get(user_id) is connection:
             connected_agents.pop(user_id, None)
             logger.info(f"Agent removed from registry: user_id={user_id}")
 
 
 async def send_command_to_agent(user_id: str, command: str, data: dict = None):
     """특정 Agent에 명령 전송"""
-    websocket = connected_agents.get(user_id)
+    connection = connected_agents.get(user_id)
     
     # [NEW] Fallback to unbound agent (First-Connect scenario)
-    if not websocket:
-        websocket = connected_agents.get("unbound")
-        if websocket:
+    if not connection:
+        connection = connected_agents.get("unbound")
+        if connection:
             logger.info(f"Target agent {user_id} not found. Using fallback 'unbound' agent.")
     
-    if not websocket:
+    if not connection:
         raise HTTPException(status_code=404, detail=f"Agent not connected for user {user_id}")
     
     message = {
@@ -83,13 +138,64 @@ async def send_command_to_agent(user_id: str, command: str, data: dict = None):
     }
     
     try:
-        await websocket.send_text(json.dumps(message))
+        await connection.send(message)
         logger.info(f"📤 Sent command to agent {user_id}: {command}")
     except Exception as e:
         logger.error(f"Failed to send command to agent {user_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to send command: {str(e)}")
 
 
+async def broadcast_to_agents(
+    command: str,
+    data: dict = None,
+    user_ids: Optional[Iterable[str]] = None,
+    concurrency: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    여러 Agent에 동일한 명령 동시 전송 (fan-out)
+    
+    Args:
+        command: 명령
+        data: 명령 데이터
+        user_ids: 대상 사용자 ID (None이면 이 워커에 연결된 전체 Agent)
+        concurrency: 동시 전송 수 제한
+    
+    Returns:
+        (delivered_count, failed_count)
+    """
+    message = {"command": command, "data": data or {}}
+    # 메시지는 코덱별로 한 번만 직렬화
+    frames: Dict[str, Union[str, bytes]] = {}
+    
+    if user_ids is None:
+        targets = list(connected_agents.items())
+    else:
+        targets = [(uid, connected_agents[uid]) for uid in user_ids if uid in connected_agents]
+    
+    if not targets:
+        return 0, 0
+    
+    semaphore = asyncio.Semaphore(concurrency or settings.AGENT_BROADCAST_CONCURRENCY)
+    
+    async def _send(uid: str, connection: AgentConnection) -> bool:
+        async with semaphore:
+            try:
+                frame = frames.get(connection.codec.name)
+                if frame is None:
+                    frame = frames[connection.codec.name] = connection.encode(message)
+                await asyncio.wait_for(connection.send_frame(frame), timeout=settings.AGENT_SEND_TIMEOUT_SECONDS)
+                return True
+            except Exception as e:
+                logger.warning(f"Broadcast to agent {uid} failed: {e}")
+                return False
+    
+    results = await asyncio.gather(*(_send(uid, conn) for uid, conn in targets))
+    delivered = sum(results)
+    
+    logger.info(f"📢 Broadcast '{command}': {delivered}/{len(results)} agents delivered")
+    return delivered, len(results) - delivered
+
+
 def is_agent_connected(user_id: str) -> bool:
     """Agent 연결 여부 확인"""
     return user_id in connected_agents
@@ -7,10 +7,10 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 import httpx
 from datetime import datetime, timedelta
-import os
 import logging
 
 from ..core.database import get_db
+from ..core.http_client import toss_client
 from ..models.user import User, Subscription
 from ..core.security import get_current_user
 
@@ -18,9 +18,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/billing", tags=["Billing"])
 
-TOSS_API_URL = "https://api.tosspayments.com/v1"
-TOSS_SECRET_KEY = os.getenv("TOSS_SECRET_KEY")
-
 
 class BillingKeyRequest(BaseModel):
     auth_key: str
@@ -39,26 +36,28 @@ async def register_billing_key(
     - authKey를 billingKey로 교환
     """
     try:
-        # 1. Issue billing key from Toss
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{TOSS_API_URL}/billing/authorizations/issue",
+        # 1. Issue billing key from Toss (authKey는 1회용이므로 미전송 오류만 재시도)
+        try:
+            response = await toss_client.post(
+                "/billing/authorizations/issue",
                 json={
                     "authKey": request.auth_key,
                     "customerKey": request.customer_key
                 },
-                auth=(TOSS_SECRET_KEY, ""),
-                headers={"Content-Type": "application/json"}
+                operation="billing_key_issue"
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Billing key issue request failed: {e}")
+            raise HTTPException(status_code=503, detail="Payment service temporarily unavailable")
+        
+        if response.status_code != 200:
+            logger.error(f"Billing key issue failed: {response.text}")
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Billing key issue failed: {response.text}"
             )
-            
-            if response.status_code != 200:
-                logger.error(f"Billing key issue failed: {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Billing key issue failed: {response.text}"
-                )
-            
-            billing_data = response.json()
+        
+        billing_data = response.json()
         
         # 2. Save billing key to DB
         subscription = db.query(Subscription).filter(
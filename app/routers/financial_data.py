@@ -3,15 +3,34 @@
 재무 데이터 API 라우터
 백테스팅을 위한 데이터 수집 및 조회 API
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, List
 from datetime import datetime, date
+from functools import partial
+import asyncio
+import json
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.middleware.admin import require_admin
 from app.services.data_collector import DataCollector
 from app.services.stock_service import StockService
 from app.services.data_scheduler import get_scheduler
+from app.services.job_runs import (
+    JOB_DAILY_PRICES,
+    JOB_FINANCIAL_STATEMENTS,
+    JobAlreadyRunningError,
+    begin_run,
+    execute_run
+)
+from app.models.financial_data import MarketHoliday, PriceCoverage
+from app.models.scheduler import JobRun, JobRunFailure, JobRunStatus
+from app.models.user import User
+from app.services.price_coverage import rebuild_coverage, record_calendar_change
+from app.services.trading_calendar import TradingCalendar
 from app.schemas.financial_data import (
     CollectStocksRequest,
     CollectDailyPricesRequest,
@@ -23,7 +42,15 @@ from app.schemas.financial_data import (
     DailyPriceResponse,
     FinancialStatementListResponse,
     FinancialStatementResponse,
-    DataCollectionLogResponse
+    DataCollectionLogResponse,
+    JobRunResponse,
+    JobRunFailureResponse,
+    JobTriggerResponse,
+    MarketHolidayRequest,
+    MarketHolidayResponse,
+    PriceCoverageResponse,
+    PriceCoverageDetailResponse,
+    PriceCoverageListResponse
 )
 
 import logging
@@ -37,37 +64,247 @@ router = APIRouter(prefix="/api/financial", tags=["Financial Data"])
 # 스케줄러 관리 API
 # ============================================
 
-@router.post("/scheduler/trigger/daily-prices")
-async def trigger_daily_prices_update(background_tasks: BackgroundTasks):
+def _trigger_job(
+    background_tasks: BackgroundTasks,
+    job_name: str,
+    func,
+    trigger: str = "manual",
+    **run_options
+) -> JobTriggerResponse:
+    """작업 잠금 획득 후 백그라운드 실행 (이미 실행 중이면 409 + 실행 중인 run_id)"""
+    try:
+        run = begin_run(job_name, trigger=trigger, **run_options)
+    except JobAlreadyRunningError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": f"{job_name} is already running", "run_id": e.run_id}
+        )
+    
+    background_tasks.add_task(execute_run, run, func)
+    return JobTriggerResponse(
+        success=True,
+        message=f"{job_name} triggered in background",
+        run_id=run.run_id
+    )
+
+
+@router.post("/scheduler/trigger/daily-prices", response_model=JobTriggerResponse, status_code=202)
+def trigger_daily_prices_update(background_tasks: BackgroundTasks):
     """
     일봉 데이터 수집 즉시 실행 (수동 트리거)
     
     - 백그라운드에서 실행되므로 즉시 응답 반환
-    - 진행상황은 collection-logs API로 확인
+    - 진행상황은 scheduler/runs/{run_id} API로 확인
+    - 예약/수동 실행이 진행 중이면 409 (detail.run_id)
     """
-    scheduler = get_scheduler()
-    background_tasks.add_task(scheduler.run_now_daily_prices)
-    
-    return {
-        "success": True,
-        "message": "Daily prices update triggered in background"
-    }
+    return _trigger_job(background_tasks, JOB_DAILY_PRICES, get_scheduler().update_daily_prices)
 
 
-@router.post("/scheduler/trigger/financial-statements")
-async def trigger_financial_statements_update(background_tasks: BackgroundTasks):
+@router.post("/scheduler/trigger/financial-statements", response_model=JobTriggerResponse, status_code=202)
+def trigger_financial_statements_update(background_tasks: BackgroundTasks):
     """
     재무제표 수집 즉시 실행 (수동 트리거)
     
     - 백그라운드에서 실행되므로 즉시 응답 반환
-    - 진행상황은 collection-logs API로 확인
+    - 진행상황은 scheduler/runs/{run_id} API로 확인
+    - 예약/수동 실행이 진행 중이면 409 (detail.run_id)
+    """
+    return _trigger_job(background_tasks, JOB_FINANCIAL_STATEMENTS, get_scheduler().update_financial_statements)
+
+
+@router.get("/scheduler/runs", response_model=List[JobRunResponse])
+def get_job_runs(
+    job_name: Optional[str] = Query(None, description="작업 이름 (daily_prices / financial_statements)"),
+    limit: int = Query(20, le=200),
+    db: Session = Depends(get_db)
+):
+    """수집 작업 실행 기록 (최신순)"""
+    query = db.query(JobRun)
+    if job_name:
+        query = query.filter(JobRun.job_name == job_name)
+    return query.order_by(JobRun.id.desc()).limit(limit).all()
+
+
+@router.get("/scheduler/runs/{run_id}", response_model=JobRunResponse)
+def get_job_run(run_id: int, db: Session = Depends(get_db)):
+    """수집 작업 실행 상태 / 진행 상황"""
+    run = db.query(JobRun).filter(JobRun.id == run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Job run not found")
+    return run
+
+
+@router.post("/scheduler/runs/{run_id}/retry", response_model=JobTriggerResponse, status_code=202)
+def retry_job_run(run_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    실패 종목만 재수집 (수동)
+    
+    - run_id 실행의 job_run_failures에 기록된 종목을 같은 수집 기간 / 연도·분기로 다시 수집
+    - 새 실행의 run_id 반환 (진행상황은 scheduler/runs/{run_id})
+    - 같은 작업이 실행 중이면 409
     """
-    scheduler = get_scheduler()
-    background_tasks.add_task(scheduler.run_now_financial_statements)
+    source = db.query(JobRun).filter(JobRun.id == run_id).first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Job run not found")
+    if source.status == JobRunStatus.RUNNING:
+        raise HTTPException(status_code=409, detail={"message": "Job run is still running", "run_id": run_id})
+    if not source.failed_items:
+        raise HTTPException(status_code=400, detail="Job run has no failed items to retry")
+    
+    return _trigger_job(
+        background_tasks,
+        source.job_name,
+        partial(get_scheduler().retry_failed_items, source_run_id=run_id),
+        trigger="retry",
+        params={"retry_of": run_id},
+        retry_of_run_id=run_id,
+        retry_attempt=(source.retry_attempt or 0) + 1
+    )
+
+
+@router.get("/scheduler/runs/{run_id}/failures", response_model=List[JobRunFailureResponse])
+def get_job_run_failures(
+    run_id: int,
+    error_class: Optional[str] = Query(None, description="예외 클래스명 필터"),
+    limit: int = Query(500, le=5000),
+    offset: int = Query(0),
+    db: Session = Depends(get_db)
+):
+    """실행 중 실패한 종목과 오류 (부분 실패 원인 확인)"""
+    query = db.query(JobRunFailure).filter(JobRunFailure.run_id == run_id)
+    if error_class:
+        query = query.filter(JobRunFailure.error_class == error_class)
+    return query.order_by(JobRunFailure.id).offset(offset).limit(limit).all()
+
+
+def _load_job_run(run_id: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        run = db.query(JobRun).filter(JobRun.id == run_id).first()
+        return JobRunResponse.model_validate(run).model_dump(mode="json") if run else None
+    finally:
+        db.close()
+
+
+@router.get("/scheduler/runs/{run_id}/events")
+async def stream_job_run(run_id: int, request: Request):
+    """
+    실행 진행 상황 스트림 (Server-Sent Events)
+    
+    - 기록이 바뀔 때마다 `event: progress` (JobRunResponse JSON)
+    - 종료되면 `event: done` 후 스트림 종료
+    - 다른 프로세스(수집 워커)에서 실행 중이어도 DB 기록을 따라가므로 동일하게 동작
+    """
+    payload = await run_in_threadpool(_load_job_run, run_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Job run not found")
+    
+    interval = max(settings.JOB_PROGRESS_INTERVAL_SECONDS, 1.0)
+    
+    async def events():
+        nonlocal payload
+        last = None
+        while True:
+            if payload != last:
+                yield f"event: progress\ndata: {json.dumps(payload)}\n\n"
+                last = payload
+            else:
+                yield ": keep-alive\n\n"
+            
+            if payload["status"] != JobRunStatus.RUNNING.value:
+                yield f"event: done\ndata: {json.dumps(payload)}\n\n"
+                return
+            
+            await asyncio.sleep(interval)
+            if await request.is_disconnected():
+                return
+            payload = await run_in_threadpool(_load_job_run, run_id) or last
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============================================
+# 거래일 달력 API
+# ============================================
+
+@router.get("/market-holidays", response_model=List[MarketHolidayResponse])
+def get_market_holidays(
+    year: Optional[int] = Query(None, description="연도"),
+    market: str = Query("KRX"),
+    db: Session = Depends(get_db)
+):
+    """등록된 휴장일 (주말 / 12월 31일은 규칙으로 처리되어 목록에 없음)"""
+    query = db.query(MarketHoliday).filter(MarketHoliday.market == market)
+    if year:
+        query = query.filter(MarketHoliday.date >= date(year, 1, 1), MarketHoliday.date <= date(year, 12, 31))
+    return query.order_by(MarketHoliday.date).all()
+
+
+@router.put("/market-holidays", response_model=MarketHolidayResponse)
+def upsert_market_holiday(
+    request: MarketHolidayRequest,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """휴장일 등록 / 사유 수정 (임시 휴장일 포함, 관리자 전용)"""
+    holiday = db.query(MarketHoliday).filter(
+        MarketHoliday.market == request.market,
+        MarketHoliday.date == request.date
+    ).first()
+    if holiday:
+        holiday.name = request.name
+    else:
+        holiday = MarketHoliday(market=request.market, date=request.date, name=request.name)
+        db.add(holiday)
+        if request.market == "KRX":
+            record_calendar_change(db, request.date, is_trading_day=False)
+    db.commit()
+    db.refresh(holiday)
+    return holiday
+
+
+@router.delete("/market-holidays/{holiday_date}")
+def delete_market_holiday(
+    holiday_date: date,
+    market: str = Query("KRX"),
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """휴장일 삭제 (관리자 전용)"""
+    deleted = db.query(MarketHoliday).filter(
+        MarketHoliday.market == market,
+        MarketHoliday.date == holiday_date
+    ).delete()
+    if deleted and market == "KRX":
+        is_trading_day = TradingCalendar.load(db).is_trading_day(holiday_date)
+        if is_trading_day:
+            record_calendar_change(db, holiday_date, is_trading_day=True)
+    db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Market holiday not found")
+    return {"success": True}
+
+
+@router.get("/trading-days")
+def get_trading_days(
+    start_date: date = Query(..., description="시작일"),
+    end_date: date = Query(..., description="종료일"),
+    db: Session = Depends(get_db)
+):
+    """기간 내 거래일 목록 (최대 3년)"""
+    if end_date < start_date or (end_date - start_date).days > 366 * 3:
+        raise HTTPException(status_code=400, detail="Invalid date range (max 3 years)")
     
+    calendar = TradingCalendar.load(db)
     return {
-        "success": True,
-        "message": "Financial statements update triggered in background"
+        "start_date": start_date,
+        "end_date": end_date,
+        "last_completed_trading_day": calendar.last_completed_trading_day(),
+        "trading_days": calendar.trading_days(start_date, end_date)
     }
 
 
@@ -351,6 +588,82 @@ async def get_daily_prices(
     )
 
 
+@router.get("/coverage", response_model=PriceCoverageListResponse)
+def get_price_coverage(
+    covers_from: Optional[date] = Query(None, description="이 날짜 이전부터 일봉이 있는 종목만"),
+    covers_to: Optional[date] = Query(None, description="이 날짜 이후까지 일봉이 있는 종목만"),
+    has_gaps: Optional[bool] = Query(None, description="누락 거래일 유무"),
+    stale_before: Optional[date] = Query(None, description="마지막 저장일이 이 날짜 이전인 종목만"),
+    limit: int = Query(1000, le=10000),
+    offset: int = Query(0),
+    db: Session = Depends(get_db)
+):
+    """
+    종목별 일봉 보유 현황 (daily_prices를 집계하지 않고 price_coverage 조회)
+    
+    - 백테스트 기간 전체를 보유한 종목: covers_from / covers_to
+    - 누락 거래일이 있는 종목: has_gaps=true (날짜 목록은 /coverage/{code})
+    """
+    query = db.query(PriceCoverage)
+    if covers_from:
+        query = query.filter(PriceCoverage.first_date <= covers_from)
+    if covers_to:
+        query = query.filter(PriceCoverage.last_date >= covers_to)
+    if has_gaps is not None:
+        query = query.filter(PriceCoverage.gap_count > 0 if has_gaps else PriceCoverage.gap_count == 0)
+    if stale_before:
+        query = query.filter(PriceCoverage.last_date < stale_before)
+    
+    total = query.count()
+    items = query.order_by(PriceCoverage.code).offset(offset).limit(limit).all()
+    return PriceCoverageListResponse(
+        total=total,
+        items=[PriceCoverageResponse.from_orm(item) for item in items]
+    )
+
+
+@router.get("/coverage/{code}", response_model=PriceCoverageDetailResponse)
+def get_price_coverage_detail(
+    code: str,
+    start_date: Optional[date] = Query(None, description="누락 거래일 조회 시작일"),
+    end_date: Optional[date] = Query(None, description="누락 거래일 조회 종료일"),
+    db: Session = Depends(get_db)
+):
+    """종목 일봉 보유 현황 + 누락 거래일 (기간 지정 시 해당 기간의 누락만)"""
+    coverage = db.query(PriceCoverage).filter(PriceCoverage.code == code).first()
+    if not coverage:
+        raise HTTPException(status_code=404, detail="No daily prices stored for this code")
+    
+    gap_dates = [date.fromisoformat(day) for day in coverage.gap_dates]
+    if start_date:
+        gap_dates = [day for day in gap_dates if day >= start_date]
+    if end_date:
+        gap_dates = [day for day in gap_dates if day <= end_date]
+    
+    response = PriceCoverageResponse.from_orm(coverage)
+    return PriceCoverageDetailResponse(**response.model_dump(), gap_dates=gap_dates)
+
+
+@router.post("/coverage/rebuild", status_code=202)
+def rebuild_price_coverage(background_tasks: BackgroundTasks, admin: User = Depends(require_admin)):
+    """일봉 보유 현황 전체 재계산 (daily_prices 전체 조회 - 직접 수정 / 복구 후 사용, 관리자 전용)"""
+    background_tasks.add_task(_rebuild_price_coverage)
+    return {"success": True, "message": "Price coverage rebuild started"}
+
+
+def _rebuild_price_coverage():
+    db = SessionLocal()
+    try:
+        count = rebuild_coverage(db, TradingCalendar.load(db))
+        db.commit()
+        logger.info(f"✅ Price coverage rebuilt for {count} stocks")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Price coverage rebuild failed: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
 @router.get("/financial-statements/{code}", response_model=FinancialStatementListResponse)
 async def get_financial_statements(
     code: str,
@@ -2,7 +2,8 @@
 Toss Payments API Router
 Handles payment preparation, confirmation, and webhooks
 """
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
@@ -12,18 +13,27 @@ import httpx
 import logging
 
 from app.core.database import get_db
-from app.models.user import Subscription, User
+from app.core.http_client import toss_client
+from app.models.user import Subscription, SubscriptionEventType, SubscriptionStatus, User
 from app.models.commission import SubscriptionPlan
 from app.api.auth import get_current_user
+from app.services.stats_rollup import record_payment, record_subscription_event
+from app.services.webhook_inbox import (
+    SIGNATURE_HEADER,
+    TRANSMISSION_ID_HEADER,
+    TRANSMISSION_TIME_HEADER,
+    process_webhook_events,
+    store_webhook_event,
+    verify_signature,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/payments", tags=["payments"])
 
 # Toss Payments Configuration
+# (시크릿 키 / API 주소는 settings에서 공용 클라이언트가 사용)
 TOSS_CLIENT_KEY = os.getenv("TOSS_CLIENT_KEY", "test_ck_D5GePWvyJnrK0W0k6q8gLzN97Eoq")
-TOSS_SECRET_KEY = os.getenv("TOSS_SECRET_KEY", "test_sk_zXLkKEypNArWmo50nX3lmeaxYG5R")
-TOSS_API_URL = "https://api.tosspayments.com/v1/payments"
 
 # Request/Response Models
 class PaymentPrepareRequest(BaseModel):
@@ -97,28 +107,31 @@ async def confirm_payment(
     try:
         user_id = current_user.id
         
-        # Verify payment with Toss Payments
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{TOSS_API_URL}/confirm",
+        # Verify payment with Toss Payments (같은 주문 재요청은 토스가 첫 결과 재사용)
+        try:
+            response = await toss_client.post(
+                "/payments/confirm",
                 json={
                     "paymentKey": request.payment_key,
                     "orderId": request.order_id,
                     "amount": request.amount
                 },
-                auth=(TOSS_SECRET_KEY, ""),
-                headers={"Content-Type": "application/json"}
+                operation="payment_confirm",
+                idempotency_key=f"confirm-{request.order_id}"
             )
-            
-            if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"Toss payment confirmation failed: {error_data}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=error_data.get("message", "Payment confirmation failed")
-                )
-            
-            payment_data = response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"Toss payment confirmation request failed: {e}")
+            raise HTTPException(status_code=503, detail="Payment service temporarily unavailable")
+        
+        if response.status_code != 200:
+            error_data = response.json()
+            logger.error(f"Toss payment confirmation failed: {error_data}")
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=error_data.get("message", "Payment confirmation failed")
+            )
+        
+        payment_data = response.json()
         
         # Extract plan_id and billing period from order_id
         # Format: AUT_{user_id}_{timestamp}
@@ -140,6 +153,9 @@ async def confirm_payment(
             Subscription.user_id == user_id
         ).first()
         
+        was_active = subscription is not None and subscription.status == SubscriptionStatus.ACTIVE
+        previous_plan_id = subscription.plan_id if subscription else None
+        
         if subscription:
             subscription.plan_id = plan_id
             subscription.status = "ACTIVE"
@@ -154,6 +170,20 @@ async def confirm_payment(
                 auto_renew=True
             )
             db.add(subscription)
+        db.flush()
+        
+        # 통계 (결제 내역 + 구독 이력)
+        record_payment(
+            db, subscription,
+            amount=request.amount,
+            order_id=request.order_id,
+            kind="CHECKOUT",
+            payment_key=request.payment_key
+        )
+        if not was_active:
+            record_subscription_event(db, subscription, SubscriptionEventType.STARTED)
+        elif previous_plan_id != plan_id:
+            record_subscription_event(db, subscription, SubscriptionEventType.PLAN_CHANGED)
         
         db.commit()
         
@@ -178,32 +208,28 @@ async def confirm_payment(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/webhook")
-async def payment_webhook(request: Request, db: Session = Depends(get_db)):
+async def payment_webhook(request: Request, background_tasks: BackgroundTasks):
     """
-    토스페이먼츠 웹훅 처리
+    토스페이먼츠 웹훅 수신
+    - 서명 검증 후 수신함에 저장만 하고 즉시 200 응답 (재전송 폭주 시에도 일정한 지연)
+    - 구독 반영은 process_webhook_events가 비동기로 처리
     """
-    try:
-        body = await request.json()
-        logger.info(f"Received webhook: {body}")
-        
-        # Verify webhook signature (in production)
-        # For now, just log it
-        
-        event_type = body.get("eventType")
-        payment_data = body.get("data")
-        
-        if event_type == "PAYMENT_STATUS_CHANGED":
-            # Handle payment status changes
-            status = payment_data.get("status")
-            order_id = payment_data.get("orderId")
-            
-            logger.info(f"Payment status changed: {order_id} -> {status}")
-            
-            # Update subscription status if needed
-            # This is a simplified version
-        
-        return {"success": True}
+    body = await request.body()
     
-    except Exception as e:
-        logger.error(f"Webhook processing error: {e}")
-        return {"success": False, "error": str(e)}
+    if not verify_signature(
+        body,
+        request.headers.get(SIGNATURE_HEADER),
+        request.headers.get(TRANSMISSION_TIME_HEADER)
+    ):
+        logger.warning("Webhook signature verification failed")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
+    created = await run_in_threadpool(
+        store_webhook_event, body, request.headers.get(TRANSMISSION_ID_HEADER)
+    )
+    
+    # 주기 처리 전에 바로 한 번 처리 시도 (응답 후 실행)
+    if created:
+        background_tasks.add_task(process_webhook_events)
+    
+    return {"success": True}
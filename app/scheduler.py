@@ -1,14 +1,26 @@
 # central-backend/app/scheduler.py
 """
 Scheduler for background tasks
-- Auto-renewal payment processing
+- Auto-renewal payment processing (daily enqueue + periodic retry drain)
+- Payment webhook inbox consumer
+- Commission state transitions (PENDING → HOLDBACK → APPROVED)
+- Agent API key usage flush (프로세스별 버퍼 → 모든 API 워커에서 실행)
+- 그 외 작업은 리더 임대를 가진 인스턴스에서만 실행 (leader_only)
 """
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import asyncio
 import logging
+from app.core.config import settings
 from app.core.database import get_db
-from app.services.auto_payment import check_and_process_renewals
+from app.services.renewal_queue import check_and_process_renewals, drain_renewal_jobs
+from app.services.commission_calculator import process_commission_state_transitions
+from app.services.agent_auth import flush_key_usage
+from app.services.webhook_inbox import process_webhook_events
+from app.services.stats_rollup import refresh_recent_rollups
+from app.services.credential_vault import rotate_credentials
+from app.services.leader_lease import leader_only
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +40,139 @@ def run_renewal_check():
         db.close()
 
 
-def start_scheduler():
-    """스케줄러 시작"""
+def run_renewal_drain():
+    """재시도 대기 중인 갱신 작업 처리 (스케줄러에서 호출)"""
+    db = next(get_db())
+    try:
+        asyncio.run(drain_renewal_jobs(db))
+    except Exception as e:
+        logger.error(f"❌ Renewal drain failed: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def run_commission_transitions():
+    """커미션 상태 전이 (스케줄러에서 호출)"""
+    db = next(get_db())
+    try:
+        counts = process_commission_state_transitions(db)
+        logger.info(
+            f"✅ Commission transitions: holdback={counts['holdback']}, approved={counts['approved']}"
+        )
+    except Exception as e:
+        logger.error(f"❌ Commission transitions failed: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def run_stats_rollup():
+    """최근 일별 통계 집계 재계산 (스케줄러에서 호출)"""
+    db = next(get_db())
+    try:
+        refresh_recent_rollups(db, settings.STATS_ROLLUP_REBUILD_DAYS)
+    except Exception as e:
+        logger.error(f"❌ Stats rollup failed: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def run_credential_rotation():
+    """이전 키로 암호화된 인증 정보 재암호화 (스케줄러에서 호출)"""
+    db = next(get_db())
+    try:
+        rotate_credentials(db)
+    except Exception as e:
+        logger.error(f"❌ Credential rotation failed: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def start_scheduler(run_background_jobs: bool = True):
+    """
+    스케줄러 시작
+    
+    Args:
+        run_background_jobs: False면 프로세스별 작업(API 키 사용 시각 반영)만 등록
+                             (RUN_SCHEDULERS_IN_API=False인 API 워커 - 나머지는 app.worker에서 실행)
+    """
+    # 1분마다 Agent API 키 사용 시각 반영 (이 프로세스의 버퍼)
+    scheduler.add_job(
+        flush_key_usage,
+        IntervalTrigger(minutes=1),
+        id='agent_key_usage_flush',
+        name='Flush agent API key usage timestamps',
+        replace_existing=True
+    )
+    
+    if not run_background_jobs:
+        scheduler.start()
+        logger.info("✅ Scheduler started (per-process jobs only)")
+        return
+    
     # 매일 오전 9시에 실행
     scheduler.add_job(
-        run_renewal_check,
+        leader_only(run_renewal_check),
         CronTrigger(hour=9, minute=0),
         id='renewal_check',
         name='Check and process subscription renewals',
         replace_existing=True
     )
     
+    # 재시도 대기 갱신 작업 처리 (기본 5분마다)
+    scheduler.add_job(
+        leader_only(run_renewal_drain),
+        IntervalTrigger(minutes=settings.RENEWAL_DRAIN_INTERVAL_MINUTES),
+        id='renewal_drain',
+        name='Drain pending renewal payment jobs',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # 결제 웹훅 수신함 처리 (수신 직후 처리가 실패/누락된 이벤트 포함)
+    scheduler.add_job(
+        leader_only(process_webhook_events),
+        IntervalTrigger(seconds=settings.WEBHOOK_CONSUMER_INTERVAL_SECONDS),
+        id='webhook_consumer',
+        name='Process payment webhook inbox',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # 커미션 상태 전이 (기본 1시간마다)
+    scheduler.add_job(
+        leader_only(run_commission_transitions),
+        IntervalTrigger(minutes=settings.COMMISSION_TRANSITION_INTERVAL_MINUTES),
+        id='commission_transitions',
+        name='Process commission state transitions',
+        replace_existing=True
+    )
+    
+    # 관리자 통계 집계 보정 (기본 1시간마다 최근 2일)
+    scheduler.add_job(
+        leader_only(run_stats_rollup),
+        IntervalTrigger(minutes=settings.STATS_ROLLUP_INTERVAL_MINUTES),
+        id='stats_rollup',
+        name='Refresh daily stats rollups',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # 암호화 키 교체 후 재암호화 (대상이 없으면 조회 1회로 종료)
+    scheduler.add_job(
+        leader_only(run_credential_rotation),
+        IntervalTrigger(minutes=settings.CREDENTIAL_ROTATION_INTERVAL_MINUTES),
+        id='credential_rotation',
+        name='Re-encrypt credentials with the current key',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+    
     scheduler.start()
     logger.info("✅ Scheduler started - Auto-renewal check at 9:00 AM daily")
 
@@ -23,6 +23,13 @@ class CollectDailyPricesRequest(BaseModel):
     end_date: date = Field(..., description="종료일")
 
 
+class MarketHolidayRequest(BaseModel):
+    """휴장일 등록 요청"""
+    date: date  # 휴장일
+    name: Optional[str] = Field(None, description="사유 (설날, 선거일 등)")
+    market: str = Field("KRX", description="시장")
+
+
 class CollectFinancialStatementsRequest(BaseModel):
     """재무제표 수집 요청"""
     code: Optional[str] = Field(None, description="종목코드 (없으면 전체)")
@@ -106,6 +113,7 @@ class DataCollectionLogResponse(BaseModel):
     success_count: int
     failed_count: int
     error_message: Optional[str]
+    job_run_id: Optional[int] = None
     start_date: Optional[date]
     end_date: Optional[date]
     started_at: datetime
@@ -115,6 +123,89 @@ class DataCollectionLogResponse(BaseModel):
         from_attributes = True
 
 
+class JobRunResponse(BaseModel):
+    """수집 작업 실행 기록 응답"""
+    id: int
+    job_name: str
+    status: str
+    trigger: str
+    params: Optional[dict]
+    retry_of_run_id: Optional[int]
+    retry_attempt: int
+    total_items: Optional[int]
+    processed_items: int
+    failed_items: int
+    current_item: Optional[str]
+    success_count: int
+    failed_count: int
+    items_per_second: Optional[float]
+    eta_seconds: Optional[int]
+    message: Optional[str]
+    created_at: datetime
+    heartbeat_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class JobRunFailureResponse(BaseModel):
+    """수집 작업 실패 항목 응답"""
+    id: int
+    run_id: int
+    item: str
+    error_class: Optional[str]
+    error_message: Optional[str]
+    failed_count: int
+    params: Optional[dict]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class JobTriggerResponse(BaseModel):
+    """수집 작업 수동 실행 응답"""
+    success: bool
+    message: str
+    run_id: int
+
+
+class MarketHolidayResponse(BaseModel):
+    """휴장일 응답"""
+    id: int
+    market: str
+    date: date
+    name: Optional[str]
+    
+    class Config:
+        from_attributes = True
+
+
+class PriceCoverageResponse(BaseModel):
+    """종목별 일봉 보유 현황 응답"""
+    code: str
+    first_date: date
+    last_date: date
+    row_count: int
+    gap_count: int
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class PriceCoverageDetailResponse(PriceCoverageResponse):
+    """종목별 일봉 보유 현황 (누락 거래일 포함)"""
+    gap_dates: List[date]
+
+
+class PriceCoverageListResponse(BaseModel):
+    """일봉 보유 현황 리스트 응답"""
+    total: int
+    items: List[PriceCoverageResponse]
+
+
 class CollectionResponse(BaseModel):
     """수집 작업 응답"""
     success: bool
@@ -0,0 +1,260 @@
+# central-backend/app/services/agent_auth.py
+"""
+Agent 인증 서비스
+- API 키 발급 (HMAC-SHA256 해시만 저장)
+- TTL 캐시 기반 키 검증 (재연결 폭주 시 DB 부하 방지)
+- 연결 허용 속도 제한 (토큰 버킷)
+"""
+from datetime import datetime
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Optional, Tuple
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.agent import AgentApiKey
+from app.models.user import User
+from app.services.agent_bus import agent_bus
+
+logger = logging.getLogger(__name__)
+
+API_KEY_PREFIX = "aut_"
+REVOKE_CHANNEL = "agent_key_revoked"
+
+
+def hash_api_key(api_key: str) -> str:
+    """
+    API 키 해시
+    - 키 자체가 고엔트로피 난수이므로 Argon2 대신 HMAC-SHA256 사용
+      (재연결 폭주 시 검증 비용을 낮게 유지)
+    """
+    return hmac.new(settings.SECRET_KEY.encode(), api_key.encode(), hashlib.sha256).hexdigest()
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    """
+    새 API 키 생성
+
+    Returns:
+        (plaintext, key_prefix, key_hash)
+    """
+    plaintext = API_KEY_PREFIX + secrets.token_urlsafe(32)
+    return plaintext, plaintext[:12], hash_api_key(plaintext)
+
+
+def create_api_key(db: Session, user_id: int, name: Optional[str] = None) -> Tuple[AgentApiKey, str]:
+    """API 키 발급 (평문은 반환값으로 1회만 제공)"""
+    plaintext, key_prefix, key_hash = generate_api_key()
+
+    api_key = AgentApiKey(
+        user_id=user_id,
+        name=name,
+        key_prefix=key_prefix,
+        key_hash=key_hash,
+    )
+    db.add(api_key)
+    db.commit()
+    db.refresh(api_key)
+
+    return api_key, plaintext
+
+
+def revoke_api_key(db: Session, api_key: AgentApiKey):
+    """API 키 폐기 (모든 워커의 캐시에서 제거)"""
+    api_key.is_active = False
+    api_key.revoked_at = datetime.utcnow()
+    db.commit()
+
+    key_cache.invalidate(api_key.key_hash)
+    agent_bus.publish(REVOKE_CHANNEL, {"key_hash": api_key.key_hash})
+
+
+class TTLCache:
+    """스레드 안전한 TTL 캐시 (용량 초과 시 만료 항목부터 정리)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: Dict[str, Tuple[float, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Optional[int]]:
+        """(hit, value)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._data.pop(key, None)
+                return False, None
+            return True, value
+
+    def set(self, key: str, value: Optional[int], ttl: float):
+        with self._lock:
+            if len(self._data) >= self.max_size:
+                self._evict()
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._data.items() if exp < now]
+        for k in expired:
+            del self._data[k]
+        # 그래도 가득 차 있으면 가장 먼저 만료될 항목 정리
+        if len(self._data) >= self.max_size:
+            oldest = sorted(self._data.items(), key=lambda item: item[1][0])[: max(1, self.max_size // 10)]
+            for k, _ in oldest:
+                del self._data[k]
+
+
+class AdmissionLimiter:
+    """연결 허용 토큰 버킷 (재연결 폭주를 초당 rate로 평탄화)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, timeout: float) -> bool:
+        """토큰 획득 (timeout 내 획득 못하면 False)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+
+key_cache = TTLCache(settings.AGENT_AUTH_CACHE_MAX_SIZE)
+admission_limiter = AdmissionLimiter(settings.AGENT_ADMISSION_RATE, settings.AGENT_ADMISSION_BURST)
+
+# 동일 키 동시 검증 병합 + 전체 DB 검증 동시성 제한
+_inflight: Dict[str, asyncio.Future] = {}
+_verify_semaphore: Optional[asyncio.Semaphore] = None
+
+# 키 사용 시각 버퍼 {key_id: last_used_at}
+_pending_usage: Dict[int, datetime] = {}
+_usage_lock = threading.Lock()
+
+
+def _lookup_user_id(key_hash: str) -> Optional[int]:
+    """DB에서 키 검증 (활성 키 + 활성 사용자)"""
+    db = SessionLocal()
+    try:
+        row = db.query(AgentApiKey.id, AgentApiKey.user_id).join(
+            User, User.id == AgentApiKey.user_id
+        ).filter(
+            AgentApiKey.key_hash == key_hash,
+            AgentApiKey.is_active == True,
+            User.is_active == True
+        ).first()
+
+        if not row:
+            return None
+
+        # 사용 시각은 메모리에 모았다가 주기적으로 일괄 반영 (인증 경로에서 쓰기 제거)
+        with _usage_lock:
+            _pending_usage[row.id] = datetime.utcnow()
+        return row.user_id
+    finally:
+        db.close()
+
+
+def flush_key_usage():
+    """버퍼된 키 사용 시각을 DB에 반영 (스케줄러에서 주기적으로 호출)"""
+    with _usage_lock:
+        pending = dict(_pending_usage)
+        _pending_usage.clear()
+
+    if not pending:
+        return
+
+    db = SessionLocal()
+    try:
+        for key_id, used_at in pending.items():
+            db.query(AgentApiKey).filter(AgentApiKey.id == key_id).update(
+                {AgentApiKey.last_used_at: used_at}, synchronize_session=False
+            )
+        db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to flush API key usage: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def verify_api_key(api_key: str) -> Optional[int]:
+    """
+    API 키 검증
+
+    Returns:
+        사용자 ID (유효하지 않으면 None)
+    """
+    global _verify_semaphore
+
+    if not api_key:
+        return None
+
+    key_hash = hash_api_key(api_key)
+    hit, user_id = key_cache.get(key_hash)
+    if hit:
+        return user_id
+
+    # 같은 키로 동시에 들어온 검증은 하나의 DB 조회로 병합
+    pending = _inflight.get(key_hash)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key_hash] = future
+    try:
+        if _verify_semaphore is None:
+            _verify_semaphore = asyncio.Semaphore(settings.AGENT_AUTH_MAX_CONCURRENT_VERIFY)
+
+        async with _verify_semaphore:
+            user_id = await run_in_threadpool(_lookup_user_id, key_hash)
+
+        ttl = settings.AGENT_AUTH_CACHE_TTL_SECONDS if user_id else settings.AGENT_AUTH_NEGATIVE_TTL_SECONDS
+        key_cache.set(key_hash, user_id, ttl)
+        future.set_result(user_id)
+        return user_id
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # 대기자가 없어도 경고가 남지 않도록 소비 처리
+        raise
+    finally:
+        _inflight.pop(key_hash, None)
+
+
+async def _on_key_revoked(message: dict):
+    key_hash = message.get("key_hash")
+    if key_hash:
+        key_cache.invalidate(key_hash)
+
+
+agent_bus.subscribe(REVOKE_CHANNEL, _on_key_revoked)
@@ -0,0 +1,139 @@
+# central-backend/app/services/agent_broadcast.py
+"""
+Agent 브로드캐스트 서비스
+- 대상 사용자 결정 (전체 / 플랜별 / 사용자 목록)
+- 로컬 워커 전달 + 다른 워커로 전파 (agent_bus)
+- 전달 결과를 agent_broadcasts 테이블에 누적
+"""
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
+import logging
+
+from app.core.database import SessionLocal
+from app.models.agent import AgentBroadcast
+from app.models.user import Subscription, SubscriptionStatus
+from app.routers.agent_ws import broadcast_to_agents
+from app.services.agent_bus import agent_bus
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_CHANNEL = "agent_broadcast"
+
+
+def create_broadcast(
+    db: Session,
+    command: str,
+    data: Optional[dict] = None,
+    user_ids: Optional[List[int]] = None,
+    plan_ids: Optional[List[int]] = None,
+    created_by: Optional[str] = None
+) -> AgentBroadcast:
+    """
+    브로드캐스트 레코드 생성
+    - plan_ids 지정 시 해당 플랜의 활성 구독자로 대상 제한
+    - user_ids와 plan_ids 모두 지정 시 교집합
+    """
+    targets: Optional[set] = None
+
+    if user_ids is not None:
+        targets = {str(uid) for uid in user_ids}
+
+    if plan_ids is not None:
+        rows = db.query(Subscription.user_id).filter(
+            Subscription.plan_id.in_(plan_ids),
+            Subscription.status == SubscriptionStatus.ACTIVE
+        ).all()
+        plan_users = {str(row.user_id) for row in rows}
+        targets = plan_users if targets is None else targets & plan_users
+
+    broadcast = AgentBroadcast(
+        command=command,
+        data=data or {},
+        target_user_ids=sorted(targets) if targets is not None else None,
+        created_by=created_by,
+    )
+    db.add(broadcast)
+    db.commit()
+    db.refresh(broadcast)
+
+    return broadcast
+
+
+def record_delivery(db: Session, broadcast_id: int, delivered: int, failed: int):
+    """전달 결과 누적 (여러 워커가 동시에 갱신하므로 원자적 UPDATE)"""
+    if not delivered and not failed:
+        return
+
+    db.query(AgentBroadcast).filter(AgentBroadcast.id == broadcast_id).update({
+        AgentBroadcast.delivered_count: AgentBroadcast.delivered_count + delivered,
+        AgentBroadcast.failed_count: AgentBroadcast.failed_count + failed,
+    }, synchronize_session=False)
+    db.commit()
+
+
+async def dispatch_broadcast(db: Session, broadcast: AgentBroadcast) -> Tuple[int, int]:
+    """
+    브로드캐스트 실행
+    - 이 워커에 연결된 Agent에 즉시 전달
+    - 다른 워커에는 agent_bus로 broadcast ID만 전파
+    - DB 기록 / 전파는 스레드풀에서 실행 (이벤트 루프의 WebSocket 처리를 막지 않도록)
+
+    Returns:
+        이 워커의 (delivered_count, failed_count)
+    """
+    broadcast_id = broadcast.id
+    delivered, failed = await broadcast_to_agents(
+        broadcast.command,
+        broadcast.data,
+        user_ids=broadcast.target_user_ids,
+    )
+    await run_in_threadpool(record_delivery, db, broadcast_id, delivered, failed)
+
+    await run_in_threadpool(agent_bus.publish, BROADCAST_CHANNEL, {"broadcast_id": broadcast_id})
+
+    return delivered, failed
+
+
+def _load_broadcast(broadcast_id: int) -> Optional[AgentBroadcast]:
+    db = SessionLocal()
+    try:
+        broadcast = db.query(AgentBroadcast).filter(AgentBroadcast.id == broadcast_id).first()
+        if broadcast:
+            db.expunge(broadcast)
+        return broadcast
+    finally:
+        db.close()
+
+
+def _record_delivery_standalone(broadcast_id: int, delivered: int, failed: int):
+    db = SessionLocal()
+    try:
+        record_delivery(db, broadcast_id, delivered, failed)
+    except Exception as e:
+        logger.error(f"Failed to record broadcast {broadcast_id} delivery: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def _on_remote_broadcast(message: dict):
+    """다른 워커가 발행한 브로드캐스트를 로컬 Agent에 전달"""
+    broadcast_id = message.get("broadcast_id")
+    if not broadcast_id:
+        return
+
+    broadcast = await run_in_threadpool(_load_broadcast, broadcast_id)
+    if not broadcast:
+        logger.warning(f"Broadcast {broadcast_id} not found")
+        return
+
+    delivered, failed = await broadcast_to_agents(
+        broadcast.command,
+        broadcast.data,
+        user_ids=broadcast.target_user_ids,
+    )
+    await run_in_threadpool(_record_delivery_standalone, broadcast_id, delivered, failed)
+
+
+agent_bus.subscribe(BROADCAST_CHANNEL, _on_remote_broadcast)
@@ -0,0 +1,136 @@
+# central-backend/app/services/agent_bus.py
+"""
+워커 간 메시지 버스 (PostgreSQL LISTEN/NOTIFY)
+- uvicorn 워커마다 Agent 연결이 나뉘어 있으므로
+  한 워커에서 발생한 이벤트를 다른 워커에도 전달
+- PostgreSQL이 아닌 DB(SQLite 등)에서는 로컬 전용으로 동작
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import socket
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.database import engine, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 현재 워커 식별자 (자신이 보낸 알림은 무시)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class AgentBus:
+    """LISTEN/NOTIFY 기반 워커 간 pub/sub"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """PostgreSQL에서만 워커 간 전달 가능"""
+        return engine.dialect.name == "postgresql"
+
+    def subscribe(self, channel: str, handler: Handler):
+        """채널 핸들러 등록 (다른 워커가 publish한 메시지 수신)"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel: str, message: dict):
+        """다른 워커들에게 메시지 발행"""
+        if not self.enabled:
+            return
+
+        payload = json.dumps({"origin": WORKER_ID, "message": message})
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to publish to channel {channel}: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """리스너 스레드 시작 (서버 시작 시 호출)"""
+        if not self.enabled:
+            logger.info("Agent bus disabled (non-PostgreSQL database) - local delivery only")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._loop = loop
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen_loop, name="agent-bus", daemon=True)
+        self._thread.start()
+        logger.info(f"✅ Agent bus listening (worker={WORKER_ID})")
+
+    def stop(self):
+        """리스너 스레드 중지"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _connect(self):
+        import psycopg2
+
+        url = make_url(engine.url.render_as_string(hide_password=False)).set(drivername="postgresql")
+        conn = psycopg2.connect(url.render_as_string(hide_password=False))
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            for channel in self._handlers:
+                cursor.execute(f'LISTEN "{channel}"')
+        return conn
+
+    def _listen_loop(self):
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                backoff = 1
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._dispatch(notify.channel, notify.payload)
+            except Exception as e:
+                logger.error(f"Agent bus listener error: {e} (reconnecting in {backoff}s)")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, channel: str, payload: str):
+        try:
+            envelope = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Invalid agent bus payload on {channel}")
+            return
+
+        if envelope.get("origin") == WORKER_ID:
+            return
+
+        for handler in self._handlers.get(channel, []):
+            asyncio.run_coroutine_threadsafe(handler(envelope.get("message") or {}), self._loop)
+
+
+# 전역 버스 인스턴스
+agent_bus = AgentBus()
@@ -0,0 +1,114 @@
+# central-backend/app/services/agent_protocol.py
+"""
+Agent WebSocket 프로토콜 코덱
+- 연결 시 Sec-WebSocket-Protocol로 프레임 형식 협상
+  - json            : 텍스트 프레임 (기본값)
+  - msgpack         : MessagePack 바이너리 프레임
+  - msgpack+deflate : MessagePack + 메시지별 zlib 압축 (임계값 초과 시)
+- msgpack 미설치 시 json만 지원
+- 수신 압축 프레임은 AGENT_MAX_FRAME_BYTES 까지만 해제 (초과 시 FrameTooLargeError → 연결 종료)
+"""
+from typing import List, Optional, Union
+import json
+import logging
+import zlib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    logger.warning("msgpack not installed - agent protocol limited to JSON frames")
+
+# 압축 프레임 헤더 (1 byte)
+_FLAG_RAW = b"\x00"
+_FLAG_DEFLATE = b"\x01"
+
+
+class FrameTooLargeError(ValueError):
+    """압축 해제 결과가 AGENT_MAX_FRAME_BYTES 초과"""
+
+
+def _inflate(body: bytes) -> bytes:
+    """크기 제한 zlib 해제 (작은 프레임이 수 GB로 풀리는 것 방지)"""
+    limit = settings.AGENT_MAX_FRAME_BYTES
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(body, limit)
+    if decompressor.unconsumed_tail or (not decompressor.eof and len(data) >= limit):
+        raise FrameTooLargeError(f"Decompressed frame exceeds {limit} bytes")
+    if not decompressor.eof:
+        raise zlib.error("Incomplete compressed frame")
+    return data
+
+
+class JsonCodec:
+    """JSON 텍스트 프레임 (기본)"""
+    name = "json"
+    binary = False
+
+    def encode(self, message: dict) -> str:
+        return json.dumps(message)
+
+    def decode(self, frame: Union[str, bytes]) -> dict:
+        return json.loads(frame)
+
+
+class MsgpackCodec:
+    """MessagePack 바이너리 프레임"""
+    name = "msgpack"
+    binary = True
+
+    def encode(self, message: dict) -> bytes:
+        return msgpack.packb(message, use_bin_type=True, default=str)
+
+    def decode(self, frame: Union[str, bytes]) -> dict:
+        if isinstance(frame, str):
+            # 텍스트 프레임은 JSON으로 간주 (구버전 Agent 호환)
+            return json.loads(frame)
+        return msgpack.unpackb(frame, raw=False)
+
+
+class DeflateMsgpackCodec(MsgpackCodec):
+    """MessagePack + 메시지별 zlib 압축"""
+    name = "msgpack+deflate"
+
+    def encode(self, message: dict) -> bytes:
+        packed = super().encode(message)
+        if len(packed) < settings.AGENT_COMPRESSION_MIN_BYTES:
+            return _FLAG_RAW + packed
+        return _FLAG_DEFLATE + zlib.compress(packed, settings.AGENT_COMPRESSION_LEVEL)
+
+    def decode(self, frame: Union[str, bytes]) -> dict:
+        if isinstance(frame, str):
+            return json.loads(frame)
+        flag, body = frame[:1], frame[1:]
+        if flag == _FLAG_DEFLATE:
+            body = _inflate(body)
+        return super().decode(body)
+
+
+JSON_CODEC = JsonCodec()
+
+# 서버 선호 순서와 무관하게 클라이언트가 제시한 순서대로 선택
+CODECS = {JSON_CODEC.name: JSON_CODEC}
+if msgpack is not None:
+    CODECS[MsgpackCodec.name] = MsgpackCodec()
+    CODECS[DeflateMsgpackCodec.name] = DeflateMsgpackCodec()
+
+
+def negotiate_codec(offered: List[str]) -> Optional[Union[JsonCodec, MsgpackCodec]]:
+    """
+    클라이언트가 제시한 subprotocol 중 첫 번째 지원 코덱 선택
+
+    Returns:
+        코덱 (제시한 것이 없으면 None → JSON, subprotocol 응답 없음)
+    """
+    for name in offered:
+        codec = CODECS.get(name.strip())
+        if codec is not None:
+            return codec
+    return None
+
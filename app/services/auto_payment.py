@@ -2,122 +2,157 @@
 """
 Auto-Payment Service
 Handles automatic subscription renewal payments using billing keys
+- 공용 토스 클라이언트 사용 (app.core.http_client)
+- 결제 주기(+거절 횟수)별 고정 Idempotency-Key / orderId (재실행 시 중복 결제 방지)
+  - 거절이 확정된 경우(4xx)에만 새 주문으로 재시도, 결과를 알 수 없으면 같은 주문/키 재사용
+- 작업 큐/재시도는 renewal_queue 참고
 """
 import httpx
 import logging
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from app.models.user import Subscription, User
-from app.core.database import get_db
-import os
+from sqlalchemy.orm import Session, joinedload
+from typing import NamedTuple, Optional, Tuple
+from app.models.user import Subscription
+from app.core.http_client import CircuitOpenError, toss_client
+from app.services.stats_rollup import record_payment
 
 logger = logging.getLogger(__name__)
 
-TOSS_API_URL = "https://api.tosspayments.com/v1"
-TOSS_SECRET_KEY = os.getenv("TOSS_SECRET_KEY")
+# 결제 요청 결과
+CHARGE_SUCCEEDED = "succeeded"
+CHARGE_DECLINED = "declined"    # 토스/카드사 거절 확정 (결제되지 않음)
+CHARGE_UNKNOWN = "unknown"      # 응답 미수신 / 5xx / 429 - 결제되었을 수 있음
+
+# 4xx 중 거절 확정이 아닌 응답 (요청 시간 초과 / 같은 키 처리 중 / 요청 제한)
+_NOT_DECLINED_STATUS = {408, 409, 429}
+
+
+class RenewalRequest(NamedTuple):
+    """결제 요청에 필요한 값 (동시 실행 중 ORM 객체에 접근하지 않도록 분리)"""
+    subscription_id: int
+    billing_key: str
+    customer_key: str
+    customer_email: Optional[str]
+    amount: float
+    order_id: str
+    order_name: str
+    idempotency_key: str
+
+
+def renewal_cycle(subscription: Subscription) -> str:
+    """결제 주기 식별자 (갱신 전 만료일)"""
+    return subscription.expires_at.strftime("%Y%m%d") if subscription.expires_at else "initial"
+
+
+def build_renewal_request(subscription: Subscription, declines: int = 0) -> RenewalRequest:
+    """
+    구독 → 결제 요청 변환
+    - 같은 결제 주기, 같은 거절 횟수에서는 항상 같은 orderId / Idempotency-Key
+      (응답 미수신 / 5xx 후 재시도, 결과 기록 전 중단 후 재실행 모두 토스가 첫 결제를 재사용)
+    - 거절이 확정된 뒤의 재시도만 거절 횟수가 바뀌어 새 결제로 요청
+    """
+    plan = subscription.plan
+    amount = plan.price_monthly if subscription.billing_period == 'monthly' else plan.price_yearly
+    cycle = renewal_cycle(subscription)
+    suffix = f"_{declines}" if declines else ""
+
+    return RenewalRequest(
+        subscription_id=subscription.id,
+        billing_key=subscription.billing_key,
+        customer_key=str(subscription.user_id),
+        customer_email=subscription.user.email if subscription.user else None,
+        amount=amount,
+        order_id=f"AUTO_{subscription.id}_{cycle}{suffix}",
+        order_name=f"{plan.display_name} 자동결제",
+        idempotency_key=f"renewal-{subscription.id}-{cycle}{suffix}",
+    )
+
+
+async def charge_billing_key(request: RenewalRequest) -> Tuple[str, Optional[str]]:
+    """
+    빌링키 결제 요청
+
+    Returns:
+        (CHARGE_SUCCEEDED / CHARGE_DECLINED / CHARGE_UNKNOWN, 실패 사유)
+
+    Raises:
+        CircuitOpenError: 토스 API 차단 중 (요청하지 않음, 시도로 세지 않도록 호출자가 처리)
+    """
+    try:
+        response = await toss_client.post(
+            f"/billing/{request.billing_key}",
+            json={
+                "customerKey": request.customer_key,
+                "amount": request.amount,
+                "orderId": request.order_id,
+                "orderName": request.order_name,
+                "customerEmail": request.customer_email
+            },
+            operation="billing_charge",
+            idempotency_key=request.idempotency_key
+        )
+    except CircuitOpenError:
+        raise
+    except httpx.HTTPError as e:
+        logger.error(f"❌ Auto payment request failed for subscription {request.subscription_id}: {e}")
+        return CHARGE_UNKNOWN, f"{type(e).__name__}: {e}"
+
+    if response.status_code == 200:
+        logger.info(f"✅ Auto payment successful for subscription {request.subscription_id}, amount: {request.amount}")
+        return CHARGE_SUCCEEDED, None
+
+    logger.error(f"❌ Auto payment failed for subscription {request.subscription_id}: {response.text}")
+    error = f"HTTP {response.status_code}: {response.text[:500]}"
+    if 400 <= response.status_code < 500 and response.status_code not in _NOT_DECLINED_STATUS:
+        return CHARGE_DECLINED, error
+    return CHARGE_UNKNOWN, error
+
+
+def apply_renewal(subscription: Subscription):
+    """결제 성공한 구독 기간 연장"""
+    if subscription.billing_period == 'monthly':
+        subscription.expires_at = datetime.utcnow() + timedelta(days=30)
+    else:  # yearly
+        subscription.expires_at = datetime.utcnow() + timedelta(days=365)
+    subscription.next_payment_date = subscription.expires_at
+    subscription.last_payment_at = datetime.utcnow()
+    subscription.status = "ACTIVE"
 
 
 async def process_auto_payment(subscription_id: int, db: Session) -> bool:
     """
-    자동 결제 처리
-    
+    자동 결제 처리 (단건)
+
     Args:
         subscription_id: 구독 ID
         db: Database session
-    
+
     Returns:
         bool: 성공 여부
     """
     try:
-        subscription = db.query(Subscription).get(subscription_id)
-        
+        subscription = db.query(Subscription).options(
+            joinedload(Subscription.plan),
+            joinedload(Subscription.user)
+        ).filter(Subscription.id == subscription_id).first()
+
         if not subscription or not subscription.billing_key:
             logger.warning(f"No billing key for subscription {subscription_id}")
             return False
-        
-        # Get plan info
-        plan = subscription.plan
-        amount = plan.price_monthly if subscription.billing_period == 'monthly' else plan.price_yearly
-        
-        # Generate order ID
-        order_id = f"AUTO_{subscription.id}_{int(datetime.now().timestamp())}"
-        order_name = f"{plan.display_name} 자동결제"
-        
-        # Request payment with billing key
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{TOSS_API_URL}/billing/{subscription.billing_key}",
-                json={
-                    "customerKey": str(subscription.user_id),
-                    "amount": amount,
-                    "orderId": order_id,
-                    "orderName": order_name,
-                    "customerEmail": subscription.user.email if subscription.user else None
-                },
-                auth=(TOSS_SECRET_KEY, ""),
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                payment_data = response.json()
-                
-                # Extend subscription
-                if subscription.billing_period == 'monthly':
-                    subscription.expires_at = datetime.utcnow() + timedelta(days=30)
-                    subscription.next_payment_date = subscription.expires_at
-                else:  # yearly
-                    subscription.expires_at = datetime.utcnow() + timedelta(days=365)
-                    subscription.next_payment_date = subscription.expires_at
-                
-                subscription.last_payment_at = datetime.utcnow()
-                subscription.status = "ACTIVE"
-                
-                db.commit()
-                
-                logger.info(f"✅ Auto payment successful for subscription {subscription_id}, amount: {amount}")
-                return True
-            else:
-                logger.error(f"❌ Auto payment failed for subscription {subscription_id}: {response.text}")
-                return False
-                
-    except Exception as e:
-        logger.error(f"Auto payment error for subscription {subscription_id}: {e}", exc_info=True)
-        return False
 
+        request = build_renewal_request(subscription)
+
+        async with toss_client.session():
+            outcome, _ = await charge_billing_key(request)
+
+        success = outcome == CHARGE_SUCCEEDED
+        if success:
+            record_payment(db, subscription, request.amount, request.order_id, kind="RENEWAL")
+            apply_renewal(subscription)
+            db.commit()
+        return success
 
-async def check_and_process_renewals(db: Session):
-    """
-    만료 예정 구독 확인 및 자동 결제 처리
-    """
-    try:
-        # 3일 이내 만료 예정 구독 조회
-        threshold_date = datetime.utcnow() + timedelta(days=3)
-        
-        expiring_subscriptions = db.query(Subscription).filter(
-            Subscription.auto_renew == True,
-            Subscription.billing_key.isnot(None),
-            Subscription.expires_at <= threshold_date,
-            Subscription.expires_at > datetime.utcnow(),  # Not yet expired
-            Subscription.status == "ACTIVE"
-        ).all()
-        
-        logger.info(f"Found {len(expiring_subscriptions)} subscriptions to renew")
-        
-        success_count = 0
-        fail_count = 0
-        
-        for subscription in expiring_subscriptions:
-            success = await process_auto_payment(subscription.id, db)
-            
-            if success:
-                success_count += 1
-                logger.info(f"Renewed subscription {subscription.id}")
-            else:
-                fail_count += 1
-                logger.error(f"Failed to renew subscription {subscription.id}")
-                # TODO: Send notification to user about payment failure
-        
-        logger.info(f"Renewal check complete: {success_count} succeeded, {fail_count} failed")
-        
     except Exception as e:
-        logger.error(f"Renewal check failed: {e}", exc_info=True)
+        logger.error(f"Auto payment error for subscription {subscription_id}: {e}", exc_info=True)
+        db.rollback()
+        return False
@@ -5,18 +5,21 @@
 - 홀드백 기간 검증 (30일)
 - 트랜잭션 롤백 기능
 """
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import logging
 
 from ..models.commission import (
     Commission,
     CommissionStatus,
-    CommissionRate,
     Referral,
 )
 from ..core.config import settings
+from ..core.metrics import commission_transition_runs_total, record_commission_transitions
+from .commission_ledger import apply_transitions, move_amount
+from .commission_rates import rate_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +28,12 @@ def trigger_commission_event(
     db: Session,
     referral_id: int,
     event_type: str,  # SIGNUP, RENEWAL, UPGRADE
-    subscription_amount: float
+    subscription_amount: float,
+    plan_id: Optional[int] = None
 ):
     """
     커미션 발생 이벤트 처리
-    - 커미션 비율 조회 (DB에서)
+    - 커미션 비율 조회 (메모리 캐시, plan_id 지정 시 플랜 전용 비율 우선)
     - 커미션 생성 (PENDING 상태)
     - 홀드백 기간 설정 (30일)
     """
@@ -40,16 +44,11 @@ def trigger_commission_event(
             logger.error(f"Referral {referral_id} not found")
             return
         
-        # 커미션 비율 조회 (활성화된 것 중 가장 최근 것)
-        commission_rate = db.query(CommissionRate).filter(
-            CommissionRate.event_type == event_type,
-            CommissionRate.is_active == True,
-            CommissionRate.valid_from <= datetime.utcnow(),
-            (CommissionRate.valid_until.is_(None)) | (CommissionRate.valid_until >= datetime.utcnow())
-        ).order_by(CommissionRate.created_at.desc()).first()
+        # 커미션 비율 조회 (메모리 캐시, 플랜 전용 비율 우선)
+        commission_rate = rate_resolver.resolve(event_type, plan_id)
         
         if not commission_rate:
-            logger.warning(f"No active commission rate found for event {event_type}")
+            logger.warning(f"No active commission rate found for event {event_type} (plan: {plan_id})")
             # 기본 비율 10% 사용
             rate_percentage = 10.0
             commission_rate_id = None
@@ -76,6 +75,7 @@ def trigger_commission_event(
         )
         
         db.add(new_commission)
+        move_amount(db, referral.referrer_id, commission_amount, None, CommissionStatus.PENDING)
         db.commit()
         
         logger.info(
@@ -89,42 +89,88 @@ def trigger_commission_event(
         raise
 
 
-def process_commission_state_transitions(db: Session):
+def _bulk_transition(
+    db: Session,
+    from_status: CommissionStatus,
+    to_status: CommissionStatus,
+    chunk_size: int,
+    extra_filters: tuple = (),
+    extra_values: Optional[dict] = None,
+) -> int:
+    """
+    상태 일괄 전이 (청크 단위 UPDATE ... RETURNING)
+    - RETURNING 결과로 잔액 원장을 같은 트랜잭션에서 갱신
+    - 청크마다 커밋하여 락 보유 시간과 트랜잭션 크기를 제한
+    - PostgreSQL에서는 SKIP LOCKED로 동시 실행 시 같은 행을 건너뜀
+    """
+    total = 0
+    values = {"status": to_status, **(extra_values or {})}
+
+    while True:
+        chunk_ids = select(Commission.id).where(
+            Commission.status == from_status,
+            *extra_filters
+        ).order_by(Commission.id).limit(chunk_size).with_for_update(skip_locked=True)
+
+        rows = db.execute(
+            update(Commission)
+            .where(Commission.id.in_(chunk_ids.scalar_subquery()))
+            .values(**values)
+            .returning(Commission.user_id, Commission.amount)
+            .execution_options(synchronize_session=False)
+        ).all()
+        apply_transitions(db, rows, from_status, to_status)
+        db.commit()
+
+        total += len(rows)
+        if len(rows) < chunk_size:
+            break
+
+    return total
+
+
+def process_commission_state_transitions(db: Session, chunk_size: Optional[int] = None) -> dict:
     """
     커미션 상태 자동 전이 (스케줄러에서 호출)
     - PENDING → HOLDBACK: 즉시
     - HOLDBACK → APPROVED: 홀드백 기간 종료 후
+    - ORM 객체를 로드하지 않고 집합 기반 UPDATE로 처리
+    
+    Returns:
+        {"holdback": 전이 건수, "approved": 승인 건수}
     """
+    chunk_size = chunk_size or settings.COMMISSION_TRANSITION_CHUNK_SIZE
+    
     try:
         # PENDING → HOLDBACK
-        pending_commissions = db.query(Commission).filter(
-            Commission.status == CommissionStatus.PENDING
-        ).all()
-        
-        for commission in pending_commissions:
-            commission.status = CommissionStatus.HOLDBACK
-        
-        if pending_commissions:
-            db.commit()
-            logger.info(f"Transitioned {len(pending_commissions)} commissions to HOLDBACK")
+        holdback_count = _bulk_transition(
+            db,
+            CommissionStatus.PENDING,
+            CommissionStatus.HOLDBACK,
+            chunk_size,
+        )
+        if holdback_count:
+            logger.info(f"Transitioned {holdback_count} commissions to HOLDBACK")
         
         # HOLDBACK → APPROVED (홀드백 기간 종료)
         now = datetime.utcnow()
-        holdback_commissions = db.query(Commission).filter(
-            Commission.status == CommissionStatus.HOLDBACK,
-            Commission.holdback_until <= now
-        ).all()
-        
-        for commission in holdback_commissions:
-            commission.status = CommissionStatus.APPROVED
-            commission.approved_at = now
+        approved_count = _bulk_transition(
+            db,
+            CommissionStatus.HOLDBACK,
+            CommissionStatus.APPROVED,
+            chunk_size,
+            extra_filters=(Commission.holdback_until <= now,),
+            extra_values={"approved_at": now},
+        )
+        if approved_count:
+            logger.info(f"Approved {approved_count} commissions after holdback period")
         
-        if holdback_commissions:
-            db.commit()
-            logger.info(f"Approved {len(holdback_commissions)} commissions after holdback period")
+        record_commission_transitions(holdback_count, approved_count)
+        return {"holdback": holdback_count, "approved": approved_count}
         
     except Exception as e:
         logger.error(f"Commission state transition failed: {e}")
+        commission_transition_runs_total.inc(status="error")
         db.rollback()
         raise
 
@@ -133,9 +179,11 @@ def cancel_commission(db: Session, commission_id: int, reason: str = "Refund"):
     """
     커미션 취소 (환불 등의 이유로)
     - 트랜잭션 롤백 기능
+    - 행을 잠근 뒤의 상태에서 잔액 이동 (이미 지급/취소된 커미션은 거부)
     """
     try:
-        commission = db.query(Commission).filter(Commission.id == commission_id).first()
+        # 행 잠금: 일괄 전이/지급이 끼어들어 잔액 원장이 다른 상태 컬럼에서 차감되지 않도록
+        commission = db.query(Commission).filter(Commission.id == commission_id).with_for_update().first()
         
         if not commission:
             raise ValueError(f"Commission {commission_id} not found")
@@ -143,6 +191,10 @@ def cancel_commission(db: Session, commission_id: int, reason: str = "Refund"):
         if commission.status == CommissionStatus.PAID:
             raise ValueError("Cannot cancel already paid commission")
         
+        if commission.status == CommissionStatus.CANCELLED:
+            raise ValueError("Commission already cancelled")
+        
+        move_amount(db, commission.user_id, commission.amount, commission.status, CommissionStatus.CANCELLED)
         commission.status = CommissionStatus.CANCELLED
         commission.description = f"{commission.description} | CANCELLED: {reason}"
         
@@ -153,3 +205,35 @@ def cancel_commission(db: Session, commission_id: int, reason: str = "Refund"):
         logger.error(f"Failed to cancel commission: {e}")
         db.rollback()
         raise
+
+
+def payout_approved_commissions(db: Session, user_id: int) -> Tuple[float, int]:
+    """
+    승인된 커미션 일괄 지급 처리
+    - APPROVED → PAID 단일 UPDATE ... RETURNING (행을 로드하지 않음)
+    
+    Returns:
+        (지급 총액, 지급 건수)
+    """
+    try:
+        rows = db.execute(
+            update(Commission)
+            .where(
+                Commission.user_id == user_id,
+                Commission.status == CommissionStatus.APPROVED
+            )
+            .values(status=CommissionStatus.PAID, paid_at=datetime.utcnow())
+            .returning(Commission.amount)
+            .execution_options(synchronize_session=False)
+        ).all()
+        
+        total_amount = sum(row.amount for row in rows)
+        move_amount(db, user_id, total_amount, CommissionStatus.APPROVED, CommissionStatus.PAID)
+        db.commit()
+        
+        return total_amount, len(rows)
+        
+    except Exception as e:
+        logger.error(f"Failed to process payout for user {user_id}: {e}")
+        db.rollback()
+        raise
@@ -0,0 +1,148 @@
+# central-backend/app/services/commission_ledger.py
+"""
+커미션 잔액 원장
+- 추천인별 상태 합계/추천 수를 commission_balances에 증분 반영
+- 호출자의 트랜잭션 안에서 실행 (커밋은 호출자가 담당)
+- 통계 조회는 기본키 단건 조회로 처리
+"""
+from collections import defaultdict
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+
+from ..core.database import insert_ignore
+from ..models.commission import (
+    Commission,
+    CommissionBalance,
+    CommissionStatus,
+    Referral,
+    ReferralStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+# 상태별 잔액 컬럼 (CANCELLED는 집계 대상 아님)
+STATUS_COLUMNS = {
+    CommissionStatus.PENDING: "total_pending",
+    CommissionStatus.HOLDBACK: "total_holdback",
+    CommissionStatus.APPROVED: "total_approved",
+    CommissionStatus.PAID: "total_paid",
+}
+
+
+def _ensure_balance(db: Session, user_id: int):
+    """잔액 행이 없으면 생성 (동시 생성 시 충돌 무시)"""
+    inserted = insert_ignore(db, CommissionBalance, {"user_id": user_id}, ["user_id"])
+    if inserted is None and db.get(CommissionBalance, user_id) is None:
+        db.add(CommissionBalance(user_id=user_id))
+        db.flush()
+
+
+def apply_delta(db: Session, user_id: int, **deltas: float):
+    """
+    잔액 증분 반영 (column = column + delta)
+
+    Example:
+        apply_delta(db, user_id, total_pending=5000, total_referrals=1)
+    """
+    deltas = {column: value for column, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    _ensure_balance(db, user_id)
+    db.query(CommissionBalance).filter(CommissionBalance.user_id == user_id).update(
+        {getattr(CommissionBalance, column): getattr(CommissionBalance, column) + value
+         for column, value in deltas.items()},
+        synchronize_session=False
+    )
+
+
+def move_amount(
+    db: Session,
+    user_id: int,
+    amount: float,
+    from_status: Optional[CommissionStatus],
+    to_status: Optional[CommissionStatus]
+):
+    """상태 간 금액 이동 (None / CANCELLED는 잔액 밖)"""
+    deltas: Dict[str, float] = defaultdict(float)
+    if from_status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[from_status]] -= amount
+    if to_status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[to_status]] += amount
+    apply_delta(db, user_id, **deltas)
+
+
+def apply_transitions(
+    db: Session,
+    rows: Iterable[Tuple[int, float]],
+    from_status: CommissionStatus,
+    to_status: CommissionStatus
+):
+    """일괄 전이 결과 (user_id, amount) 행을 사용자별로 합산하여 반영"""
+    totals: Dict[int, float] = defaultdict(float)
+    for user_id, amount in rows:
+        totals[user_id] += amount
+
+    for user_id, amount in totals.items():
+        move_amount(db, user_id, amount, from_status, to_status)
+
+
+def get_balance(db: Session, user_id: int) -> dict:
+    """잔액 조회 (기본키 단건 조회, 행이 없으면 0)"""
+    balance = db.get(CommissionBalance, user_id)
+    if balance is None:
+        balance = CommissionBalance(
+            total_pending=0, total_holdback=0, total_approved=0, total_paid=0,
+            total_referrals=0, active_referrals=0,
+        )
+
+    return {
+        "total_pending": float(balance.total_pending),
+        "total_holdback": float(balance.total_holdback),
+        "total_approved": float(balance.total_approved),
+        "total_paid": float(balance.total_paid),
+        "total_referrals": balance.total_referrals,
+        "active_referrals": balance.active_referrals,
+    }
+
+
+def rebuild_balances(db: Session) -> int:
+    """
+    전체 잔액 재계산 (초기 백필 / 불일치 복구용)
+    - 커미션/추천 이력에서 다시 집계하여 덮어씀
+
+    Returns:
+        갱신된 사용자 수
+    """
+    totals: Dict[int, dict] = defaultdict(lambda: {
+        "total_pending": 0.0, "total_holdback": 0.0, "total_approved": 0.0, "total_paid": 0.0,
+        "total_referrals": 0, "active_referrals": 0,
+    })
+
+    amounts = db.query(
+        Commission.user_id, Commission.status, func.sum(Commission.amount)
+    ).filter(
+        Commission.status.in_(list(STATUS_COLUMNS))
+    ).group_by(Commission.user_id, Commission.status).all()
+
+    for user_id, commission_status, total in amounts:
+        totals[user_id][STATUS_COLUMNS[commission_status]] = float(total or 0)
+
+    referrals = db.query(
+        Referral.referrer_id,
+        func.count(Referral.id),
+        func.sum(case((Referral.status == ReferralStatus.ACTIVE, 1), else_=0))
+    ).group_by(Referral.referrer_id).all()
+
+    for user_id, total_count, active_count in referrals:
+        totals[user_id]["total_referrals"] = total_count
+        totals[user_id]["active_referrals"] = int(active_count or 0)
+
+    db.query(CommissionBalance).delete(synchronize_session=False)
+    db.add_all(CommissionBalance(user_id=user_id, **values) for user_id, values in totals.items())
+    db.commit()
+
+    logger.info(f"Rebuilt commission balances for {len(totals)} users")
+    return len(totals)
@@ -0,0 +1,168 @@
+# central-backend/app/services/commission_rates.py
+"""
+커미션 비율 조회 캐시
+- 활성 CommissionRate 전체를 메모리에 적재 (변경 빈도가 매우 낮음)
+- (event_type, plan_id)별로 유효 기간을 겹치지 않는 구간으로 분할
+  → 시점 t의 적용 비율을 이진 탐색으로 O(log n) 조회
+- 플랜 전용 비율 우선, 없으면 전체 대상(plan_id = null) 비율 사용
+- 비율 변경 시 ORM 이벤트 / agent_bus / TTL로 재적재
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.commission import CommissionRate
+from app.services.agent_bus import agent_bus
+
+logger = logging.getLogger(__name__)
+
+RATES_CHANNEL = "commission_rates_changed"
+
+# 기존 쿼리의 valid_until 포함 비교(>=)를 반개구간으로 맞추기 위한 보정
+_INCLUSIVE_END = timedelta(microseconds=1)
+
+
+class ResolvedRate(NamedTuple):
+    """조회 결과 (세션과 무관한 값 객체)"""
+    id: int
+    rate_percentage: float
+
+
+class _Timeline(NamedTuple):
+    """구간 경계(정렬) 및 각 구간 [bounds[i], bounds[i+1])의 적용 비율"""
+    bounds: List[datetime]
+    rates: List[Optional[ResolvedRate]]
+
+
+def _build_timeline(rows: List[CommissionRate]) -> _Timeline:
+    """
+    유효 기간이 겹치는 비율들을 기본 구간으로 분할
+    - 구간마다 가장 최근에 생성된 비율이 적용 (기존 created_at desc 정책)
+    """
+    intervals = []
+    for row in rows:
+        start = row.valid_from or datetime.min
+        end = row.valid_until + _INCLUSIVE_END if row.valid_until else datetime.max
+        if start < end:
+            intervals.append((start, end, (row.created_at or datetime.min, row.id), row))
+
+    bounds = sorted({point for start, end, _, _ in intervals for point in (start, end)})
+    rates: List[Optional[ResolvedRate]] = []
+
+    for i, seg_start in enumerate(bounds):
+        best = None
+        for start, end, priority, row in intervals:
+            if start <= seg_start < end and (best is None or priority > best[0]):
+                best = (priority, row)
+        rates.append(ResolvedRate(best[1].id, best[1].rate_percentage) if best else None)
+
+    return _Timeline(bounds, rates)
+
+
+class CommissionRateResolver:
+    """스레드 안전한 커미션 비율 조회기"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._timelines: Dict[Tuple[str, Optional[int]], _Timeline] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """다음 조회 시 재적재"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _load(self):
+        db = SessionLocal()
+        try:
+            rows = db.query(CommissionRate).filter(CommissionRate.is_active == True).all()
+        finally:
+            db.close()
+
+        grouped: Dict[Tuple[str, Optional[int]], List[CommissionRate]] = {}
+        for row in rows:
+            grouped.setdefault((row.event_type, row.plan_id), []).append(row)
+
+        self._timelines = {key: _build_timeline(group) for key, group in grouped.items()}
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(rows)} commission rates ({len(self._timelines)} groups)")
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                self._load()
+
+    def _lookup(self, key: Tuple[str, Optional[int]], at: datetime) -> Optional[ResolvedRate]:
+        timeline = self._timelines.get(key)
+        if timeline is None:
+            return None
+        index = bisect_right(timeline.bounds, at) - 1
+        if index < 0:
+            return None
+        return timeline.rates[index]
+
+    def resolve(
+        self,
+        event_type: str,
+        plan_id: Optional[int] = None,
+        at: Optional[datetime] = None
+    ) -> Optional[ResolvedRate]:
+        """
+        시점 at에 적용되는 커미션 비율 조회
+
+        Returns:
+            ResolvedRate (해당 비율이 없으면 None)
+        """
+        self._ensure_loaded()
+        at = at or datetime.utcnow()
+
+        if plan_id is not None:
+            rate = self._lookup((event_type, plan_id), at)
+            if rate is not None:
+                return rate
+        return self._lookup((event_type, None), at)
+
+
+rate_resolver = CommissionRateResolver(settings.COMMISSION_RATE_CACHE_TTL_SECONDS)
+
+
+# ---- 변경 감지: 커밋된 뒤에만 재적재 (미커밋 상태를 다른 세션에서 읽지 않도록) ----
+
+_DIRTY_KEY = "commission_rates_dirty"
+
+
+def _mark_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(CommissionRate, _event_name, _mark_dirty)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        rate_resolver.invalidate()
+        agent_bus.publish(RATES_CHANNEL, {})
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+async def _on_rates_changed(message: dict):
+    rate_resolver.invalidate()
+
+
+agent_bus.subscribe(RATES_CHANNEL, _on_rates_changed)
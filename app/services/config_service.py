@@ -0,0 +1,167 @@
+# central-backend/app/services/config_service.py
+"""
+시스템 설정 캐시
+- system_configs 전체를 메모리에 적재 (행 수가 적고 변경 빈도가 매우 낮음)
+- 전역 버전 = max(system_configs.version), 저장 시 +1 (모델 이벤트, 스크립트 직접 저장 포함) → ETag로 사용
+- 변경 감지
+  - 같은 워커: 저장 직후 재적재
+  - 다른 워커: agent_bus 알림 + SYSTEM_CONFIG_CHECK_SECONDS마다 버전만 조회 (알림 누락 대비)
+- 변경 시 연결된 Agent에 config_updated 전송 (클라이언트 폴링 불필요)
+"""
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, NamedTuple, Optional
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.system_config import SystemConfig
+from app.routers.agent_ws import broadcast_to_agents
+from app.services.agent_bus import agent_bus
+
+logger = logging.getLogger(__name__)
+
+CONFIG_CHANNEL = "system_config_changed"
+CONFIG_UPDATED_COMMAND = "config_updated"
+
+DEFAULT_MODEL_PRIORITY = ["gemini-2.5-flash", "gemini-1.5-flash"]
+
+
+class ConfigEntry(NamedTuple):
+    """설정 값 (세션과 무관한 값 객체)"""
+    value: Any
+    version: int
+    updated_at: Optional[datetime]
+    updated_by: Optional[str]
+
+
+class SystemConfigService:
+    """스레드 안전한 시스템 설정 캐시"""
+
+    def __init__(self, check_seconds: float):
+        self.check_seconds = check_seconds
+        self._entries: Dict[str, ConfigEntry] = {}
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """다음 조회 시 재적재"""
+        with self._lock:
+            self._version = None
+
+    def _load(self, db: Session):
+        rows = db.query(SystemConfig).all()
+        self._entries = {
+            row.config_key: ConfigEntry(row.config_value, row.version or 0, row.updated_at, row.updated_by)
+            for row in rows
+        }
+        self._version = max((entry.version for entry in self._entries.values()), default=0)
+        self._checked_at = time.monotonic()
+        logger.info(f"Loaded {len(rows)} system configs (version {self._version})")
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._checked_at < self.check_seconds:
+                return
+
+            db = SessionLocal()
+            try:
+                if self._version is not None:
+                    current = db.query(func.coalesce(func.max(SystemConfig.version), 0)).scalar()
+                    self._checked_at = time.monotonic()
+                    if current == self._version:
+                        return
+                self._load(db)
+            finally:
+                db.close()
+
+    @property
+    def version(self) -> int:
+        self._ensure_fresh()
+        return self._version
+
+    @property
+    def etag(self) -> str:
+        """전체 설정 버전 기반 ETag (어느 키든 바뀌면 변경)"""
+        return f'W/"config-{self.version}"'
+
+    def entry(self, key: str) -> Optional[ConfigEntry]:
+        self._ensure_fresh()
+        return self._entries.get(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.entry(key)
+        return entry.value if entry is not None else default
+
+    def set(
+        self,
+        db: Session,
+        key: str,
+        value: Any,
+        updated_by: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> ConfigEntry:
+        """
+        설정 저장 + 버전 증가 (커밋 포함, 버전은 SystemConfig 저장 이벤트가 부여)
+        - 같은 워커 캐시는 즉시 재적재, 다른 워커는 agent_bus로 무효화
+        """
+        config = db.query(SystemConfig).filter(SystemConfig.config_key == key).with_for_update().first()
+        if config:
+            config.config_value = value
+            config.updated_by = updated_by
+        else:
+            config = SystemConfig(
+                config_key=key,
+                config_value=value,
+                description=description,
+                updated_by=updated_by
+            )
+            db.add(config)
+
+        db.commit()
+        db.refresh(config)
+
+        self.invalidate()
+        agent_bus.publish(CONFIG_CHANNEL, {"version": config.version})
+
+        return ConfigEntry(config.config_value, config.version, config.updated_at, config.updated_by)
+
+    def gemini_config(self) -> dict:
+        """AutoTrader 클라이언트용 통합 Gemini 설정"""
+        models = self.get("gemini_models")
+        model_priority: List[str] = DEFAULT_MODEL_PRIORITY
+        if models:
+            preferred = models.get("preferred_models", [])
+            model_priority = preferred if preferred else [models.get("fallback_model", "gemini-2.5-flash")]
+
+        api_key = (self.get("gemini_api_key") or {}).get("api_key", "")
+        api_keys = {model: api_key for model in model_priority} if api_key else {}
+
+        return {"model_priority": model_priority, "api_keys": api_keys}
+
+
+config_service = SystemConfigService(settings.SYSTEM_CONFIG_CHECK_SECONDS)
+
+
+def _agent_payload() -> dict:
+    return {"version": config_service.version, "gemini": config_service.gemini_config()}
+
+
+async def notify_agents():
+    """이 워커에 연결된 Agent에 최신 설정 전송"""
+    payload = await run_in_threadpool(_agent_payload)
+    await broadcast_to_agents(CONFIG_UPDATED_COMMAND, payload)
+
+
+async def _on_config_changed(message: dict):
+    """다른 워커의 설정 변경 → 캐시 무효화 후 로컬 Agent에 전달 (재적재 중인 스레드가 잠금을 쥐고 있을 수 있음)"""
+    await run_in_threadpool(config_service.invalidate)
+    await notify_agents()
+
+
+agent_bus.subscribe(CONFIG_CHANNEL, _on_config_changed)
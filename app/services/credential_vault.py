@@ -0,0 +1,134 @@
+# central-backend/app/services/credential_vault.py
+"""
+키움 인증 정보 복호화 캐시 + 키 교체 재암호화
+- 복호화 결과를 (credential_id, updated_at) 키로 짧게 캐시
+  - Agent 재연결 폭주 시 같은 계좌를 반복 복호화하지 않음
+  - 수정되면 updated_at이 바뀌어 자동으로 새 항목 사용
+  - 평문은 이 프로세스 메모리에만 보관 (로그/직렬화 금지), TTL + 최대 개수 제한
+- 키 교체: key_version이 현재 키보다 낮은 행을 배치로 재암호화
+  (updated_at 유지 → 캐시/버전 해시 영향 없음, 서비스 중단 없음)
+"""
+from collections import OrderedDict
+from cryptography.fernet import InvalidToken
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import NamedTuple, Optional, Tuple
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.crypto import cipher
+from app.models.kiwoom import KiwoomCredential
+
+logger = logging.getLogger(__name__)
+
+
+class DecryptedCredential(NamedTuple):
+    app_key: str
+    secret_key: str
+
+
+class DecryptedCredentialCache:
+    """스레드 안전한 TTL + LRU 캐시"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, Optional[datetime]], Tuple[float, DecryptedCredential]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, credential: KiwoomCredential) -> DecryptedCredential:
+        """복호화 (캐시 우선)"""
+        key = (credential.id, credential.updated_at)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        value = DecryptedCredential(
+            cipher.decrypt(credential.app_key),
+            cipher.decrypt(credential.secret_key),
+        )
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, credential_id: int):
+        """계좌 삭제/수정 시 즉시 제거"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == credential_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = DecryptedCredentialCache(
+    settings.CREDENTIAL_CACHE_TTL_SECONDS,
+    settings.CREDENTIAL_CACHE_MAX_SIZE,
+)
+
+
+def decrypt_credential_cached(credential: KiwoomCredential) -> DecryptedCredential:
+    return credential_cache.get(credential)
+
+
+def rotate_credentials(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    이전 키로 암호화된 인증 정보 재암호화
+    - 배치마다 커밋, 여러 워커가 동시에 실행해도 SKIP LOCKED로 분담
+
+    Returns:
+        재암호화된 행 수
+    """
+    batch_size = batch_size or settings.CREDENTIAL_ROTATION_BATCH_SIZE
+    primary = cipher.primary_version
+    rotated = 0
+    last_id = 0
+
+    while True:
+        rows = db.query(KiwoomCredential).filter(
+            KiwoomCredential.id > last_id,
+            func.coalesce(KiwoomCredential.key_version, 1) < primary
+        ).order_by(KiwoomCredential.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not rows:
+            break
+
+        for row in rows:
+            try:
+                values = {
+                    KiwoomCredential.app_key: cipher.rotate(row.app_key),
+                    KiwoomCredential.secret_key: cipher.rotate(row.secret_key),
+                }
+            except InvalidToken:
+                # 설정에 없는 키로 암호화된 행 → 건너뛰고 다음 실행에서 다시 시도
+                logger.error(f"Credential {row.id} cannot be decrypted with any configured key")
+                continue
+
+            values[KiwoomCredential.key_version] = primary
+            values[KiwoomCredential.updated_at] = KiwoomCredential.updated_at  # onupdate 방지
+            db.query(KiwoomCredential).filter(KiwoomCredential.id == row.id).update(
+                values, synchronize_session=False
+            )
+            rotated += 1
+
+        db.commit()
+        last_id = rows[-1].id
+
+        if len(rows) < batch_size:
+            break
+
+    if rotated:
+        logger.info(f"🔑 Re-encrypted {rotated} credentials with key version {primary}")
+    return rotated
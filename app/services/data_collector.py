@@ -32,9 +32,14 @@ from app.models.financial_data import (
     StockInfo, DailyPrice, FinancialStatement, 
     Disclosure, DataCollectionLog
 )
+from app.services.price_coverage import record_inserted
+from app.services.trading_calendar import TradingCalendar
 
 logger = logging.getLogger(__name__)
 
+# 이동평균선 기간 (가장 긴 기간만큼 앞선 일봉이 있어야 첫 저장일 이동평균이 계산됨)
+MA_WINDOWS = (5, 10, 20, 60, 120, 180)
+
 
 class DataCollector:
     """재무 데이터 수집 메인 클래스"""
@@ -43,6 +48,8 @@ class DataCollector:
         self.db = db
         self.dart_api_key = os.getenv("DART_API_KEY")
         self.dart = None
+        self.last_error: Optional[Exception] = None  # 마지막 종목 수집의 실패 원인 (실패 항목 기록용)
+        self._calendar: Optional[TradingCalendar] = None
         
         if self.dart_api_key:
             try:
@@ -153,7 +160,8 @@ class DataCollector:
         self, 
         code: str, 
         start_date: date, 
-        end_date: date
+        end_date: date,
+        lookback_start: Optional[date] = None
     ) -> Tuple[int, int, int]:
         """
         일봉 데이터 수집 및 이동평균선 계산
@@ -162,38 +170,42 @@ class DataCollector:
             code: 종목코드
             start_date: 시작일
             end_date: 종료일
+            lookback_start: 지정 시 이 날짜부터 조회해 전일대비/이동평균 계산에만 사용,
+                저장은 start_date부터 (누락 거래일만 수집할 때 첫날부터 전일대비/이동평균이
+                비지 않도록 start_date 이전 max(MA_WINDOWS) - 1 거래일부터 지정)
             
         Returns:
             (total_count, success_count, failed_count)
         """
         logger.info(f"📈 Collecting daily prices for {code} ({start_date} ~ {end_date})...")
+        self.last_error = None
         
         total_count = 0
         success_count = 0
         failed_count = 0
+        inserted_dates: List[date] = []  # 커밋된 신규 저장일 (보유 현황 갱신용)
+        pending_dates: List[date] = []
         
         try:
             # FinanceDataReader로 일봉 데이터 가져오기
-            df = fdr.DataReader(code, start_date, end_date)
+            df = fdr.DataReader(code, min(lookback_start or start_date, start_date), end_date)
             
             if df is None or df.empty:
                 logger.warning(f"   No data found for {code}")
                 return 0, 0, 0
             
-            total_count = len(df)
-            
             # 이동평균선 계산
-            df['MA5'] = df['Close'].rolling(window=5).mean()
-            df['MA10'] = df['Close'].rolling(window=10).mean()
-            df['MA20'] = df['Close'].rolling(window=20).mean()
-            df['MA60'] = df['Close'].rolling(window=60).mean()
-            df['MA120'] = df['Close'].rolling(window=120).mean()
-            df['MA180'] = df['Close'].rolling(window=180).mean()
+            for window in MA_WINDOWS:
+                df[f'MA{window}'] = df['Close'].rolling(window=window).mean()
             
             # 전일대비 계산
             df['Change'] = df['Close'].diff()
             df['ChangePercent'] = (df['Change'] / df['Close'].shift(1)) * 100
             
+            # 계산용으로만 조회한 앞부분 제외
+            df = df[df.index >= pd.Timestamp(start_date)]
+            total_count = len(df)
+            
             # DB에 저장
             for date_idx, row in df.iterrows():
                 try:
@@ -240,21 +252,27 @@ class DataCollector:
                             ma180=float(row['MA180']) if pd.notna(row['MA180']) else None,
                         )
                         self.db.add(daily_price)
+                        pending_dates.append(trade_date)
                     
                     success_count += 1
                     
                     # 배치 커밋 (100개마다)
                     if success_count % 100 == 0:
                         self.db.commit()
+                        inserted_dates.extend(pending_dates)
+                        pending_dates.clear()
                         logger.info(f"   Progress: {success_count}/{total_count}")
                     
                 except Exception as e:
                     logger.error(f"   ❌ Failed to save daily price for {code} on {trade_date}: {e}")
                     self.db.rollback()
+                    pending_dates.clear()
+                    self.last_error = e
                     failed_count += 1
             
             # 최종 커밋
             self.db.commit()
+            inserted_dates.extend(pending_dates)
             logger.info(f"✅ Daily prices collection completed: {success_count}/{total_count} succeeded")
             
             # 메모리 정리
@@ -263,10 +281,27 @@ class DataCollector:
         except Exception as e:
             logger.error(f"❌ Daily prices collection failed for {code}: {e}", exc_info=True)
             self.db.rollback()
+            self.last_error = e
             failed_count = total_count
         
+        # 중간 배치까지 커밋된 경우에도 반영
+        self._update_coverage(code, inserted_dates)
         return total_count, success_count, failed_count
     
+    def _update_coverage(self, code: str, inserted_dates: List[date]):
+        """신규 저장일을 종목별 보유 현황(price_coverage)에 반영"""
+        if not inserted_dates:
+            return
+        try:
+            if self._calendar is None:
+                self._calendar = TradingCalendar.load(self.db)
+            record_inserted(self.db, code, inserted_dates, self._calendar)
+            self.db.commit()
+        except Exception as e:
+            # 일봉 저장은 이미 커밋됨 → 현황만 어긋남 (POST /api/financial/coverage/rebuild로 재계산)
+            logger.error(f"   ❌ Failed to update price coverage for {code}: {e}")
+            self.db.rollback()
+    
     # ============================================
     # 재무제표 수집
     # ============================================
@@ -288,8 +323,10 @@ class DataCollector:
         Returns:
             (total_count, success_count, failed_count)
         """
+        self.last_error = None
         if not self.dart:
             logger.error("❌ OpenDartReader not initialized")
+            self.last_error = RuntimeError("OpenDartReader not initialized (DART_API_KEY)")
             return 0, 0, 1
         
         logger.info(f"📊 Collecting financial statements for {code} ({year}Q{quarter or 'Annual'})...")
@@ -315,6 +352,7 @@ class DataCollector:
             
             if not financial_data:
                 logger.warning(f"   Failed to parse financial data for {code}")
+                self.last_error = ValueError("Failed to parse financial statement")
                 return total_count, 0, 1
             
             # DB에 저장 (upsert)
@@ -353,6 +391,7 @@ class DataCollector:
         except Exception as e:
             logger.error(f"❌ Financial statement collection failed for {code}: {e}", exc_info=True)
             self.db.rollback()
+            self.last_error = e
             failed_count = 1
         
         return total_count, success_count, failed_count
@@ -456,9 +495,10 @@ class DataCollector:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         started_at: Optional[datetime] = None,
-        completed_at: Optional[datetime] = None
+        completed_at: Optional[datetime] = None,
+        job_run_id: Optional[int] = None
     ) -> int:
-        """데이터 수집 로그 생성"""
+        """데이터 수집 로그 생성 (error_message는 컬럼 길이에 맞춰 자름)"""
         try:
             log = DataCollectionLog(
                 collection_type=collection_type,
@@ -466,7 +506,8 @@ class DataCollector:
                 total_count=total_count,
                 success_count=success_count,
                 failed_count=failed_count,
-                error_message=error_message,
+                error_message=error_message[:500] if error_message else None,
+                job_run_id=job_run_id,
                 start_date=start_date,
                 end_date=end_date,
                 started_at=started_at or datetime.utcnow(),
@@ -1,21 +1,42 @@
 # central-backend/app/services/data_scheduler.py
 """
 데이터 수집 스케줄러
-- 매일 오후 5시: 일봉 데이터 업데이트
+- 거래일 오후 5시: 일봉 데이터 업데이트 (종목별 누락 거래일만 수집, 휴장일은 건너뜀)
+  - 종목별 마지막 저장일은 보유 현황(price_coverage)에서 조회 (daily_prices 전체 집계 없음)
 - 분기별 (4월, 7월, 10월, 2월): 재무제표 업데이트
+- 5분마다: 부분 실패한 실행의 실패 종목만 재수집 (COLLECTION_RETRY_DELAY_MINUTES 경과 후)
+- 예약 실행은 리더 임대를 가진 인스턴스에서만 (수동 트리거는 run_now_* / API)
+- 모든 실행은 작업 잠금 + 실행 기록 (job_runs) 경유 → 같은 작업 중복 실행 방지, 진행 상황 조회
 """
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, date, timedelta
-from sqlalchemy.orm import Session
+from functools import partial
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, aliased
+from typing import Dict, List, Tuple
+import json
 import logging
+import time
 
+from app.core.config import settings
 from app.core.database import SessionLocal
-from app.services.data_collector import DataCollector
+from app.core.metrics import record_collection
+from app.models.financial_data import DailyPrice, PriceCoverage
+from app.models.scheduler import JobRun, JobRunFailure, JobRunStatus
+from app.services.data_collector import MA_WINDOWS, DataCollector
+from app.services.job_runs import JOB_DAILY_PRICES, JOB_FINANCIAL_STATEMENTS, JobRunTracker, run_job
+from app.services.leader_lease import leader_only
+from app.services.price_coverage import rebuild_coverage, record_deleted_before
 from app.services.stock_service import StockService
+from app.services.trading_calendar import KST, TradingCalendar
 
 logger = logging.getLogger(__name__)
 
+# 일봉 보존 기간 (롤링 윈도우, 신규 종목 최초 수집 범위)
+PRICE_RETENTION_DAYS = 730
+
 
 class DataScheduler:
     """데이터 수집 스케줄러"""
@@ -32,7 +53,7 @@ class DataScheduler:
         
         # 매일 오후 5시: 일봉 데이터 업데이트
         self.scheduler.add_job(
-            func=self.update_daily_prices,
+            func=leader_only(self.scheduled_daily_prices),
             trigger=CronTrigger(hour=17, minute=0),  # 17:00 (5 PM)
             id='daily_prices_update',
             name='일봉 데이터 업데이트',
@@ -42,7 +63,7 @@ class DataScheduler:
         
         # 분기별 재무제표 업데이트 (4월, 7월, 10월, 2월 1일 오후 6시)
         self.scheduler.add_job(
-            func=self.update_financial_statements,
+            func=leader_only(self.scheduled_financial_statements),
             trigger=CronTrigger(month='2,4,7,10', day=1, hour=18, minute=0),  # 분기 첫날 18:00
             id='financial_statements_update',
             name='재무제표 업데이트',
@@ -50,6 +71,18 @@ class DataScheduler:
         )
         logger.info("✅ Scheduled: 재무제표 업데이트 (2월, 4월, 7월, 10월 1일 18:00)")
         
+        # 부분 실패 실행의 실패 종목 재수집
+        self.scheduler.add_job(
+            func=leader_only(self.retry_partial_runs),
+            trigger=IntervalTrigger(minutes=5),
+            id='collection_retry',
+            name='실패 종목 재수집',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        logger.info(f"✅ Scheduled: 실패 종목 재수집 (부분 실패 {settings.COLLECTION_RETRY_DELAY_MINUTES}분 후)")
+        
         # 스케줄러 시작
         self.scheduler.start()
         self.is_running = True
@@ -65,13 +98,36 @@ class DataScheduler:
         self.is_running = False
         logger.info("🛑 Data collection scheduler stopped")
     
-    def update_daily_prices(self):
+    def scheduled_daily_prices(self):
+        """예약 실행 (휴장일 / 이미 실행 중이면 건너뜀)"""
+        db: Session = SessionLocal()
+        try:
+            calendar = TradingCalendar.load(db)
+        finally:
+            db.close()
+        
+        today = datetime.now(KST).date()
+        if not calendar.is_trading_day(today):
+            logger.info(f"📅 {today} is not a trading day - skipping daily prices update")
+            return
+        run_job(JOB_DAILY_PRICES, self.update_daily_prices)
+    
+    def scheduled_financial_statements(self):
+        """예약 실행 (이미 실행 중이면 건너뜀)"""
+        run_job(JOB_FINANCIAL_STATEMENTS, self.update_financial_statements)
+    
+    def update_daily_prices(self, run: JobRunTracker):
         """
         일봉 데이터 업데이트 (전체 종목)
-        - 매일 오후 5시 실행
-        - 전일 데이터만 수집 (효율성)
+        - 거래일 오후 5시 실행
+        - 종목별 마지막 저장일 다음 거래일 ~ 마지막 마감 거래일만 수집 (연휴 뒤에도 누락 없음)
+          (직전 거래일까지 조회해 첫날 전일대비 계산, 저장은 누락일만)
+        - 이미 최신인 종목은 요청하지 않음, 데이터가 없는 종목은 보존 기간 전체 수집
+        - 진행 상황 / 결과는 run(job_runs)에 기록
         """
         logger.info("📈 Starting scheduled daily prices update...")
+        started = time.monotonic()
+        started_at = datetime.utcnow()
         
         db: Session = SessionLocal()
         try:
@@ -81,27 +137,50 @@ class DataScheduler:
             # 전체 활성 종목 조회
             stocks = stock_service.get_all_stocks(is_active=True, limit=10000)
             logger.info(f"   Found {len(stocks)} active stocks")
+            run.set_total(len(stocks))
             
-            # 전일 데이터만 수집 (효율성 개선)
-            # 주말/공휴일 대비 최근 3일 범위로 수집 (실제 거래일만 저장됨)
-            end_date = date.today()
-            start_date = end_date - timedelta(days=3)  # 최근 3일
+            # 거래일 기준 수집 범위
+            calendar = TradingCalendar.load(db)
+            end_date = calendar.last_completed_trading_day()
+            retention_start = end_date - timedelta(days=PRICE_RETENTION_DAYS)
+            latest = self._load_last_dates(db, calendar)
             
             total_count = 0
             success_count = 0
             failed_count = 0
+            up_to_date = 0
+            start_date = None
             
             # 각 종목별 수집
             for idx, stock in enumerate(stocks):
+                earliest = max(retention_start, stock.listed_date or retention_start)
+                missing = calendar.missing_trading_days(latest.get(stock.code), end_date, earliest)
+                if not missing:
+                    up_to_date += 1
+                    run.advance(item=stock.code)
+                    continue
+                
+                start_date = min(start_date or missing[0], missing[0])
+                # 앞선 거래일도 조회 → 첫 누락일의 전일대비/MA180까지 계산 (저장은 누락일만)
+                lookback_start = calendar.trading_days_before(missing[0], max(MA_WINDOWS) - 1)
+                retry_params = {
+                    "start_date": missing[0].isoformat(),
+                    "end_date": missing[-1].isoformat(),
+                    "lookback_start": lookback_start.isoformat(),
+                }
                 try:
                     t, s, f = collector.collect_daily_prices(
                         stock.code, 
-                        start_date, 
-                        end_date
+                        missing[0], 
+                        missing[-1],
+                        lookback_start=lookback_start
                     )
                     total_count += t
                     success_count += s
                     failed_count += f
+                    if f:
+                        run.record_failure(stock.code, collector.last_error, failed=f, params=retry_params)
+                    run.advance(success=s, failed=f, item=stock.code)
                     
                     # 진행상황 로그 (100개마다)
                     if (idx + 1) % 100 == 0:
@@ -110,6 +189,8 @@ class DataScheduler:
                 except Exception as e:
                     logger.error(f"   Failed to update {stock.code}: {e}")
                     failed_count += 1
+                    run.record_failure(stock.code, e, params=retry_params)
+                    run.advance(failed=1, item=stock.code)
             
             # 수집 로그 기록
             status = "success" if failed_count == 0 else ("partial" if success_count > 0 else "failed")
@@ -119,29 +200,41 @@ class DataScheduler:
                 total_count=total_count,
                 success_count=success_count,
                 failed_count=failed_count,
+                error_message=run.failure_summary(),
                 start_date=start_date,
                 end_date=end_date,
-                started_at=datetime.now(),
-                completed_at=datetime.now()
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+                job_run_id=run.run_id
             )
             
-            logger.info(f"✅ Daily prices update completed: {success_count}/{total_count} succeeded")
+            record_collection("daily_prices", status, success_count, failed_count, time.monotonic() - started)
+            logger.info(
+                f"✅ Daily prices update completed: {success_count}/{total_count} succeeded "
+                f"({up_to_date} stocks already up to date through {end_date})"
+            )
             
             # 1년 이상 오래된 데이터 자동 삭제
             self._cleanup_old_data(db)
+            run.finish(status, f"{success_count}/{total_count} succeeded, {up_to_date} stocks already up to date")
             
         except Exception as e:
+            record_collection("daily_prices", "error", 0, 0, time.monotonic() - started)
             logger.error(f"❌ Daily prices update failed: {e}", exc_info=True)
+            run.finish("failed", f"{type(e).__name__}: {e}")
         finally:
             db.close()
     
-    def update_financial_statements(self):
+    def update_financial_statements(self, run: JobRunTracker):
         """
         재무제표 업데이트 (전체 종목)
         - 분기별 실행 (2월, 4월, 7월, 10월)
         - 직전 분기 재무제표 수집
+        - 진행 상황 / 결과는 run(job_runs)에 기록
         """
         logger.info("📊 Starting scheduled financial statements update...")
+        started = time.monotonic()
+        started_at = datetime.utcnow()
         
         db: Session = SessionLocal()
         try:
@@ -166,10 +259,13 @@ class DataScheduler:
             
             if current_month not in quarter_map:
                 logger.warning(f"   Not a scheduled month for financial statements: {current_month}")
+                run.finish("success", f"Not a scheduled month ({current_month}) - nothing to collect")
                 return
             
             year, quarter = quarter_map[current_month]
             logger.info(f"   Collecting financial statements for {year}Q{quarter}")
+            run.set_total(len(stocks))
+            retry_params = {"year": year, "quarter": quarter}
             
             total_count = 0
             success_count = 0
@@ -186,18 +282,22 @@ class DataScheduler:
                     total_count += t
                     success_count += s
                     failed_count += f
+                    if f:
+                        run.record_failure(stock.code, collector.last_error, failed=f, params=retry_params)
+                    run.advance(success=s, failed=f, item=stock.code)
                     
                     # 진행상황 로그 (100개마다)
                     if (idx + 1) % 100 == 0:
                         logger.info(f"   Progress: {idx + 1}/{len(stocks)} stocks processed")
                     
                     # API Rate Limit 방지 (DART API는 초당 제한이 있음)
-                    import time
                     time.sleep(0.1)  # 100ms 대기
                     
                 except Exception as e:
                     logger.error(f"   Failed to update {stock.code}: {e}")
                     failed_count += 1
+                    run.record_failure(stock.code, e, params=retry_params)
+                    run.advance(failed=1, item=stock.code)
             
             # 수집 로그 기록
             status = "success" if failed_count == 0 else ("partial" if success_count > 0 else "failed")
@@ -207,26 +307,157 @@ class DataScheduler:
                 total_count=total_count,
                 success_count=success_count,
                 failed_count=failed_count,
-                started_at=datetime.now(),
-                completed_at=datetime.now()
+                error_message=run.failure_summary(),
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+                job_run_id=run.run_id
             )
             
+            record_collection("financial_statements", status, success_count, failed_count, time.monotonic() - started)
             logger.info(f"✅ Financial statements update completed: {success_count}/{total_count} succeeded")
+            run.finish(status, f"{success_count}/{total_count} succeeded")
             
         except Exception as e:
+            record_collection("financial_statements", "error", 0, 0, time.monotonic() - started)
             logger.error(f"❌ Financial statements update failed: {e}", exc_info=True)
+            run.finish("failed", f"{type(e).__name__}: {e}")
         finally:
             db.close()
     
+    def retry_failed_items(self, run: JobRunTracker, source_run_id: int):
+        """
+        이전 실행에서 실패한 종목만 같은 파라미터(수집 기간 / 연도·분기)로 재수집
+        - 원 작업과 같은 잠금 / 수집 경로 사용, 여기서 다시 실패한 종목은 run에 기록 (다음 재수집 대상)
+        """
+        logger.info(f"🔁 Retrying failed items of job run {source_run_id} ({run.job_name})...")
+        started = time.monotonic()
+        started_at = datetime.utcnow()
+        metric_job = f"{run.job_name}_retry"
+        
+        db: Session = SessionLocal()
+        try:
+            collector = DataCollector(db)
+            targets = self._load_retry_targets(db, source_run_id)
+            logger.info(f"   {len(targets)} failed items to retry")
+            run.set_total(len(targets))
+            
+            total_count = 0
+            success_count = 0
+            failed_count = 0
+            
+            for code, params in targets:
+                try:
+                    if run.job_name == JOB_DAILY_PRICES:
+                        lookback_start = params.get("lookback_start")
+                        t, s, f = collector.collect_daily_prices(
+                            code,
+                            date.fromisoformat(params["start_date"]),
+                            date.fromisoformat(params["end_date"]),
+                            lookback_start=date.fromisoformat(lookback_start) if lookback_start else None
+                        )
+                    else:
+                        t, s, f = collector.collect_financial_statements(code, params["year"], params["quarter"])
+                        time.sleep(0.1)  # DART API Rate Limit
+                    total_count += t
+                    success_count += s
+                    failed_count += f
+                    if f:
+                        run.record_failure(code, collector.last_error, failed=f, params=params)
+                    run.advance(success=s, failed=f, item=code)
+                    
+                except Exception as e:
+                    logger.error(f"   Failed to retry {code}: {e}")
+                    failed_count += 1
+                    run.record_failure(code, e, params=params)
+                    run.advance(failed=1, item=code)
+            
+            status = "success" if failed_count == 0 else ("partial" if success_count > 0 else "failed")
+            collection_type = "daily_price_retry" if run.job_name == JOB_DAILY_PRICES else "financial_statement_retry"
+            collector.create_collection_log(
+                collection_type=collection_type,
+                status=status,
+                total_count=total_count,
+                success_count=success_count,
+                failed_count=failed_count,
+                error_message=run.failure_summary(),
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+                job_run_id=run.run_id
+            )
+            
+            record_collection(metric_job, status, success_count, failed_count, time.monotonic() - started)
+            logger.info(f"✅ Retry of job run {source_run_id} completed: {len(targets) - run.failed_items}/{len(targets)} items recovered")
+            run.finish(status, f"Retried {len(targets)} items of run {source_run_id}, {run.failed_items} still failing")
+            
+        except Exception as e:
+            record_collection(metric_job, "error", 0, 0, time.monotonic() - started)
+            logger.error(f"❌ Retry of job run {source_run_id} failed: {e}", exc_info=True)
+            run.finish("failed", f"{type(e).__name__}: {e}")
+        finally:
+            db.close()
+    
+    def _load_retry_targets(self, db: Session, source_run_id: int) -> List[Tuple[str, Dict]]:
+        """실패 항목 → (종목코드, 파라미터) 목록 (중복 제거, 기록 순서 유지)"""
+        targets: Dict[Tuple[str, str], Dict] = {}
+        failures = db.query(JobRunFailure.item, JobRunFailure.params).filter(
+            JobRunFailure.run_id == source_run_id
+        ).order_by(JobRunFailure.id)
+        for item, params in failures:
+            targets.setdefault((item, json.dumps(params, sort_keys=True)), params or {})
+        return [(item, params) for (item, _), params in targets.items()]
+    
+    def retry_partial_runs(self):
+        """
+        부분 실패/실패 실행 중 재수집 대상 처리 (예약 실행)
+        - 종료 후 COLLECTION_RETRY_DELAY_MINUTES 경과, 최근 하루 이내
+        - 아직 재수집되지 않았고 재수집 차수 < COLLECTION_RETRY_MAX_ATTEMPTS
+        """
+        now = datetime.utcnow()
+        retried = aliased(JobRun)
+        
+        db: Session = SessionLocal()
+        try:
+            sources = db.query(JobRun.id, JobRun.job_name, JobRun.retry_attempt).filter(
+                JobRun.job_name.in_([JOB_DAILY_PRICES, JOB_FINANCIAL_STATEMENTS]),
+                JobRun.status.in_([JobRunStatus.PARTIAL, JobRunStatus.FAILED]),
+                JobRun.failed_items > 0,
+                JobRun.finished_at <= now - timedelta(minutes=settings.COLLECTION_RETRY_DELAY_MINUTES),
+                JobRun.finished_at >= now - timedelta(days=1),
+                func.coalesce(JobRun.retry_attempt, 0) < settings.COLLECTION_RETRY_MAX_ATTEMPTS,
+                ~exists().where(retried.retry_of_run_id == JobRun.id)
+            ).order_by(JobRun.id).all()
+        finally:
+            db.close()
+        
+        for source_id, job_name, attempt in sources:
+            run_job(
+                job_name,
+                partial(self.retry_failed_items, source_run_id=source_id),
+                trigger="retry",
+                params={"retry_of": source_id},
+                retry_of_run_id=source_id,
+                retry_attempt=(attempt or 0) + 1
+            )
+    
     def run_now_daily_prices(self):
-        """일봉 데이터 즉시 실행 (테스트용)"""
+        """일봉 데이터 즉시 실행 (테스트용 - 실행 중이면 건너뜀)"""
         logger.info("🔧 Running daily prices update immediately...")
-        self.update_daily_prices()
+        return run_job(JOB_DAILY_PRICES, self.update_daily_prices, trigger="manual")
     
     def run_now_financial_statements(self):
-        """재무제표 즉시 실행 (테스트용)"""
+        """재무제표 즉시 실행 (테스트용 - 실행 중이면 건너뜀)"""
         logger.info("🔧 Running financial statements update immediately...")
-        self.update_financial_statements()
+        return run_job(JOB_FINANCIAL_STATEMENTS, self.update_financial_statements, trigger="manual")
+    
+    def _load_last_dates(self, db: Session, calendar: TradingCalendar) -> Dict[str, date]:
+        """종목별 마지막 저장일 (보유 현황이 비어 있는데 일봉이 있으면 먼저 재계산)"""
+        latest = dict(db.query(PriceCoverage.code, PriceCoverage.last_date).all())
+        if not latest and db.query(DailyPrice.id).first():
+            logger.warning("   Price coverage is empty - rebuilding from daily_prices")
+            rebuild_coverage(db, calendar)
+            db.commit()
+            latest = dict(db.query(PriceCoverage.code, PriceCoverage.last_date).all())
+        return latest
     
     def _cleanup_old_data(self, db: Session):
         """
@@ -235,14 +466,21 @@ class DataScheduler:
         - 2년치 데이터만 유지 (롤링 윈도우)
         """
         try:
-            from app.models.financial_data import DailyPrice
+            cutoff_date = date.today() - timedelta(days=PRICE_RETENTION_DAYS)  # 2년 = 730일
             
-            cutoff_date = date.today() - timedelta(days=730)  # 2년 = 730일
+            # 삭제 대상 종목별 건수 (보유 현황 갱신용, 삭제 범위만 집계)
+            deleted_counts = dict(
+                db.query(DailyPrice.code, func.count(DailyPrice.id))
+                .filter(DailyPrice.date < cutoff_date)
+                .group_by(DailyPrice.code)
+                .all()
+            )
             
             # 2년 이상 오래된 데이터 삭제
             deleted_count = db.query(DailyPrice).filter(
                 DailyPrice.date < cutoff_date
             ).delete()
+            record_deleted_before(db, cutoff_date, deleted_counts, TradingCalendar.load(db))
             
             db.commit()
             
@@ -0,0 +1,334 @@
+# central-backend/app/services/job_runs.py
+"""
+작업 실행 기록 + 작업별 분산 잠금
+- 같은 작업(예: 전체 종목 일봉 수집)은 모든 인스턴스를 통틀어 동시에 1건만 실행
+  - PostgreSQL: 세션 advisory lock (전용 커넥션 유지, 프로세스 종료 시 자동 해제)
+  - 그 외 DB: scheduler_leases 행 임대 (하트비트 갱신, 중단 시 JOB_LOCK_TTL_SECONDS 후 해제)
+- 이미 실행 중이면 JobAlreadyRunningError (실행 중인 run_id 포함) → API는 409
+- 실행 1회 = job_runs 1행: 진행 상황(처리 수 / 처리 속도 / ETA)을 JOB_PROGRESS_INTERVAL_SECONDS 간격으로 기록
+  → run_id로 조회 / SSE 스트림
+- 종목별 실패는 job_run_failures에 예외 클래스와 함께 기록 (부분 실패 원인 / 재수집 대상)
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+import logging
+import time
+import uuid
+import zlib
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models.scheduler import JobRun, JobRunFailure, JobRunStatus
+from app.services.agent_bus import WORKER_ID
+from app.services.leader_lease import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+JOB_DAILY_PRICES = "daily_prices"
+JOB_FINANCIAL_STATEMENTS = "financial_statements"
+
+_ERROR_MESSAGE_LIMIT = 2000
+
+# 수집 로그 상태 → 실행 상태
+_COLLECTION_STATUS = {
+    "success": JobRunStatus.SUCCEEDED,
+    "partial": JobRunStatus.PARTIAL,
+    "failed": JobRunStatus.FAILED,
+}
+
+
+class JobAlreadyRunningError(RuntimeError):
+    """같은 작업이 다른 곳에서 실행 중"""
+
+    def __init__(self, job_name: str, run_id: Optional[int]):
+        super().__init__(f"Job '{job_name}' is already running (run_id={run_id})")
+        self.job_name = job_name
+        self.run_id = run_id
+
+
+class JobLock:
+    """작업 이름 단위 분산 잠금 (획득한 스레드와 무관하게 release 가능)"""
+
+    def __init__(self, job_name: str):
+        self.job_name = job_name
+        self._connection = None
+        self._lease: Optional[LeaderLease] = None
+
+    @property
+    def key(self) -> int:
+        return zlib.crc32(f"job:{self.job_name}".encode())
+
+    def acquire(self) -> bool:
+        """잠금 시도 (대기하지 않음)"""
+        if engine.dialect.name == "postgresql":
+            connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            try:
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+                ).scalar()
+            except Exception:
+                connection.close()
+                raise
+            if not acquired:
+                connection.close()
+                return False
+            self._connection = connection
+            return True
+
+        lease = LeaderLease(
+            f"job:{self.job_name}", settings.JOB_LOCK_TTL_SECONDS,
+            holder=f"{WORKER_ID}:{uuid.uuid4().hex[:8]}"
+        )
+        lease.start()
+        if not lease.is_leader:
+            lease.stop()
+            return False
+        self._lease = lease
+        return True
+
+    def release(self):
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            except Exception as e:
+                logger.warning(f"Failed to release job lock '{self.job_name}': {e}")
+            finally:
+                self._connection.close()
+                self._connection = None
+        if self._lease is not None:
+            self._lease.stop()
+            self._lease = None
+
+
+class JobRunTracker:
+    """
+    실행 중인 작업의 기록 갱신
+    - 진행 상황 / 실패 항목은 메모리에 누적, JOB_PROGRESS_INTERVAL_SECONDS마다 별도 세션으로 기록
+      (수집 세션의 커밋/롤백과 무관)
+    - finish() 또는 close()에서 잠금 해제
+    """
+
+    def __init__(self, run_id: int, job_name: str, lock: JobLock):
+        self.run_id = run_id
+        self.job_name = job_name
+        self.lock = lock
+        self.total_items: Optional[int] = None
+        self.processed_items = 0
+        self.failed_items = 0
+        self.current_item: Optional[str] = None
+        self.success_count = 0
+        self.failed_count = 0
+        self.error_classes: Counter = Counter()
+        self.finished = False
+        self._started = time.monotonic()
+        self._last_flush = self._started
+        self._pending_failures: List[dict] = []
+
+    def set_total(self, total_items: int):
+        self.total_items = total_items
+        self._flush()
+
+    def advance(self, success: int = 0, failed: int = 0, items: int = 1, item: Optional[str] = None):
+        """처리 대상 1개(종목) 완료"""
+        self.processed_items += items
+        self.success_count += success
+        self.failed_count += failed
+        if item is not None:
+            self.current_item = item
+        if time.monotonic() - self._last_flush >= settings.JOB_PROGRESS_INTERVAL_SECONDS:
+            self._flush()
+
+    def record_failure(
+        self,
+        item: str,
+        error: Optional[BaseException],
+        failed: int = 1,
+        params: Optional[Dict[str, Any]] = None
+    ):
+        """
+        항목(종목) 실패 기록 (다음 진행 상황 기록 시 함께 저장)
+
+        Args:
+            error: 원인 예외 (알 수 없으면 None)
+            failed: 이 항목에서 실패한 건수
+            params: 같은 항목만 다시 수집할 때 필요한 값 (수집 기간 등, JSON 직렬화 가능)
+        """
+        error_class = type(error).__name__ if error is not None else "Unknown"
+        self.failed_items += 1
+        self.error_classes[error_class] += 1
+        self._pending_failures.append({
+            "run_id": self.run_id,
+            "item": item,
+            "error_class": error_class,
+            "error_message": str(error)[:_ERROR_MESSAGE_LIMIT] if error is not None else None,
+            "failed_count": failed,
+            "params": params,
+        })
+
+    def failure_summary(self, limit: int = 500) -> Optional[str]:
+        """실패 요약 (수집 로그 error_message용) - 예: '12 items failed: HTTPError x10, KeyError x2'"""
+        if not self.failed_items:
+            return None
+        classes = ", ".join(f"{name} x{count}" for name, count in self.error_classes.most_common())
+        return f"{self.failed_items} items failed: {classes} (job run {self.run_id})"[:limit]
+
+    def finish(self, status: Union[str, JobRunStatus], message: Optional[str] = None):
+        """
+        최종 상태 기록 + 잠금 해제
+
+        Args:
+            status: JobRunStatus 또는 수집 로그 상태 ("success" / "partial" / "failed")
+        """
+        if self.finished:
+            return
+        if not isinstance(status, JobRunStatus):
+            status = _COLLECTION_STATUS[status]
+        self.finished = True
+        try:
+            self._flush(status=status, message=message, eta_seconds=None, finished_at=datetime.utcnow())
+        finally:
+            self.lock.release()
+        logger.info(f"Job run {self.run_id} ({self.job_name}) finished: {status.value}")
+
+    def close(self):
+        """finish 없이 끝난 경우 실패로 기록 (예외 / 중단)"""
+        if not self.finished:
+            self.finish(JobRunStatus.FAILED, "Run ended without reporting a result")
+
+    def _flush(self, **extra):
+        self._last_flush = time.monotonic()
+        elapsed = self._last_flush - self._started
+        items_per_second = self.processed_items / elapsed if elapsed > 0 and self.processed_items else None
+        eta_seconds = None
+        if items_per_second and self.total_items is not None:
+            eta_seconds = int(max(self.total_items - self.processed_items, 0) / items_per_second)
+
+        values = {
+            JobRun.total_items: self.total_items,
+            JobRun.processed_items: self.processed_items,
+            JobRun.failed_items: self.failed_items,
+            JobRun.current_item: self.current_item,
+            JobRun.success_count: self.success_count,
+            JobRun.failed_count: self.failed_count,
+            JobRun.items_per_second: round(items_per_second, 3) if items_per_second else None,
+            JobRun.eta_seconds: eta_seconds,
+            JobRun.heartbeat_at: datetime.utcnow(),
+        }
+        values.update({getattr(JobRun, key): value for key, value in extra.items()})
+
+        failures, self._pending_failures = self._pending_failures, []
+        db = SessionLocal()
+        try:
+            db.query(JobRun).filter(JobRun.id == self.run_id).update(values, synchronize_session=False)
+            if failures:
+                db.bulk_insert_mappings(JobRunFailure, failures)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._pending_failures[:0] = failures  # 다음 기록 때 다시 시도
+            logger.warning(f"Failed to record progress for job run {self.run_id}: {e}")
+        finally:
+            db.close()
+
+
+def get_active_run_id(db, job_name: str) -> Optional[int]:
+    row = db.query(JobRun.id).filter(
+        JobRun.job_name == job_name,
+        JobRun.status == JobRunStatus.RUNNING
+    ).order_by(JobRun.id.desc()).first()
+    return row[0] if row else None
+
+
+def begin_run(
+    job_name: str,
+    trigger: str = "scheduled",
+    params: Optional[Dict[str, Any]] = None,
+    retry_of_run_id: Optional[int] = None,
+    retry_attempt: int = 0
+) -> JobRunTracker:
+    """
+    잠금 획득 + 실행 기록 생성 (재수집 실행도 원 작업과 같은 잠금 사용)
+
+    Raises:
+        JobAlreadyRunningError: 같은 작업이 실행 중
+    """
+    lock = JobLock(job_name)
+    if not lock.acquire():
+        db = SessionLocal()
+        try:
+            raise JobAlreadyRunningError(job_name, get_active_run_id(db, job_name))
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    try:
+        # 잠금을 가졌으므로 남아 있는 RUNNING 기록은 중단된 실행 (프로세스 종료 등)
+        db.query(JobRun).filter(
+            JobRun.job_name == job_name,
+            JobRun.status == JobRunStatus.RUNNING
+        ).update({
+            JobRun.status: JobRunStatus.FAILED,
+            JobRun.message: "Abandoned (worker stopped before finishing)",
+            JobRun.finished_at: datetime.utcnow(),
+        }, synchronize_session=False)
+
+        run = JobRun(
+            job_name=job_name,
+            status=JobRunStatus.RUNNING,
+            trigger=trigger,
+            holder=WORKER_ID,
+            params=params,
+            retry_of_run_id=retry_of_run_id,
+            retry_attempt=retry_attempt,
+            heartbeat_at=datetime.utcnow(),
+        )
+        db.add(run)
+        db.commit()
+        run_id = run.id
+    except Exception:
+        db.rollback()
+        lock.release()
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"Job run {run_id} ({job_name}) started [{trigger}]")
+    return JobRunTracker(run_id, job_name, lock)
+
+
+def execute_run(run: JobRunTracker, func: Callable[[JobRunTracker], Any]):
+    """func(run) 실행 후 결과 미기록 시 실패 처리 (항상 잠금 해제)"""
+    try:
+        return func(run)
+    except Exception as e:
+        logger.error(f"Job run {run.run_id} ({run.job_name}) failed: {e}", exc_info=True)
+        run.finish(JobRunStatus.FAILED, f"{type(e).__name__}: {e}")
+    finally:
+        run.close()
+
+
+def run_job(
+    job_name: str,
+    func: Callable[[JobRunTracker], Any],
+    trigger: str = "scheduled",
+    **run_options
+) -> Optional[int]:
+    """
+    예약 실행용: 잠금 획득 → 실행 → 기록 (이미 실행 중이면 건너뜀)
+
+    Args:
+        run_options: begin_run 인자 (params / retry_of_run_id / retry_attempt)
+
+    Returns:
+        run_id (건너뛴 경우 None)
+    """
+    try:
+        run = begin_run(job_name, trigger=trigger, **run_options)
+    except JobAlreadyRunningError as e:
+        logger.warning(f"Skipping {trigger} run of '{job_name}': run {e.run_id} is still in progress")
+        return None
+    execute_run(run, func)
+    return run.run_id
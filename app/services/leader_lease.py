@@ -0,0 +1,146 @@
+# central-backend/app/services/leader_lease.py
+"""
+DB 기반 리더 임대 (예약 작업 단일 실행)
+- 모든 인스턴스가 같은 스케줄을 등록하지만 임대를 가진 인스턴스만 실제로 실행
+- 하트비트 스레드가 TTL/3 마다 임대 갱신 (UPDATE 1회)
+  - 만료된 임대는 다른 인스턴스가 인계 → 리더 장애 시 최대 TTL 후 자동 전환
+  - DB 장애로 갱신하지 못하면 로컬에서도 TTL 경과 후 리더가 아닌 것으로 간주
+- 정상 종료 시 임대 반납 → 다른 인스턴스가 바로 인계
+"""
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
+from sqlalchemy import case, or_
+
+from app.core.config import settings
+from app.core.database import SessionLocal, insert_ignore
+from app.models.scheduler import SchedulerLease
+from app.services.agent_bus import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLease:
+    """이름 단위 리더 임대"""
+
+    def __init__(self, name: str, ttl_seconds: float, holder: str = WORKER_ID):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = holder
+        self._valid_until = 0.0  # time.monotonic() 기준
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def renew(self) -> bool:
+        """임대 획득/갱신 시도 (보유 중이거나 만료된 경우에만 성공)"""
+        started = time.monotonic()
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        was_leader = self.is_leader
+
+        db = SessionLocal()
+        try:
+            updated = db.query(SchedulerLease).filter(
+                SchedulerLease.name == self.name,
+                or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+            ).update({
+                SchedulerLease.acquired_at: case(
+                    (SchedulerLease.holder == self.holder, SchedulerLease.acquired_at), else_=now
+                ),
+                SchedulerLease.holder: self.holder,
+                SchedulerLease.renewed_at: now,
+                SchedulerLease.expires_at: expires_at,
+            }, synchronize_session=False)
+
+            if not updated:
+                # 첫 실행: 행이 없으면 생성 (동시에 생성한 다른 인스턴스가 있으면 0건)
+                row = dict(name=self.name, holder=self.holder, acquired_at=now, renewed_at=now, expires_at=expires_at)
+                updated = insert_ignore(db, SchedulerLease, row, ["name"])
+                if updated is None:
+                    exists = db.query(SchedulerLease.name).filter(SchedulerLease.name == self.name).first()
+                    if not exists:
+                        db.add(SchedulerLease(**row))
+                    updated = 0 if exists else 1
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to renew scheduler lease '{self.name}': {e}")
+            return self.is_leader
+        finally:
+            db.close()
+
+        if updated:
+            self._valid_until = started + self.ttl_seconds
+            if not was_leader:
+                logger.info(f"👑 Acquired scheduler lease '{self.name}' (holder={self.holder})")
+        else:
+            self._valid_until = 0.0
+            if was_leader:
+                logger.warning(f"Lost scheduler lease '{self.name}' to another instance")
+        return bool(updated)
+
+    def release(self):
+        """임대 반납 (즉시 만료 처리)"""
+        self._valid_until = 0.0
+        db = SessionLocal()
+        try:
+            db.query(SchedulerLease).filter(
+                SchedulerLease.name == self.name,
+                SchedulerLease.holder == self.holder
+            ).update({SchedulerLease.expires_at: datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            logger.info(f"Released scheduler lease '{self.name}'")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to release scheduler lease '{self.name}': {e}")
+        finally:
+            db.close()
+
+    def start(self):
+        """하트비트 스레드 시작 (첫 획득 시도는 바로 실행)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.renew()
+        self._thread = threading.Thread(target=self._heartbeat_loop, name=f"lease-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """하트비트 중지 + 반납 (실행 중인 작업이 끝난 뒤 호출)"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.is_leader:
+            self.release()
+
+    def _heartbeat_loop(self):
+        interval = max(self.ttl_seconds / 3, 1.0)
+        while not self._stop.wait(interval):
+            self.renew()
+
+
+# API 워커 / 수집 워커가 공유하는 예약 작업 임대
+scheduler_lease = LeaderLease("schedulers", settings.SCHEDULER_LEASE_SECONDS)
+
+
+def leader_only(func: Callable) -> Callable:
+    """임대를 가진 인스턴스에서만 실행되도록 예약 작업 감싸기"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not scheduler_lease.is_leader:
+            logger.debug(f"Skipping {func.__name__}: not the scheduler leader")
+            return None
+        return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,156 @@
+# central-backend/app/services/price_coverage.py
+"""
+종목별 일봉 보유 현황 (price_coverage)
+- 종목당 1행: 첫/마지막 저장일, 저장 건수, 누락 거래일 (거래일 달력 기준)
+- daily_prices를 다시 읽지 않고 변경분만 반영
+  - 일봉 신규 저장 (DataCollector.collect_daily_prices) → record_inserted
+  - 보존 기간 경과 삭제 (DataScheduler._cleanup_old_data) → record_deleted_before
+  - 휴장일 등록/삭제 → record_calendar_change
+- 현황 행이 없는 종목(마이그레이션 이전 데이터)은 해당 종목만 daily_prices에서 재계산
+- 전체 재계산: rebuild_coverage (마이그레이션 / 관리 API)
+"""
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.financial_data import DailyPrice, PriceCoverage
+from app.services.trading_calendar import TradingCalendar
+
+logger = logging.getLogger(__name__)
+
+
+def _gap_set(coverage: PriceCoverage) -> Set[date]:
+    return {date.fromisoformat(day) for day in coverage.gap_dates or []}
+
+
+def _set_gaps(coverage: PriceCoverage, gaps: Iterable[date]):
+    gap_dates = sorted(gaps)
+    coverage.gap_dates = [day.isoformat() for day in gap_dates]
+    coverage.gap_count = len(gap_dates)
+
+
+def _build(code: str, dates: List[date], calendar: TradingCalendar) -> Dict:
+    """정렬된 저장일 목록 → price_coverage 행"""
+    stored = set(dates)
+    gaps = [day for day in calendar.trading_days(dates[0], dates[-1]) if day not in stored]
+    return {
+        "code": code,
+        "first_date": dates[0],
+        "last_date": dates[-1],
+        "row_count": len(stored),
+        "gap_count": len(gaps),
+        "gap_dates": [day.isoformat() for day in gaps],
+    }
+
+
+def rebuild_coverage(db: Session, calendar: TradingCalendar, codes: Optional[List[str]] = None) -> int:
+    """
+    daily_prices 전체(또는 지정 종목)를 읽어 현황 재계산 (커밋은 호출자)
+
+    Returns:
+        현황이 기록된 종목 수
+    """
+    deleted = db.query(PriceCoverage)
+    prices = db.query(DailyPrice.code, DailyPrice.date)
+    if codes is not None:
+        deleted = deleted.filter(PriceCoverage.code.in_(codes))
+        prices = prices.filter(DailyPrice.code.in_(codes))
+    deleted.delete(synchronize_session=False)
+
+    rows = [
+        _build(code, [day for _, day in group], calendar)
+        for code, group in groupby(
+            prices.order_by(DailyPrice.code, DailyPrice.date).yield_per(10000), key=itemgetter(0)
+        )
+    ]
+    if rows:
+        db.bulk_insert_mappings(PriceCoverage, rows)
+    return len(rows)
+
+
+def record_inserted(db: Session, code: str, dates: Iterable[date], calendar: TradingCalendar):
+    """
+    새로 저장된 일봉 날짜 반영 (기존 행 갱신은 현황 변화 없음, 커밋은 호출자)
+    - 범위 밖 날짜: 범위 확장 + 사이 거래일을 누락으로 추가
+    - 범위 안 날짜: 누락 목록에서 제거
+    """
+    new_dates = sorted(set(dates))
+    if not new_dates:
+        return
+
+    coverage = db.query(PriceCoverage).filter(PriceCoverage.code == code).with_for_update().first()
+    if coverage is None:
+        rebuild_coverage(db, calendar, codes=[code])
+        return
+
+    gaps = _gap_set(coverage)
+    first_date, last_date = coverage.first_date, coverage.last_date
+    for day in new_dates:
+        if day < first_date:
+            gaps.update(calendar.trading_days(day + timedelta(days=1), first_date - timedelta(days=1)))
+            first_date = day
+        elif day > last_date:
+            gaps.update(calendar.trading_days(last_date + timedelta(days=1), day - timedelta(days=1)))
+            last_date = day
+        else:
+            gaps.discard(day)
+
+    coverage.first_date = first_date
+    coverage.last_date = last_date
+    coverage.row_count += len(new_dates)
+    _set_gaps(coverage, gaps)
+
+
+def record_deleted_before(
+    db: Session,
+    cutoff: date,
+    deleted_counts: Dict[str, int],
+    calendar: TradingCalendar
+):
+    """
+    cutoff 이전 일봉 삭제 반영 (커밋은 호출자)
+
+    Args:
+        deleted_counts: 종목별 삭제 건수
+    """
+    for coverage in db.query(PriceCoverage).filter(PriceCoverage.first_date < cutoff).all():
+        remaining = coverage.row_count - deleted_counts.get(coverage.code, 0)
+        if remaining <= 0 or coverage.last_date < cutoff:
+            db.delete(coverage)
+            continue
+
+        # 새 첫 저장일 = cutoff 이후 누락이 아닌 첫 거래일
+        gaps = {day for day in _gap_set(coverage) if day >= cutoff}
+        first_date = cutoff if calendar.is_trading_day(cutoff) else calendar.next_trading_day(cutoff)
+        while first_date in gaps and first_date < coverage.last_date:
+            first_date = calendar.next_trading_day(first_date)
+
+        coverage.first_date = min(first_date, coverage.last_date)
+        coverage.row_count = remaining
+        _set_gaps(coverage, (day for day in gaps if day > coverage.first_date))
+
+
+def record_calendar_change(db: Session, day: date, is_trading_day: bool):
+    """
+    휴장일 등록/삭제 반영 (커밋은 호출자)
+    - 휴장일로 등록: 해당 날짜를 누락 목록에서 제거
+    - 휴장일 삭제 (거래일이 됨): 범위 안에 있고 일봉이 없는 종목에 누락 추가
+    """
+    if not is_trading_day:
+        day_str = day.isoformat()
+        for coverage in db.query(PriceCoverage).filter(PriceCoverage.gap_count > 0).all():
+            if day_str in coverage.gap_dates:
+                _set_gaps(coverage, _gap_set(coverage) - {day})
+        return
+
+    stored = {code for (code,) in db.query(DailyPrice.code).filter(DailyPrice.date == day)}
+    for coverage in db.query(PriceCoverage).filter(
+        PriceCoverage.first_date < day,
+        PriceCoverage.last_date > day
+    ).all():
+        if coverage.code not in stored:
+            _set_gaps(coverage, _gap_set(coverage) | {day})
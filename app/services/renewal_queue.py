@@ -0,0 +1,285 @@
+# central-backend/app/services/renewal_queue.py
+"""
+구독 갱신 결제 작업 큐
+- 만료 예정 구독을 renewal_jobs에 등록 (구독 × 결제 주기당 1건)
+- SELECT ... FOR UPDATE SKIP LOCKED로 작업 점유 → 여러 스케줄러 인스턴스가 병렬 처리
+- 실패 시 지수 백오프 재시도, 최대 시도 초과 시 DEAD
+  - 거절 확정(4xx)만 새 orderId / Idempotency-Key로 재시도 (declines 증가)
+  - 결과 불명(응답 미수신 / 5xx / 429)은 같은 키로 재요청 → 이미 결제되었으면 토스가 첫 결과 반환
+- 점유 후 오래 RUNNING인 작업은 PENDING으로 복구 (같은 Idempotency-Key로 재요청)
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import insert_ignore
+from app.core.http_client import CircuitOpenError, toss_client
+from app.models.payment import RenewalJob, RenewalJobStatus
+from app.models.user import Subscription
+from app.services.agent_bus import WORKER_ID
+from app.services.auto_payment import (
+    CHARGE_DECLINED,
+    CHARGE_SUCCEEDED,
+    apply_renewal,
+    build_renewal_request,
+    charge_billing_key,
+    renewal_cycle,
+)
+from app.services.stats_rollup import record_payment
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_due_renewals(db: Session) -> int:
+    """
+    만료 예정 구독의 갱신 작업 등록 (이미 등록된 주기는 무시)
+
+    Returns:
+        새로 등록된 작업 수
+    """
+    now = datetime.utcnow()
+    threshold_date = now + timedelta(days=settings.RENEWAL_LOOKAHEAD_DAYS)
+
+    due = db.query(Subscription.id, Subscription.expires_at).filter(
+        Subscription.auto_renew == True,
+        Subscription.billing_key.isnot(None),
+        Subscription.expires_at <= threshold_date,
+        Subscription.expires_at > now,  # Not yet expired
+        Subscription.status == "ACTIVE"
+    ).all()
+
+    if not due:
+        return 0
+
+    rows = [
+        {"subscription_id": row.id, "cycle": row.expires_at.strftime("%Y%m%d"), "next_run_at": now}
+        for row in due
+    ]
+
+    created = insert_ignore(db, RenewalJob, rows, ["subscription_id", "cycle"])
+    if created is None:
+        existing = {
+            (job.subscription_id, job.cycle)
+            for job in db.query(RenewalJob.subscription_id, RenewalJob.cycle).filter(
+                RenewalJob.subscription_id.in_([row["subscription_id"] for row in rows])
+            )
+        }
+        new_rows = [row for row in rows if (row["subscription_id"], row["cycle"]) not in existing]
+        db.add_all(RenewalJob(**row) for row in new_rows)
+        created = len(new_rows)
+
+    db.commit()
+    logger.info(f"Enqueued {created} renewal jobs ({len(due)} subscriptions due)")
+    return created
+
+
+def recover_stale_jobs(db: Session) -> int:
+    """점유한 워커가 중단된 RUNNING 작업을 PENDING으로 복구"""
+    stale_before = datetime.utcnow() - timedelta(minutes=settings.RENEWAL_STALE_MINUTES)
+
+    count = db.query(RenewalJob).filter(
+        RenewalJob.status == RenewalJobStatus.RUNNING,
+        RenewalJob.locked_at < stale_before
+    ).update({
+        RenewalJob.status: RenewalJobStatus.PENDING,
+        RenewalJob.locked_by: None,
+        RenewalJob.locked_at: None,
+    }, synchronize_session=False)
+    db.commit()
+
+    if count:
+        logger.warning(f"Recovered {count} stale renewal jobs")
+    return count
+
+
+def claim_jobs(db: Session, limit: int) -> List[RenewalJob]:
+    """
+    실행할 작업 점유
+    - 행 잠금은 점유 표시(RUNNING) 커밋까지만 유지
+    """
+    now = datetime.utcnow()
+
+    jobs = db.query(RenewalJob).filter(
+        RenewalJob.status == RenewalJobStatus.PENDING,
+        RenewalJob.next_run_at <= now
+    ).order_by(RenewalJob.next_run_at).limit(limit).with_for_update(skip_locked=True).all()
+
+    job_ids = []
+    for job in jobs:
+        job.status = RenewalJobStatus.RUNNING
+        job.locked_by = WORKER_ID
+        job.locked_at = now
+        job_ids.append(job.id)
+    db.commit()
+
+    if not job_ids:
+        return []
+    # 커밋으로 만료된 속성을 작업별 조회 대신 한 번에 다시 읽음
+    return db.query(RenewalJob).filter(RenewalJob.id.in_(job_ids)).all()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """지수 백오프 (base × 2^(attempts-1), 최대값 제한)"""
+    minutes = settings.RENEWAL_RETRY_BASE_MINUTES * (2 ** max(0, attempts - 1))
+    return timedelta(minutes=min(minutes, settings.RENEWAL_RETRY_MAX_MINUTES))
+
+
+def _finish(job: RenewalJob, status: RenewalJobStatus, error: Optional[str] = None):
+    job.status = status
+    job.last_error = error
+    job.locked_by = None
+    job.locked_at = None
+    job.completed_at = datetime.utcnow()
+
+
+def _defer(job: RenewalJob, error: str):
+    """요청하지 못한 작업 (서킷 차단) → 시도 수 증가 없이 나중에 다시 실행"""
+    job.status = RenewalJobStatus.PENDING
+    job.last_error = error
+    job.next_run_at = datetime.utcnow() + timedelta(seconds=settings.TOSS_CIRCUIT_RESET_SECONDS)
+    job.locked_by = None
+    job.locked_at = None
+
+
+def _record_failure(job: RenewalJob, error: str, declined: bool):
+    """
+    실패 기록 (백오프 후 재시도)
+
+    Args:
+        declined: 거절 확정 → 다음 시도는 새 주문. 아니면 같은 주문/키로 재요청
+    """
+    job.attempts += 1
+    if declined:
+        job.declines += 1
+    if job.attempts >= settings.RENEWAL_MAX_ATTEMPTS:
+        _finish(job, RenewalJobStatus.DEAD, error)
+        logger.error(f"💀 Renewal job {job.id} (subscription {job.subscription_id}) dead after {job.attempts} attempts")
+        # TODO: Send notification to user about payment failure
+        return
+
+    job.status = RenewalJobStatus.PENDING
+    job.last_error = error
+    job.next_run_at = datetime.utcnow() + retry_delay(job.attempts)
+    job.locked_by = None
+    job.locked_at = None
+
+
+async def process_claimed_jobs(db: Session, jobs: List[RenewalJob]) -> dict:
+    """
+    점유한 작업 실행
+    - 결제는 RENEWAL_CONCURRENCY 만큼 동시에 진행
+    - 결과(작업 상태 + 구독 연장)는 RENEWAL_COMMIT_BATCH_SIZE 단위로 같은 트랜잭션에 커밋
+    """
+    counts = {"succeeded": 0, "failed": 0, "dead": 0, "skipped": 0, "deferred": 0}
+
+    subscriptions = {
+        subscription.id: subscription
+        for subscription in db.query(Subscription).options(
+            joinedload(Subscription.plan),
+            joinedload(Subscription.user)
+        ).filter(Subscription.id.in_([job.subscription_id for job in jobs]))
+    }
+
+    runnable = []
+    for job in jobs:
+        subscription = subscriptions.get(job.subscription_id)
+        # 등록 이후 취소되었거나 다른 경로로 이미 갱신된 경우
+        if (
+            subscription is None
+            or not subscription.auto_renew
+            or not subscription.billing_key
+            or subscription.status != "ACTIVE"
+            or renewal_cycle(subscription) != job.cycle
+        ):
+            _finish(job, RenewalJobStatus.SKIPPED)
+            counts["skipped"] += 1
+            continue
+
+        request = build_renewal_request(subscription, declines=job.declines)
+        job.order_id = request.order_id
+        job.idempotency_key = request.idempotency_key
+        runnable.append((job, subscription, request))
+    db.commit()
+
+    semaphore = asyncio.Semaphore(max(1, settings.RENEWAL_CONCURRENCY))
+
+    async def run(job, subscription, request):
+        async with semaphore:
+            try:
+                outcome, error = await charge_billing_key(request)
+            except CircuitOpenError as e:
+                outcome, error = None, str(e)
+            return job, subscription, request, outcome, error
+
+    pending_commit = 0
+    for task in asyncio.as_completed([run(*item) for item in runnable]):
+        job, subscription, request, outcome, error = await task
+
+        if outcome is None:
+            _defer(job, error)
+            counts["deferred"] += 1
+        elif outcome == CHARGE_SUCCEEDED:
+            record_payment(db, subscription, request.amount, request.order_id, kind="RENEWAL")
+            apply_renewal(subscription)
+            _finish(job, RenewalJobStatus.SUCCEEDED)
+            counts["succeeded"] += 1
+        else:
+            _record_failure(job, error, declined=outcome == CHARGE_DECLINED)
+            counts["dead" if job.status == RenewalJobStatus.DEAD else "failed"] += 1
+
+        pending_commit += 1
+        if pending_commit >= settings.RENEWAL_COMMIT_BATCH_SIZE:
+            db.commit()
+            pending_commit = 0
+
+    db.commit()
+    return counts
+
+
+async def drain_renewal_jobs(db: Session, max_batches: Optional[int] = None) -> dict:
+    """
+    실행 가능한 작업이 없을 때까지 점유 → 실행 반복
+
+    Returns:
+        {"succeeded", "failed", "dead", "skipped", "deferred"} 누적 건수
+    """
+    totals = {"succeeded": 0, "failed": 0, "dead": 0, "skipped": 0, "deferred": 0}
+    recover_stale_jobs(db)
+
+    batches = 0
+
+    async with toss_client.session():
+        while max_batches is None or batches < max_batches:
+            if toss_client.breaker.state == "open":
+                logger.warning("Toss API circuit open - stopping renewal drain until next run")
+                break
+
+            jobs = claim_jobs(db, settings.RENEWAL_CLAIM_BATCH_SIZE)
+            if not jobs:
+                break
+
+            counts = await process_claimed_jobs(db, jobs)
+            for key, value in counts.items():
+                totals[key] += value
+            batches += 1
+
+    if batches:
+        logger.info(
+            f"Renewal jobs processed: {totals['succeeded']} succeeded, {totals['failed']} retrying, "
+            f"{totals['dead']} dead, {totals['skipped']} skipped, {totals['deferred']} deferred"
+        )
+    return totals
+
+
+async def check_and_process_renewals(db: Session) -> dict:
+    """만료 예정 구독 등록 후 대기 작업 처리 (일일 갱신 스케줄러)"""
+    try:
+        enqueue_due_renewals(db)
+        return await drain_renewal_jobs(db)
+    except Exception as e:
+        logger.error(f"Renewal check failed: {e}", exc_info=True)
+        db.rollback()
+        raise
@@ -0,0 +1,244 @@
+# central-backend/app/services/stats_rollup.py
+"""
+관리자 통계 집계
+- 팩트: payment_records (결제/환불), subscription_events (구독 시작/변경/취소/만료)
+- 집계: daily_stats_rollups (일별 × 플랜별 매출·구독 흐름)
+  - 이벤트 발생 시 같은 트랜잭션에서 증분 반영 (커밋은 호출자가 담당)
+  - 스케줄러가 최근 N일을 팩트에서 다시 계산 (누락/경합 보정)
+- 관리자 대시보드는 집계 테이블만 조회
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from app.core.database import insert_ignore
+from app.models.payment import DailyStatsRollup, PaymentRecord
+from app.models.user import Subscription, SubscriptionEvent, SubscriptionEventType
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_PLAN = 0
+
+# 구독 이벤트 → 집계 컬럼
+_EVENT_COLUMNS = {
+    SubscriptionEventType.STARTED: "new_subscriptions",
+    SubscriptionEventType.CANCELLED: "cancelled_subscriptions",
+    SubscriptionEventType.EXPIRED: "cancelled_subscriptions",
+}
+
+
+def bump(db: Session, plan_id: Optional[int], day: Optional[date] = None, **deltas):
+    """
+    일별 집계 증분 반영 (column = column + delta)
+
+    Example:
+        bump(db, plan_id, revenue=9900, payment_count=1)
+    """
+    deltas = {column: value for column, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    key = {"day": day or datetime.utcnow().date(), "plan_id": plan_id or UNKNOWN_PLAN}
+    if insert_ignore(db, DailyStatsRollup, key, ["day", "plan_id"]) is None:
+        if db.get(DailyStatsRollup, (key["day"], key["plan_id"])) is None:
+            db.add(DailyStatsRollup(**key))
+            db.flush()
+
+    db.query(DailyStatsRollup).filter(
+        DailyStatsRollup.day == key["day"],
+        DailyStatsRollup.plan_id == key["plan_id"]
+    ).update(
+        {getattr(DailyStatsRollup, column): getattr(DailyStatsRollup, column) + value
+         for column, value in deltas.items()},
+        synchronize_session=False
+    )
+
+
+def record_payment(
+    db: Session,
+    subscription: Subscription,
+    amount: float,
+    order_id: str,
+    kind: str,
+    payment_key: Optional[str] = None,
+    plan_id: Optional[int] = None
+) -> bool:
+    """
+    결제 기록 (같은 주문은 1번만 반영)
+
+    Returns:
+        새로 기록되었으면 True
+    """
+    plan_id = plan_id or subscription.plan_id
+    now = datetime.utcnow()
+    values = {
+        "order_id": order_id,
+        "payment_key": payment_key,
+        "user_id": subscription.user_id,
+        "subscription_id": subscription.id,
+        "plan_id": plan_id,
+        "kind": kind,
+        "amount": amount,
+        "currency": "KRW",
+        "status": "DONE",
+        "paid_at": now,
+    }
+
+    inserted = insert_ignore(db, PaymentRecord, values, ["order_id"])
+    if inserted is None:
+        inserted = 0
+        if db.query(PaymentRecord.id).filter(PaymentRecord.order_id == order_id).first() is None:
+            db.add(PaymentRecord(**values))
+            db.flush()
+            inserted = 1
+
+    if not inserted:
+        return False
+
+    bump(db, plan_id, now.date(), revenue=amount, payment_count=1)
+    return True
+
+
+def record_refund(db: Session, order_id: str) -> Optional[PaymentRecord]:
+    """결제 취소(환불) 기록 (이미 취소된 주문은 무시)"""
+    record = db.query(PaymentRecord).filter(
+        PaymentRecord.order_id == order_id,
+        PaymentRecord.status == "DONE"
+    ).with_for_update().first()
+    if record is None:
+        return None
+
+    record.status = "CANCELED"
+    record.canceled_at = datetime.utcnow()
+    db.flush()  # autoflush 꺼짐 → 같은 트랜잭션의 재호출이 DONE으로 보지 않도록
+    bump(db, record.plan_id, record.canceled_at.date(), refunds=record.amount)
+    return record
+
+
+def record_subscription_event(
+    db: Session,
+    subscription: Subscription,
+    event_type: SubscriptionEventType,
+    plan_id: Optional[int] = None
+):
+    """구독 이력 추가 + 일별 집계 반영"""
+    now = datetime.utcnow()
+    plan_id = plan_id or subscription.plan_id
+
+    db.add(SubscriptionEvent(
+        subscription_id=subscription.id,
+        user_id=subscription.user_id,
+        plan_id=plan_id,
+        event_type=event_type,
+        occurred_at=now,
+    ))
+
+    column = _EVENT_COLUMNS.get(event_type)
+    if column:
+        bump(db, plan_id, now.date(), **{column: 1})
+
+
+def _as_date(value) -> date:
+    """func.date() 결과 정규화 (SQLite는 문자열 반환)"""
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def rebuild_rollups(db: Session, since: date) -> int:
+    """
+    since 이후 일별 집계를 팩트 테이블에서 다시 계산
+
+    Returns:
+        갱신된 (일, 플랜) 행 수
+    """
+    since_dt = datetime.combine(since, datetime.min.time())
+    totals: Dict[Tuple[date, int], dict] = defaultdict(lambda: {
+        "revenue": 0.0, "refunds": 0.0, "payment_count": 0,
+        "new_subscriptions": 0, "cancelled_subscriptions": 0,
+    })
+
+    paid_day = func.date(PaymentRecord.paid_at)
+    for day, plan_id, revenue, count in db.query(
+        paid_day, PaymentRecord.plan_id, func.sum(PaymentRecord.amount), func.count(PaymentRecord.id)
+    ).filter(PaymentRecord.paid_at >= since_dt).group_by(paid_day, PaymentRecord.plan_id):
+        row = totals[(_as_date(day), plan_id or UNKNOWN_PLAN)]
+        row["revenue"] = float(revenue or 0)
+        row["payment_count"] = count
+
+    canceled_day = func.date(PaymentRecord.canceled_at)
+    for day, plan_id, refunds in db.query(
+        canceled_day, PaymentRecord.plan_id, func.sum(PaymentRecord.amount)
+    ).filter(PaymentRecord.canceled_at >= since_dt).group_by(canceled_day, PaymentRecord.plan_id):
+        totals[(_as_date(day), plan_id or UNKNOWN_PLAN)]["refunds"] = float(refunds or 0)
+
+    event_day = func.date(SubscriptionEvent.occurred_at)
+    for day, plan_id, event_type, count in db.query(
+        event_day, SubscriptionEvent.plan_id, SubscriptionEvent.event_type, func.count(SubscriptionEvent.id)
+    ).filter(
+        SubscriptionEvent.occurred_at >= since_dt,
+        SubscriptionEvent.event_type.in_(list(_EVENT_COLUMNS))
+    ).group_by(event_day, SubscriptionEvent.plan_id, SubscriptionEvent.event_type):
+        totals[(_as_date(day), plan_id or UNKNOWN_PLAN)][_EVENT_COLUMNS[event_type]] += count
+
+    db.query(DailyStatsRollup).filter(DailyStatsRollup.day >= since).delete(synchronize_session=False)
+    db.add_all(
+        DailyStatsRollup(day=day, plan_id=plan_id, **values)
+        for (day, plan_id), values in totals.items()
+    )
+    db.commit()
+
+    logger.info(f"Rebuilt {len(totals)} daily stats rows since {since}")
+    return len(totals)
+
+
+def refresh_recent_rollups(db: Session, days: int) -> int:
+    """최근 days일 집계 재계산 (스케줄러)"""
+    return rebuild_rollups(db, datetime.utcnow().date() - timedelta(days=days - 1))
+
+
+def month_start(day: date, months_back: int = 0) -> date:
+    """months_back개월 전의 1일"""
+    month_index = day.year * 12 + (day.month - 1) - months_back
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def get_monthly_revenue(db: Session, months: int) -> List[dict]:
+    """최근 months개월 월별 매출 (집계 테이블 1회 조회, 오래된 달부터)"""
+    today = datetime.utcnow().date()
+    first = month_start(today, months - 1)
+
+    buckets = {month_start(today, i).strftime("%Y-%m"): 0.0 for i in reversed(range(months))}
+    for day, revenue, refunds in db.query(
+        DailyStatsRollup.day,
+        func.sum(DailyStatsRollup.revenue),
+        func.sum(DailyStatsRollup.refunds)
+    ).filter(DailyStatsRollup.day >= first).group_by(DailyStatsRollup.day):
+        key = _as_date(day).strftime("%Y-%m")
+        if key in buckets:
+            buckets[key] += float(revenue or 0) - float(refunds or 0)
+
+    return [{"month": month, "revenue": revenue} for month, revenue in buckets.items()]
+
+
+def get_churn_rate(db: Session, active_now: int, days: int = 30) -> float:
+    """
+    최근 days일 이탈률 (%)
+    - 기간 시작 시점 활성 구독 = 현재 활성 + 기간 중 취소/만료 - 기간 중 신규
+    - 이탈률 = 기간 중 취소/만료 / 기간 시작 시점 활성 구독
+    """
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    started, churned = db.query(
+        func.coalesce(func.sum(DailyStatsRollup.new_subscriptions), 0),
+        func.coalesce(func.sum(DailyStatsRollup.cancelled_subscriptions), 0)
+    ).filter(DailyStatsRollup.day >= since).one()
+
+    active_at_start = active_now + churned - started
+    if active_at_start <= 0:
+        return 0.0
+    return round(churned / active_at_start * 100, 1)
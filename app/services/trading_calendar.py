@@ -0,0 +1,87 @@
+# central-backend/app/services/trading_calendar.py
+"""
+거래일 달력 (KRX)
+- 거래일 = 평일 - 연말 휴장일(12/31) - market_holidays 테이블의 휴장일
+- 휴장일은 실행 시점에 한 번 읽어서 사용 (행 수가 적음, 관리 API로 수정 즉시 반영)
+- 일봉 수집: 마지막 저장일 이후 ~ 마지막 마감 거래일까지의 누락 거래일만 요청
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from app.models.financial_data import MarketHoliday
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 장 마감(15:30) 후 일봉 데이터가 제공되는 시각
+DATA_READY_TIME = time(16, 0)
+
+
+class TradingCalendar:
+    """주말 / 연말 휴장 규칙 + 휴장일 목록"""
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self.holidays = frozenset(holidays)
+
+    @classmethod
+    def load(cls, db: Session, market: str = "KRX") -> "TradingCalendar":
+        rows = db.query(MarketHoliday.date).filter(MarketHoliday.market == market).all()
+        return cls(row[0] for row in rows)
+
+    def is_trading_day(self, day: date) -> bool:
+        if day.weekday() >= 5:
+            return False
+        if day.month == 12 and day.day == 31:
+            return False
+        return day not in self.holidays
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        """start ~ end (양 끝 포함) 거래일 목록"""
+        days = []
+        day = start
+        while day <= end:
+            if self.is_trading_day(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def previous_trading_day(self, day: date) -> date:
+        """day 이전(미포함) 마지막 거래일"""
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def trading_days_before(self, day: date, count: int) -> date:
+        """day 이전(미포함) count번째 거래일"""
+        for _ in range(count):
+            day = self.previous_trading_day(day)
+        return day
+
+    def next_trading_day(self, day: date) -> date:
+        """day 이후(미포함) 첫 거래일"""
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def last_completed_trading_day(self, now: Optional[datetime] = None) -> date:
+        """일봉 데이터가 있는 마지막 거래일 (오늘이 거래일이고 DATA_READY_TIME 이후면 오늘)"""
+        now = now.astimezone(KST) if now and now.tzinfo else (now or datetime.now(KST))
+        today = now.date()
+        if self.is_trading_day(today) and now.time() >= DATA_READY_TIME:
+            return today
+        return self.previous_trading_day(today)
+
+    def missing_trading_days(self, last_stored: Optional[date], end: date, earliest: date) -> List[date]:
+        """
+        마지막 저장일 이후 end까지 누락된 거래일
+
+        Args:
+            last_stored: 종목의 마지막 저장 거래일 (없으면 earliest부터)
+            earliest: 수집 하한 (보존 기간 시작 / 상장일)
+        """
+        start = max(last_stored + timedelta(days=1), earliest) if last_stored else earliest
+        return self.trading_days(start, end)
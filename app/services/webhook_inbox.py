@@ -0,0 +1,344 @@
+# central-backend/app/services/webhook_inbox.py
+"""
+결제 웹훅 수신함
+- 수신: 서명 검증 → 원본을 webhook_events에 저장 (event_id 중복은 무시) → 즉시 200
+  - TOSS_WEBHOOK_SECRET 미설정 시 거부 (개발 환경은 TOSS_WEBHOOK_ALLOW_UNSIGNED)
+- 처리: 대기 이벤트를 배치로 점유 (FOR UPDATE SKIP LOCKED) → 토스 결제 조회 → 구독 상태 반영
+  - 본문은 paymentKey만 사용, 상태/주문은 토스 조회 결과 기준 (위조 본문으로 구독 변경 불가)
+- 이벤트별 SAVEPOINT로 실패를 격리, 지수 백오프 재시도, 최대 시도 초과 시 FAILED
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+
+from app.core.config import settings
+from app.core.database import SessionLocal, insert_ignore
+from app.core.http_client import toss_client
+from app.models.payment import RenewalJob, RenewalJobStatus, WebhookEvent, WebhookEventStatus
+from app.models.user import Subscription, SubscriptionEventType, SubscriptionStatus
+from app.services.auto_payment import apply_renewal, renewal_cycle
+from app.services.stats_rollup import record_payment, record_refund, record_subscription_event
+
+logger = logging.getLogger(__name__)
+
+# 토스 웹훅 헤더
+SIGNATURE_HEADER = "tosspayments-webhook-signature"
+TRANSMISSION_TIME_HEADER = "tosspayments-webhook-transmission-time"
+TRANSMISSION_ID_HEADER = "tosspayments-webhook-transmission-id"
+
+
+class PaymentLookupError(RuntimeError):
+    """토스 결제 조회 실패 (재시도 대상)"""
+
+
+class RenewalInProgressError(RuntimeError):
+    """같은 주문의 갱신 결제가 실행 중 (결과 기록 후 재시도)"""
+
+
+def verify_signature(body: bytes, signature: Optional[str], transmission_time: Optional[str]) -> bool:
+    """
+    웹훅 서명 검증
+    - 서명 = base64(HMAC-SHA256(secret, "{body}:{transmission_time}"))
+    - 헤더 형식: "v1:<sig>,v1:<sig>" (키 교체 기간에는 여러 개)
+    - TOSS_WEBHOOK_SECRET 미설정 시 거부 (TOSS_WEBHOOK_ALLOW_UNSIGNED=True면 검증 생략, 개발 환경)
+    """
+    secret = settings.TOSS_WEBHOOK_SECRET
+    if not secret:
+        if not settings.TOSS_WEBHOOK_ALLOW_UNSIGNED:
+            logger.error("TOSS_WEBHOOK_SECRET is not configured - rejecting webhook")
+        return settings.TOSS_WEBHOOK_ALLOW_UNSIGNED
+
+    if not signature or not transmission_time:
+        return False
+
+    message = body + b":" + transmission_time.encode()
+    expected = base64.b64encode(hmac.new(secret.encode(), message, hashlib.sha256).digest()).decode()
+
+    for candidate in signature.split(","):
+        _, _, value = candidate.strip().partition(":")
+        if value and hmac.compare_digest(value, expected):
+            return True
+    return False
+
+
+def event_id_for(body: bytes, transmission_id: Optional[str]) -> str:
+    """중복 제거 키 (전송 ID, 없으면 본문 해시 → 재전송된 동일 본문은 같은 키)"""
+    if transmission_id:
+        return f"toss:{transmission_id}"
+    return "sha256:" + hashlib.sha256(body).hexdigest()
+
+
+def store_webhook_event(body: bytes, transmission_id: Optional[str] = None) -> bool:
+    """
+    수신 이벤트 저장
+
+    Returns:
+        새로 저장되었으면 True (중복이면 False)
+    """
+    try:
+        event_type = json.loads(body).get("eventType")
+    except (ValueError, AttributeError):
+        event_type = None
+
+    values = {
+        "provider": "toss",
+        "event_id": event_id_for(body, transmission_id),
+        "event_type": event_type,
+        "payload": body.decode("utf-8", errors="replace"),
+        "status": WebhookEventStatus.PENDING,
+        "attempts": 0,
+        "received_at": datetime.utcnow(),
+    }
+
+    db = SessionLocal()
+    try:
+        inserted = insert_ignore(db, WebhookEvent, values, ["event_id"])
+        if inserted is not None:
+            created = inserted > 0
+        else:
+            created = db.query(WebhookEvent.id).filter(WebhookEvent.event_id == values["event_id"]).first() is None
+            if created:
+                db.add(WebhookEvent(**values))
+        db.commit()
+    finally:
+        db.close()
+
+    if not created:
+        logger.info(f"Duplicate webhook ignored: {values['event_id']}")
+    return created
+
+
+def _find_subscription(db: Session, order_id: str) -> Optional[Subscription]:
+    """
+    주문 ID → 구독 (행 잠금)
+    - AUTO_{subscription_id}_{cycle}[_{declines}] : 자동 결제
+    - AUT_{user_id}_{timestamp}                  : 결제창 결제
+    """
+    parts = (order_id or "").split("_")
+    if len(parts) < 3 or not parts[1].isdigit():
+        return None
+
+    query = db.query(Subscription).with_for_update()
+    if parts[0] == "AUTO":
+        return query.filter(Subscription.id == int(parts[1])).first()
+    if parts[0] == "AUT":
+        return query.filter(Subscription.user_id == int(parts[1])).first()
+    return None
+
+
+def _payment_key(event: WebhookEvent) -> Optional[str]:
+    """결제 상태 변경 이벤트의 paymentKey (그 외 이벤트 / 잘못된 본문은 None)"""
+    try:
+        body = json.loads(event.payload)
+    except ValueError:
+        return None
+    if not isinstance(body, dict) or body.get("eventType") != "PAYMENT_STATUS_CHANGED":
+        return None
+    return (body.get("data") or {}).get("paymentKey")
+
+
+async def _fetch_payment(payment_key: str) -> Optional[dict]:
+    """토스 결제 조회 (없는 결제면 None)"""
+    response = await toss_client.get(f"/payments/{quote(payment_key, safe='')}", operation="payment_lookup")
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise PaymentLookupError(f"HTTP {response.status_code}: {response.text[:200]}")
+    return response.json()
+
+
+def lookup_payments(events: List[WebhookEvent]) -> Dict[int, Any]:
+    """
+    이벤트별 토스 결제 조회 (동시 요청)
+
+    Returns:
+        {event.id: 결제 dict / None(없는 결제) / 예외} - paymentKey가 없는 이벤트는 제외
+    """
+    targets = {event.id: key for event in events if (key := _payment_key(event))}
+    if not targets:
+        return {}
+
+    async def fetch_all():
+        async with toss_client.session():
+            return await asyncio.gather(
+                *(_fetch_payment(key) for key in targets.values()), return_exceptions=True
+            )
+
+    return dict(zip(targets, asyncio.run(fetch_all())))
+
+
+def _apply_payment_done(db: Session, subscription: Subscription, payment: dict) -> WebhookEventStatus:
+    """
+    결제 완료 반영
+    - 결과를 기록하지 못한 자동 결제(응답 미수신 등)만 반영: 같은 주문의 미완료 갱신 작업이 있고
+      구독이 여전히 그 결제 주기일 때 → 결제 기록 + 기간 연장 + 작업 완료
+    - 결제창 결제는 승인 API(/payments/confirm)에서 반영, 취소/만료된 구독은 되살리지 않음
+    """
+    order_id = payment["orderId"]
+    if not order_id.startswith("AUTO_"):
+        logger.info(f"Checkout payment {order_id} DONE (applied by payment confirmation)")
+        return WebhookEventStatus.IGNORED
+
+    job = db.query(RenewalJob).filter(
+        RenewalJob.subscription_id == subscription.id,
+        RenewalJob.order_id == order_id
+    ).with_for_update().first()
+    if job is None or job.status in (RenewalJobStatus.SUCCEEDED, RenewalJobStatus.SKIPPED):
+        logger.info(f"Renewal payment {order_id} DONE (no pending renewal job)")
+        return WebhookEventStatus.IGNORED
+    if job.status == RenewalJobStatus.RUNNING:
+        raise RenewalInProgressError(f"Renewal job {job.id} for {order_id} is running")
+
+    if subscription.status != SubscriptionStatus.ACTIVE or renewal_cycle(subscription) != job.cycle:
+        logger.warning(
+            f"⚠️ Renewal payment {order_id} DONE but subscription {subscription.id} is "
+            f"{subscription.status} (cycle {renewal_cycle(subscription)}) - needs manual review"
+        )
+        return WebhookEventStatus.IGNORED
+
+    record_payment(
+        db, subscription, payment.get("totalAmount") or 0, order_id,
+        kind="RENEWAL", payment_key=payment.get("paymentKey")
+    )
+    apply_renewal(subscription)
+    job.status = RenewalJobStatus.SUCCEEDED
+    job.last_error = None
+    job.locked_by = None
+    job.locked_at = None
+    job.completed_at = datetime.utcnow()
+    return WebhookEventStatus.PROCESSED
+
+
+def apply_webhook_event(db: Session, event: WebhookEvent, payment: Optional[dict]) -> WebhookEventStatus:
+    """
+    이벤트 반영 (PAYMENT_STATUS_CHANGED)
+    - payment: 토스에서 조회한 결제 (본문의 상태/주문은 신뢰하지 않음)
+    - DONE: 결과를 기록하지 못한 자동 결제 반영 (_apply_payment_done)
+    - CANCELED: 결제 취소(환불) → 구독 취소, 자동 갱신 해제
+    - 그 외 상태/이벤트는 기록만
+
+    Returns:
+        PROCESSED 또는 IGNORED
+    """
+    body = json.loads(event.payload)
+    if body.get("eventType") != "PAYMENT_STATUS_CHANGED":
+        return WebhookEventStatus.IGNORED
+
+    data = body.get("data") or {}
+    if payment is None:
+        logger.warning(f"Webhook event {event.id}: payment {data.get('paymentKey')} not found at Toss")
+        return WebhookEventStatus.IGNORED
+
+    payment_status = payment.get("status")
+    order_id = payment.get("orderId")
+    if data.get("orderId") and data.get("orderId") != order_id:
+        logger.warning(f"Webhook event {event.id}: order {data.get('orderId')} does not match payment ({order_id})")
+        return WebhookEventStatus.IGNORED
+
+    subscription = _find_subscription(db, order_id)
+    if subscription is None:
+        logger.warning(f"Webhook for unknown order {order_id} ({payment_status})")
+        return WebhookEventStatus.IGNORED
+
+    if payment_status == "DONE":
+        result = _apply_payment_done(db, subscription, payment)
+        if result != WebhookEventStatus.PROCESSED:
+            return result
+    elif payment_status == "CANCELED":
+        record_refund(db, order_id)
+        if subscription.status == SubscriptionStatus.ACTIVE:
+            record_subscription_event(db, subscription, SubscriptionEventType.CANCELLED)
+        subscription.status = SubscriptionStatus.CANCELLED
+        subscription.cancelled_at = datetime.utcnow()
+        subscription.auto_renew = False
+    else:
+        logger.info(f"Payment status changed: {order_id} -> {payment_status} (no subscription change)")
+        return WebhookEventStatus.IGNORED
+
+    logger.info(f"Webhook applied: {order_id} -> {payment_status} (subscription {subscription.id})")
+    return WebhookEventStatus.PROCESSED
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """지수 백오프 (base × 2^(attempts-1), 최대값 제한)"""
+    seconds = settings.WEBHOOK_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1))
+    return timedelta(seconds=min(seconds, settings.WEBHOOK_RETRY_MAX_SECONDS))
+
+
+def process_webhook_events(batch_size: Optional[int] = None) -> dict:
+    """
+    대기 이벤트 배치 처리 (스케줄러 / 수신 직후 백그라운드에서 호출)
+    - 여러 워커가 동시에 실행해도 SKIP LOCKED로 같은 이벤트를 처리하지 않음
+
+    Returns:
+        {"processed", "ignored", "failed", "retrying"}
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    counts = {"processed": 0, "ignored": 0, "failed": 0, "retrying": 0}
+
+    db = SessionLocal()
+    try:
+        while True:
+            now = datetime.utcnow()
+            events = db.query(WebhookEvent).filter(
+                WebhookEvent.status == WebhookEventStatus.PENDING,
+                or_(WebhookEvent.next_attempt_at.is_(None), WebhookEvent.next_attempt_at <= now)
+            ).order_by(WebhookEvent.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+            if not events:
+                break
+
+            payments = lookup_payments(events)
+            for event in events:
+                try:
+                    payment = payments.get(event.id)
+                    if isinstance(payment, BaseException):
+                        raise payment
+                    with db.begin_nested():
+                        result = apply_webhook_event(db, event, payment)
+                    event.status = result
+                    event.processed_at = datetime.utcnow()
+                    event.next_attempt_at = None
+                    event.last_error = None
+                    counts["processed" if result == WebhookEventStatus.PROCESSED else "ignored"] += 1
+                except Exception as e:
+                    event.attempts += 1
+                    event.last_error = f"{type(e).__name__}: {e}"
+                    if event.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                        event.status = WebhookEventStatus.FAILED
+                        event.next_attempt_at = None
+                        counts["failed"] += 1
+                        logger.error(f"Webhook event {event.id} failed permanently: {e}")
+                    else:
+                        event.next_attempt_at = datetime.utcnow() + retry_delay(event.attempts)
+                        counts["retrying"] += 1
+                        logger.warning(
+                            f"Webhook event {event.id} failed (attempt {event.attempts}), "
+                            f"retrying after {event.next_attempt_at}: {e}"
+                        )
+
+            db.commit()
+
+            # 실패해 PENDING으로 남은 이벤트는 next_attempt_at 이후 실행에서 재시도
+            if len(events) < batch_size or counts["retrying"]:
+                break
+    except Exception as e:
+        logger.error(f"Webhook processing failed: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+    if any(counts.values()):
+        logger.info(
+            f"Webhook events: {counts['processed']} processed, {counts['ignored']} ignored, "
+            f"{counts['retrying']} retrying, {counts['failed']} failed"
+        )
+    return counts
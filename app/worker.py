@@ -0,0 +1,60 @@
+# central-backend/app/worker.py
+"""
+백그라운드 작업 워커 (API 서버와 별도 프로세스)
+- 자동 결제 / 웹훅 / 커미션 / 통계 / 키 교체 스케줄러 + 데이터 수집 스케줄러 실행
+- 여러 인스턴스를 띄워도 리더 임대를 가진 하나만 예약 작업 실행 (나머지는 대기 → 장애 시 인계)
+- API 서버는 RUN_SCHEDULERS_IN_API=False로 실행하면 요청 처리만 담당
+- 작업 메트릭(collection_* / commission_transition*)은 이 프로세스에서 기록되므로
+  METRICS_WORKER_PORT 의 /metrics 로 노출 (Prometheus 스크레이프 대상에 워커도 추가)
+
+실행 방법:
+python -m app.worker
+"""
+import logging
+import signal
+import threading
+
+from app.core.config import settings
+from app.core.database import init_db
+from app.core.metrics import start_metrics_server
+from app.scheduler import start_scheduler, stop_scheduler
+from app.services.data_scheduler import start_data_scheduler, stop_data_scheduler
+from app.services.leader_lease import scheduler_lease
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    logger.info(f"🚀 {settings.APP_NAME} worker starting (holder={scheduler_lease.holder})...")
+
+    init_db()
+    metrics_server = None
+    if settings.METRICS_ENABLED and settings.METRICS_WORKER_PORT:
+        metrics_server = start_metrics_server(settings.HOST, settings.METRICS_WORKER_PORT, settings.METRICS_TOKEN)
+        logger.info(f"📊 Worker metrics on :{settings.METRICS_WORKER_PORT}/metrics")
+    scheduler_lease.start()
+    start_scheduler()
+    start_data_scheduler()
+    logger.info("✅ Worker ready")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    stop.wait()
+
+    logger.info("🛑 Worker shutting down (waiting for running jobs)...")
+    stop_scheduler()
+    stop_data_scheduler()
+    # 실행 중이던 작업이 끝난 뒤 반납 → 다른 인스턴스가 바로 인계
+    scheduler_lease.stop()
+    if metrics_server:
+        metrics_server.shutdown()
+    logger.info("✅ Worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# fake_toss_server.py
+"""
+로컬 테스트용 가짜 토스페이먼츠 API 서버
+- 빌링키 발급 / 빌링키 결제 / 결제 승인 / 결제 조회 엔드포인트 흉내
+- 응답 지연, 실패 비율 조절 가능
+- Idempotency-Key가 같으면 첫 응답을 그대로 반환 (중복 결제 확인용)
+
+실행 방법:
+python fake_toss_server.py --port 9100 --latency-ms 200 --failure-rate 0.02
+
+백엔드는 .env 또는 환경변수로 연결:
+TOSS_API_URL=http://127.0.0.1:9100/v1
+TOSS_SECRET_KEY=test_sk_fake  (아무 값, 미설정 시 백엔드가 호출하지 않음)
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Fake Toss Payments")
+
+config = {"latency_ms": 0.0, "failure_rate": 0.0}
+stats = {"charges": 0, "replays": 0, "failures": 0}
+idempotent_responses: Dict[str, tuple] = {}
+payments: Dict[str, dict] = {}  # paymentKey → 결제 (조회용)
+
+
+async def _simulate_latency():
+    if config["latency_ms"]:
+        # ±50% 흔들림
+        await asyncio.sleep(config["latency_ms"] / 1000 * random.uniform(0.5, 1.5))
+
+
+def _payment_response(order_id: str, amount, method: str = "카드") -> dict:
+    payment = {
+        "paymentKey": f"fake_{uuid.uuid4().hex}",
+        "orderId": order_id,
+        "status": "DONE",
+        "method": method,
+        "totalAmount": amount,
+        "approvedAt": datetime.now().isoformat(),
+    }
+    payments[payment["paymentKey"]] = payment
+    return payment
+
+
+@app.post("/v1/billing/authorizations/issue")
+async def issue_billing_key(request: Request):
+    body = await request.json()
+    await _simulate_latency()
+    return {
+        "billingKey": f"fake_bk_{uuid.uuid4().hex}",
+        "customerKey": body.get("customerKey"),
+        "card": {"number": "1234********5678", "company": "신한"},
+    }
+
+
+@app.post("/v1/billing/{billing_key}")
+async def charge_billing_key(
+    billing_key: str,
+    request: Request,
+    idempotency_key: str = Header(None, alias="Idempotency-Key")
+):
+    body = await request.json()
+
+    if idempotency_key and idempotency_key in idempotent_responses:
+        stats["replays"] += 1
+        status_code, content = idempotent_responses[idempotency_key]
+        return JSONResponse(status_code=status_code, content=content)
+
+    await _simulate_latency()
+
+    if random.random() < config["failure_rate"]:
+        stats["failures"] += 1
+        status_code, content = 400, {"code": "REJECT_CARD_PAYMENT", "message": "카드 결제가 거절되었습니다."}
+    else:
+        stats["charges"] += 1
+        status_code, content = 200, _payment_response(body.get("orderId"), body.get("amount"))
+
+    if idempotency_key:
+        idempotent_responses[idempotency_key] = (status_code, content)
+    return JSONResponse(status_code=status_code, content=content)
+
+
+@app.post("/v1/payments/confirm")
+async def confirm_payment(request: Request):
+    body = await request.json()
+    await _simulate_latency()
+    return _payment_response(body.get("orderId"), body.get("amount"))
+
+
+@app.get("/v1/payments/{payment_key}")
+async def get_payment(payment_key: str):
+    await _simulate_latency()
+    payment = payments.get(payment_key)
+    if payment is None:
+        return JSONResponse(status_code=404, content={"code": "NOT_FOUND_PAYMENT", "message": "존재하지 않는 결제 정보 입니다."})
+    return payment
+
+
+@app.get("/stats")
+async def get_stats():
+    """처리 통계 (charges: 실제 결제, replays: 멱등 재응답)"""
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Toss Payments API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="평균 응답 지연 (ms)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="결제 거절 비율 (0~1)")
+    args = parser.parse_args()
+
+    config["latency_ms"] = args.latency_ms
+    config["failure_rate"] = args.failure_rate
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+# central-backend/load_test_agents.py
+"""
+Agent WebSocket 게이트웨이 부하 테스트
+
+로컬에서 서버(uvicorn)를 띄우고 N개의 가상 Agent를 연결하여 측정합니다.
+- 연결 속도 (agents/s)
+- 상태 메시지 처리량 (msg/s)
+- REST → Agent 명령 왕복 지연 (p50/p99)
+- 연결당 서버 메모리 (RSS 증가분 / 연결 수)
+
+기본적으로 임시 SQLite DB를 사용하므로 별도 인프라가 필요 없습니다.
+
+실행 방법:
+cd central-backend
+python load_test_agents.py --agents 1000 --duration 30
+python load_test_agents.py --agents 2000 --protocol msgpack
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Agent WebSocket load test")
+    parser.add_argument("--agents", type=int, default=500, help="가상 Agent 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="상태 메시지 전송 시간 (초)")
+    parser.add_argument("--status-interval", type=float, default=5.0, help="Agent별 상태 메시지 주기 (초)")
+    parser.add_argument("--status-size", type=int, default=512, help="상태 메시지 payload 크기 (bytes)")
+    parser.add_argument("--commands", type=int, default=500, help="REST로 발생시킬 명령 수")
+    parser.add_argument("--command-concurrency", type=int, default=20, help="동시 REST 명령 수")
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="동시 연결 시도 수")
+    parser.add_argument("--protocol", choices=["json", "msgpack", "msgpack+deflate"], default="json")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--server-log", default=None, help="서버 로그 파일 (기본값: 버림)")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def read_rss_kb(pid: int) -> int:
+    """프로세스 RSS (Linux /proc 기준, 그 외 OS는 0)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def seed_agents(count: int):
+    """테스트용 사용자/구독/API 키 생성 (서버 시작 전에 실행)"""
+    from app.core.database import SessionLocal, init_db
+    from app.core.security import create_access_token
+    from app.models.user import User, Subscription, SubscriptionStatus
+    from app.models.commission import SubscriptionPlan
+    from app.models.agent import AgentApiKey
+    from app.services.agent_auth import generate_api_key
+
+    init_db()
+    db = SessionLocal()
+    try:
+        plan = db.query(SubscriptionPlan).filter(SubscriptionPlan.name == "LOADTEST").first()
+        if not plan:
+            plan = SubscriptionPlan(name="LOADTEST", display_name="Load Test", price_monthly=0, price_yearly=0)
+            db.add(plan)
+            db.commit()
+
+        agents = []
+        for i in range(count):
+            user = User(email=f"loadtest-{i}-{int(time.time())}@example.com", hashed_password="!", is_active=True)
+            db.add(user)
+            db.flush()
+
+            db.add(Subscription(user_id=user.id, plan_id=plan.id, status=SubscriptionStatus.ACTIVE))
+
+            plaintext, key_prefix, key_hash = generate_api_key()
+            db.add(AgentApiKey(user_id=user.id, name="loadtest", key_prefix=key_prefix, key_hash=key_hash))
+
+            agents.append({
+                "user_id": str(user.id),
+                "api_key": plaintext,
+                "token": create_access_token(data={"sub": str(user.id)}),
+            })
+
+            if (i + 1) % 500 == 0:
+                db.commit()
+        db.commit()
+        return agents
+    finally:
+        db.close()
+
+
+def start_server(port: int, env: dict, log_path):
+    log_file = open(log_path, "w") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--ws-max-size", str(16 * 1024 * 1024)],
+        cwd=str(project_root),
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    return process
+
+
+async def wait_for_server(base_url: str, server: subprocess.Popen, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode} (see --server-log)")
+            try:
+                response = await client.get(f"{base_url}/")
+                if response.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+class Codec:
+    """가상 Agent 측 프레임 인코딩 (서버의 agent_protocol과 동일 규칙)"""
+
+    def __init__(self, protocol: str):
+        self.protocol = protocol
+        if protocol != "json":
+            import msgpack
+            self.msgpack = msgpack
+
+    def encode(self, message: dict):
+        if self.protocol == "json":
+            return json.dumps(message)
+        packed = self.msgpack.packb(message, use_bin_type=True)
+        if self.protocol == "msgpack+deflate":
+            return b"\x00" + packed
+        return packed
+
+    def decode(self, frame):
+        if isinstance(frame, str):
+            return json.loads(frame)
+        if self.protocol == "msgpack+deflate":
+            import zlib
+            flag, frame = frame[:1], frame[1:]
+            if flag == b"\x01":
+                frame = zlib.decompress(frame)
+        return self.msgpack.unpackb(frame, raw=False)
+
+
+class SimulatedAgent:
+    """가상 Agent (상태 메시지 전송 + 명령 수신)"""
+
+    def __init__(self, info: dict, ws_url: str, codec: Codec, stats: dict, pending: dict):
+        self.info = info
+        self.ws_url = ws_url
+        self.codec = codec
+        self.stats = stats
+        self.pending = pending
+        self.ws = None
+
+    async def connect(self):
+        import websockets
+
+        kwargs = {"additional_headers": {"Authorization": f"Bearer {self.info['api_key']}"}}
+        if self.codec.protocol != "json":
+            kwargs["subprotocols"] = [self.codec.protocol]
+        self.ws = await websockets.connect(self.ws_url, max_size=None, **kwargs)
+
+    async def run(self, stop: asyncio.Event, interval: float, payload: str):
+        sender = asyncio.create_task(self._send_status(stop, interval, payload))
+        try:
+            async for frame in self.ws:
+                received_at = time.perf_counter()
+                message = self.codec.decode(frame)
+                started = self.pending.pop(self.info["user_id"], None)
+                if started is not None:
+                    self.stats["command_latencies"].append(received_at - started)
+                self.stats["commands_received"] += 1
+                if message.get("command") == "status":
+                    await self.ws.send(self.codec.encode({"type": "status_reply", "running": True}))
+        except Exception:
+            pass
+        finally:
+            sender.cancel()
+
+    async def _send_status(self, stop: asyncio.Event, interval: float, payload: str):
+        import random
+
+        # 모든 Agent가 동시에 보내지 않도록 시작 시점 분산
+        await asyncio.sleep(random.random() * interval)
+        while not stop.is_set():
+            try:
+                await self.ws.send(self.codec.encode({"type": "status", "workers": 3, "payload": payload}))
+                self.stats["status_sent"] += 1
+            except Exception:
+                self.stats["status_failed"] += 1
+                return
+            await asyncio.sleep(interval)
+
+
+async def drive_commands(base_url: str, agents, count: int, concurrency: int, stats: dict, pending: dict):
+    """REST로 명령 발생 (/api/agent/status → Agent로 status 명령 전송)"""
+    import httpx
+    import random
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def _one():
+            agent = random.choice(agents)
+            async with semaphore:
+                pending[agent["user_id"]] = time.perf_counter()
+                try:
+                    response = await client.get(
+                        "/api/agent/status",
+                        headers={"Authorization": f"Bearer {agent['token']}"}
+                    )
+                    if response.status_code == 200 and response.json().get("connected"):
+                        stats["commands_ok"] += 1
+                    else:
+                        stats["commands_failed"] += 1
+                        pending.pop(agent["user_id"], None)
+                except httpx.HTTPError:
+                    stats["commands_failed"] += 1
+                    pending.pop(agent["user_id"], None)
+
+        await asyncio.gather(*(_one() for _ in range(count)))
+
+
+async def run_load_test(args, agents, server: subprocess.Popen):
+    base_url = f"http://127.0.0.1:{args.port}"
+    ws_url = f"ws://127.0.0.1:{args.port}/ws/agent"
+    codec = Codec(args.protocol)
+
+    await wait_for_server(base_url, server)
+    await asyncio.sleep(1.0)
+    rss_before = read_rss_kb(server.pid)
+
+    stats = {
+        "connect_failed": 0,
+        "status_sent": 0,
+        "status_failed": 0,
+        "commands_ok": 0,
+        "commands_failed": 0,
+        "commands_received": 0,
+        "command_latencies": [],
+    }
+    pending = {}
+
+    # 1) 연결
+    simulated = [SimulatedAgent(info, ws_url, codec, stats, pending) for info in agents]
+    semaphore = asyncio.Semaphore(args.connect_concurrency)
+
+    async def _connect(agent: SimulatedAgent):
+        async with semaphore:
+            try:
+                await agent.connect()
+                return agent
+            except Exception:
+                stats["connect_failed"] += 1
+                return None
+
+    print(f"🔌 Connecting {len(simulated)} agents ({args.protocol})...")
+    connect_started = time.perf_counter()
+    connected = [a for a in await asyncio.gather(*(_connect(a) for a in simulated)) if a]
+    connect_elapsed = time.perf_counter() - connect_started
+
+    await asyncio.sleep(1.0)
+    rss_after = read_rss_kb(server.pid)
+
+    # 2) 상태 메시지 + REST 명령
+    stop = asyncio.Event()
+    payload = "x" * args.status_size
+    runners = [asyncio.create_task(a.run(stop, args.status_interval, payload)) for a in connected]
+
+    print(f"📨 Sending status for {args.duration:.0f}s and {args.commands} REST commands...")
+    traffic_started = time.perf_counter()
+    command_started = time.perf_counter()
+    await drive_commands(base_url, agents, args.commands, args.command_concurrency, stats, pending)
+    command_elapsed = time.perf_counter() - command_started
+
+    remaining = args.duration - (time.perf_counter() - traffic_started)
+    if remaining > 0:
+        await asyncio.sleep(remaining)
+    stop.set()
+    traffic_elapsed = time.perf_counter() - traffic_started
+
+    for agent in connected:
+        await agent.ws.close()
+    await asyncio.gather(*runners, return_exceptions=True)
+
+    # 3) 결과
+    latencies_ms = [v * 1000 for v in stats["command_latencies"]]
+    connections = max(len(connected), 1)
+
+    print("\n" + "=" * 60)
+    print("Agent WebSocket load test result")
+    print("=" * 60)
+    print(f"Agents connected     : {len(connected)}/{len(simulated)} (failed {stats['connect_failed']})")
+    print(f"Connect rate         : {len(connected) / connect_elapsed:,.1f} agents/s ({connect_elapsed:.2f}s)")
+    print(f"Status messages      : {stats['status_sent']:,} sent, {stats['status_failed']} failed")
+    print(f"Status throughput    : {stats['status_sent'] / traffic_elapsed:,.1f} msg/s")
+    print(f"REST commands        : {stats['commands_ok']} ok, {stats['commands_failed']} failed "
+          f"({stats['commands_ok'] / command_elapsed:,.1f} cmd/s)")
+    print(f"Command RTT p50/p99  : {percentile(latencies_ms, 50):.2f} ms / {percentile(latencies_ms, 99):.2f} ms "
+          f"(n={len(latencies_ms)}, mean={statistics.mean(latencies_ms) if latencies_ms else 0:.2f} ms)")
+    if rss_before and rss_after:
+        print(f"Server RSS           : {rss_before / 1024:,.1f} MB → {rss_after / 1024:,.1f} MB")
+        print(f"Memory per connection: {(rss_after - rss_before) / connections:,.1f} KB")
+    print("=" * 60)
+
+
+def main():
+    args = parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="aut_loadtest_")
+    database_url = args.database_url or f"sqlite:///{os.path.join(tmp_dir, 'loadtest.db')}"
+
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "AGENT_AUTH_REQUIRED": "True",
+        "AGENT_ADMISSION_RATE": str(max(args.agents, 1000)),
+        "AGENT_ADMISSION_BURST": str(max(args.agents, 1000)),
+    })
+    env.setdefault("SECRET_KEY", "loadtest-secret-key")
+    env.setdefault("MASTER_ENCRYPTION_KEY", "QfsUAr74Kyhsvy2Fev08EHQF6LpBGAwbjwwvGUpe1qc=")
+    # 시드 데이터도 같은 설정으로 생성 (API 키 해시에 SECRET_KEY 사용)
+    os.environ.update({k: env[k] for k in ("DATABASE_URL", "SECRET_KEY", "MASTER_ENCRYPTION_KEY")})
+
+    print(f"🌱 Seeding {args.agents} users/API keys ({database_url})...")
+    agents = seed_agents(args.agents)
+
+    print(f"🚀 Starting server on port {args.port}...")
+    server = start_server(args.port, env, args.server_log)
+    try:
+        asyncio.run(run_load_test(args, agents, server))
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+if __name__ == "__main__":
+    main()
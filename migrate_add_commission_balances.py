@@ -0,0 +1,40 @@
+"""
+데이터베이스 마이그레이션 스크립트
+커미션 잔액 원장 테이블 생성 및 기존 이력으로 백필
+
+실행 방법:
+python migrate_add_commission_balances.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import engine, SessionLocal
+from app.models.commission import CommissionBalance
+from app.services.commission_ledger import rebuild_balances
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate():
+    """commission_balances 테이블 생성 + 백필 (재실행 시 다시 집계)"""
+    logger.info("🔧 Starting commission balances migration...")
+    
+    CommissionBalance.__table__.create(bind=engine, checkfirst=True)
+    logger.info("✅ commission_balances table ready")
+    
+    db = SessionLocal()
+    try:
+        count = rebuild_balances(db)
+        logger.info(f"✅ Backfilled balances for {count} users")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,29 @@
+# migrate_add_commission_rate_index.py
+"""
+Add composite lookup index to commission_rates table
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding lookup index to commission_rates table...")
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_commission_rates_lookup
+            ON commission_rates(event_type, plan_id, is_active, valid_from)
+        """))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+        print("Created index idx_commission_rates_lookup (event_type, plan_id, is_active, valid_from)")
+
+if __name__ == "__main__":
+    migrate()
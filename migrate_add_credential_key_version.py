@@ -0,0 +1,34 @@
+# migrate_add_credential_key_version.py
+"""
+Add key_version column to kiwoom_credentials table (encryption key rotation)
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding key_version column to kiwoom_credentials table...")
+        
+        # null = MASTER_ENCRYPTION_KEY (버전 1)로 암호화된 기존 행
+        conn.execute(text("""
+            ALTER TABLE kiwoom_credentials
+            ADD COLUMN IF NOT EXISTS key_version INTEGER
+        """))
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_kiwoom_credentials_key_version
+            ON kiwoom_credentials(key_version)
+        """))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
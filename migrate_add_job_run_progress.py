@@ -0,0 +1,49 @@
+"""
+데이터베이스 마이그레이션 스크립트
+수집 작업 진행 상황 / 실패 항목
+- job_runs: failed_items, current_item, items_per_second, eta_seconds
+- job_run_failures 테이블 생성
+- data_collection_logs.job_run_id
+
+실행 방법:
+python migrate_add_job_run_progress.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.models.scheduler import JobRun, JobRunFailure
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate():
+    logger.info("🔧 Starting job run progress migration...")
+    JobRun.__table__.create(bind=engine, checkfirst=True)
+    
+    with engine.connect() as conn:
+        conn.execute(text("ALTER TABLE job_runs ADD COLUMN IF NOT EXISTS failed_items INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE job_runs ADD COLUMN IF NOT EXISTS current_item VARCHAR(64)"))
+        conn.execute(text("ALTER TABLE job_runs ADD COLUMN IF NOT EXISTS items_per_second DOUBLE PRECISION"))
+        conn.execute(text("ALTER TABLE job_runs ADD COLUMN IF NOT EXISTS eta_seconds INTEGER"))
+        conn.execute(text("ALTER TABLE data_collection_logs ADD COLUMN IF NOT EXISTS job_run_id INTEGER"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_data_collection_logs_job_run_id ON data_collection_logs(job_run_id)"
+        ))
+        conn.commit()
+    logger.info("✅ job_runs / data_collection_logs columns ready")
+    
+    JobRunFailure.__table__.create(bind=engine, checkfirst=True)
+    logger.info("✅ job_run_failures table ready")
+
+
+if __name__ == "__main__":
+    migrate()
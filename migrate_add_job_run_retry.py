@@ -0,0 +1,33 @@
+"""
+Add retry columns to job_runs table (failed ticker re-collection)
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding retry columns to job_runs table...")
+        
+        conn.execute(text("""
+            ALTER TABLE job_runs
+            ADD COLUMN IF NOT EXISTS retry_of_run_id INTEGER,
+            ADD COLUMN IF NOT EXISTS retry_attempt INTEGER NOT NULL DEFAULT 0
+        """))
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_job_runs_retry_of_run_id
+            ON job_runs(retry_of_run_id)
+        """))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
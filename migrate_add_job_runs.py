@@ -0,0 +1,31 @@
+"""
+데이터베이스 마이그레이션 스크립트
+수집 작업 실행 기록 테이블 생성
+
+실행 방법:
+python migrate_add_job_runs.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import engine
+from app.models.scheduler import JobRun
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate():
+    """job_runs 테이블 생성 (이미 있으면 건너뜀)"""
+    logger.info("🔧 Starting job runs migration...")
+    JobRun.__table__.create(bind=engine, checkfirst=True)
+    logger.info("✅ job_runs table ready")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,87 @@
+"""
+데이터베이스 마이그레이션 스크립트
+관리자 통계용 테이블 생성 + 기존 데이터 백필
+- payment_records, subscription_events, daily_stats_rollups
+- subscriptions (status, plan_id) 인덱스
+- 기존 구독의 시작/취소 이력 → subscription_events
+- 전체 기간 일별 집계 재계산
+
+실행 방법:
+python migrate_add_payment_stats.py
+"""
+import sys
+from datetime import date
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import SessionLocal, engine
+from app.models.payment import DailyStatsRollup, PaymentRecord
+from app.models.user import Subscription, SubscriptionEvent, SubscriptionEventType
+from app.services.stats_rollup import rebuild_rollups
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def backfill_subscription_events(db) -> int:
+    """이력이 없는 구독의 시작/취소 이벤트 생성"""
+    existing = {row[0] for row in db.query(SubscriptionEvent.subscription_id).distinct()}
+    created = 0
+
+    for subscription in db.query(Subscription).yield_per(1000):
+        if subscription.id in existing:
+            continue
+
+        started_at = subscription.started_at or subscription.created_at
+        if started_at:
+            db.add(SubscriptionEvent(
+                subscription_id=subscription.id,
+                user_id=subscription.user_id,
+                plan_id=subscription.plan_id,
+                event_type=SubscriptionEventType.STARTED,
+                occurred_at=started_at,
+            ))
+            created += 1
+        if subscription.cancelled_at:
+            db.add(SubscriptionEvent(
+                subscription_id=subscription.id,
+                user_id=subscription.user_id,
+                plan_id=subscription.plan_id,
+                event_type=SubscriptionEventType.CANCELLED,
+                occurred_at=subscription.cancelled_at,
+            ))
+            created += 1
+
+    db.commit()
+    return created
+
+
+def migrate():
+    """테이블/인덱스 생성 (이미 있으면 건너뜀) 후 백필"""
+    logger.info("🔧 Starting payment stats migration...")
+    PaymentRecord.__table__.create(bind=engine, checkfirst=True)
+    SubscriptionEvent.__table__.create(bind=engine, checkfirst=True)
+    DailyStatsRollup.__table__.create(bind=engine, checkfirst=True)
+
+    for index in Subscription.__table__.indexes:
+        if index.name == "idx_subscriptions_status_plan":
+            index.create(bind=engine, checkfirst=True)
+    logger.info("✅ Tables and indexes ready")
+
+    db = SessionLocal()
+    try:
+        created = backfill_subscription_events(db)
+        logger.info(f"✅ Backfilled {created} subscription events")
+
+        rows = rebuild_rollups(db, date(2000, 1, 1))
+        logger.info(f"✅ Rebuilt {rows} daily stats rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,44 @@
+"""
+데이터베이스 마이그레이션 스크립트
+종목별 일봉 보유 현황 (price_coverage) 테이블 생성 + 기존 daily_prices로 초기 계산
+
+실행 방법:
+python migrate_add_price_coverage.py
+(휴장일을 먼저 등록해야 누락 거래일이 정확함: python seed_market_holidays.py)
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import SessionLocal, engine
+from app.models.financial_data import PriceCoverage
+from app.services.price_coverage import rebuild_coverage
+from app.services.trading_calendar import TradingCalendar
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate():
+    """price_coverage 테이블 생성 (이미 있으면 건너뜀) + 전체 재계산"""
+    logger.info("🔧 Starting price coverage migration...")
+    PriceCoverage.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        count = rebuild_coverage(db, TradingCalendar.load(db))
+        db.commit()
+        logger.info(f"✅ price_coverage table ready ({count} stocks)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,33 @@
+"""
+Add declines column to renewal_jobs table (order ID rotation only on declines)
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding declines column to renewal_jobs table...")
+        
+        conn.execute(text("""
+            ALTER TABLE renewal_jobs
+            ADD COLUMN IF NOT EXISTS declines INTEGER NOT NULL DEFAULT 0
+        """))
+        
+        # 진행 중인 작업은 기존처럼 시도 수를 접미사로 이어서 사용 (이미 쓴 키 재사용 방지)
+        conn.execute(text("""
+            UPDATE renewal_jobs SET declines = attempts
+            WHERE status IN ('PENDING', 'RUNNING') AND declines = 0
+        """))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,31 @@
+"""
+데이터베이스 마이그레이션 스크립트
+구독 갱신 결제 작업 큐 테이블 생성
+
+실행 방법:
+python migrate_add_renewal_jobs.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import engine
+from app.models.payment import RenewalJob
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate():
+    """renewal_jobs 테이블 생성 (이미 있으면 건너뜀)"""
+    logger.info("🔧 Starting renewal jobs migration...")
+    RenewalJob.__table__.create(bind=engine, checkfirst=True)
+    logger.info("✅ renewal_jobs table ready")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+# migrate_add_system_config_version.py
+"""
+Add version column to system_configs table (config cache / ETag)
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding version column to system_configs table...")
+        
+        conn.execute(text("""
+            ALTER TABLE system_configs
+            ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0
+        """))
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_system_configs_version
+            ON system_configs(version)
+        """))
+        
+        # 기존 행은 버전 1로 시작
+        conn.execute(text("UPDATE system_configs SET version = 1 WHERE version = 0"))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,29 @@
+# migrate_add_user_created_at_index.py
+"""
+Add created_at index to users table (admin new-user count range scan)
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding created_at index to users table...")
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_users_created_at
+            ON users(created_at)
+        """))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+        print("Created index ix_users_created_at (created_at)")
+
+if __name__ == "__main__":
+    migrate()
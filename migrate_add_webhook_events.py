@@ -0,0 +1,31 @@
+"""
+데이터베이스 마이그레이션 스크립트
+결제 웹훅 수신함 테이블 생성
+
+실행 방법:
+python migrate_add_webhook_events.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import engine
+from app.models.payment import WebhookEvent
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate():
+    """webhook_events 테이블 생성 (이미 있으면 건너뜀)"""
+    logger.info("🔧 Starting webhook events migration...")
+    WebhookEvent.__table__.create(bind=engine, checkfirst=True)
+    logger.info("✅ webhook_events table ready")
+
+
+if __name__ == "__main__":
+    migrate()
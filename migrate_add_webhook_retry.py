@@ -0,0 +1,27 @@
+"""
+Add retry backoff column to webhook_events table
+"""
+from sqlalchemy import create_engine, text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    
+    with engine.connect() as conn:
+        print("Adding next_attempt_at column to webhook_events table...")
+        
+        conn.execute(text("""
+            ALTER TABLE webhook_events
+            ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP
+        """))
+        
+        conn.commit()
+        print("[OK] Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
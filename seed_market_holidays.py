@@ -0,0 +1,78 @@
+# central-backend/seed_market_holidays.py
+"""
+KRX 휴장일 시드 데이터 생성 스크립트
+- 주말과 연말 휴장일(12/31)은 거래일 달력 규칙으로 처리되므로 제외
+- 임시 공휴일 / 선거일 등은 KRX 공지 확인 후 관리 API(PUT /api/financial/market-holidays)로 추가
+
+실행 방법:
+python seed_market_holidays.py
+"""
+from datetime import date
+
+from app.core.database import SessionLocal, init_db
+from app.models.financial_data import MarketHoliday
+
+HOLIDAYS = [
+    # 2025
+    (date(2025, 1, 1), "신정"),
+    (date(2025, 1, 27), "임시공휴일"),
+    (date(2025, 1, 28), "설날 연휴"),
+    (date(2025, 1, 29), "설날"),
+    (date(2025, 1, 30), "설날 연휴"),
+    (date(2025, 3, 3), "삼일절 대체공휴일"),
+    (date(2025, 5, 1), "근로자의 날"),
+    (date(2025, 5, 5), "어린이날 / 부처님오신날"),
+    (date(2025, 5, 6), "대체공휴일"),
+    (date(2025, 6, 3), "대통령 선거일"),
+    (date(2025, 6, 6), "현충일"),
+    (date(2025, 8, 15), "광복절"),
+    (date(2025, 10, 3), "개천절"),
+    (date(2025, 10, 6), "추석"),
+    (date(2025, 10, 7), "추석 연휴"),
+    (date(2025, 10, 8), "추석 대체공휴일"),
+    (date(2025, 10, 9), "한글날"),
+    (date(2025, 12, 25), "성탄절"),
+    # 2026
+    (date(2026, 1, 1), "신정"),
+    (date(2026, 2, 16), "설날 연휴"),
+    (date(2026, 2, 17), "설날"),
+    (date(2026, 2, 18), "설날 연휴"),
+    (date(2026, 3, 2), "삼일절 대체공휴일"),
+    (date(2026, 5, 1), "근로자의 날"),
+    (date(2026, 5, 5), "어린이날"),
+    (date(2026, 5, 25), "부처님오신날 대체공휴일"),
+    (date(2026, 6, 3), "전국동시지방선거일"),
+    (date(2026, 8, 17), "광복절 대체공휴일"),
+    (date(2026, 9, 24), "추석 연휴"),
+    (date(2026, 9, 25), "추석"),
+    (date(2026, 10, 5), "개천절 대체공휴일"),
+    (date(2026, 10, 9), "한글날"),
+    (date(2026, 12, 25), "성탄절"),
+]
+
+
+def seed_holidays():
+    init_db()
+    db = SessionLocal()
+    
+    try:
+        existing = {row[0] for row in db.query(MarketHoliday.date).filter(MarketHoliday.market == "KRX")}
+        created = 0
+        for holiday_date, name in HOLIDAYS:
+            if holiday_date in existing:
+                continue
+            db.add(MarketHoliday(market="KRX", date=holiday_date, name=name))
+            created += 1
+        
+        db.commit()
+        print(f"[OK] {created} KRX holidays added ({len(HOLIDAYS) - created} already existed)")
+    
+    except Exception as e:
+        print(f"[ERROR] Failed to seed market holidays: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    seed_holidays()